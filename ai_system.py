@@ -1,17 +1,81 @@
 # ai_system.py
 
 from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_agentchat.conditions import MaxMessageTermination
 from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_agentchat.messages import TextMessage
-from typing import List
+from autogen_agentchat.messages import ModelClientStreamingChunkEvent, TextMessage
+from autogen_core.models import ChatCompletionClient
+from typing import TYPE_CHECKING, List, Optional
 import asyncio
+import copy
 
 # Local imports
-from pretty_printer import PrettyPrinter
-from result_saver import ResearchResultSaver
-from datetime import datetime
+from pretty_printer import PrettyPrinter, QuietPrinter, create_printer, current_plan, current_run_id
+from result_saver import ResearchResultSaver, StreamingReportWriter
+from checkpoint import MessageRecord, RunCheckpoint
+from response_cache import CachedChatCompletionClient, ResponseCache
+from rate_limiter import RateLimitedChatCompletionClient, RateLimiter
+from instrumentation import InstrumentedChatCompletionClient, RunInstrumentation
+from context_policy import ContextSavings, create_model_context
+from prompt_layout import PROMPT_LAYOUTS, apply_prompt_layout, record_cached_tokens
+from output_parser import parse_agent_output, parse_research_messages
+from idea_dedup import IdeaIndex
+from gating import GatingPolicy
+from pipeline_spec import ExecutionPlan, load_plan
+from team_pool import ResearchTeam, TeamPool
+from topic_fanout import TopicFanOutAgent
+if TYPE_CHECKING:
+    from model_router import ModelRouter # model_router imports this module
+import os
+import time
+
+MODEL_NAME = "gemini-2.0-flash" # As specified in the notebook
+
+# NOTE: The base_url points to Google's endpoint for using Gemini via an OpenAI-compatible API.
+# 참고: base_url은 OpenAI 호환 API를 통해 Gemini를 사용하기 위한 Google의 엔드포인트를 가리킵니다.
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+
+def create_model_client(
+    api_key: str,
+    base_url: str = GEMINI_BASE_URL,
+    cache: Optional[ResponseCache] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    model: str = MODEL_NAME,
+    **client_options
+) -> ChatCompletionClient:
+    """
+    Creates the Gemini model client. One client (and its connection pool) can be shared by many systems.
+
+    Args:
+        api_key (str): The API key for the language model.
+        base_url (str): The OpenAI-compatible endpoint to call.
+        cache (ResponseCache, optional): Answers repeated requests without calling the model.
+        rate_limiter (RateLimiter, optional): Schedules and retries calls to stay within the endpoint's limits.
+        model (str): The model to call.
+        **client_options: Further OpenAIChatCompletionClient options, e.g. model_info, timeout or max_retries.
+
+    Returns:
+        ChatCompletionClient: The configured model client.
+    """
+    if not api_key:
+        raise ValueError("API key cannot be empty.")
+
+    if rate_limiter is not None:
+        # The rate limiter retries failed calls itself, so the SDK must not retry them as well.
+        client_options["max_retries"] = 0
+    client = OpenAIChatCompletionClient(
+        model=model,
+        api_key=api_key,
+        base_url=base_url,
+        **client_options
+    )
+    # autogen's usage drops the provider's cached prompt token count, so it is read from the raw responses.
+    client = record_cached_tokens(client)
+    if rate_limiter is not None:
+        client = RateLimitedChatCompletionClient(client, rate_limiter)
+    # The cache sits outside the rate limiter so that cache hits do not use request budget.
+    if cache is not None:
+        client = CachedChatCompletionClient(client, cache, model=model)
+    return client
 
 class AdvancedAIPlusXSystem:
     """
@@ -19,132 +83,336 @@ class AdvancedAIPlusXSystem:
     다중 에이전트 연구 프로세스를 조율하는 주요 시스템 클래스입니다.
     """
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model_client: Optional[ChatCompletionClient] = None,
+        verbose: bool = True,
+        open_browser: bool = False,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        stream_tokens: bool = False,
+        export_trace: bool = False,
+        context_policy: str = "full",
+        context_window: int = 3,
+        prompt_layout: str = "shared_prefix",
+        idea_index: Optional[IdeaIndex] = None,
+        gating: Optional[GatingPolicy] = None,
+        printer: Optional[PrettyPrinter] = None,
+        output: str = "auto",
+        teams: int = 1,
+        router: Optional["ModelRouter"] = None,
+        topic_candidates: int = 0,
+        topic_top_k: int = 5,
+        fanout_concurrency: int = 4,
+        plan: Optional[ExecutionPlan] = None
+    ):
         """
         Initializes the system, model client, agents, and helper classes.
         
         Args:
-            api_key (str): The API key for the language model.
+            api_key (str, optional): The API key for the language model. Required unless model_client is given.
+            model_client (ChatCompletionClient, optional): A shared model client to use instead of creating one.
+            verbose (bool): Whether to render rich panels and tables to the console.
+            open_browser (bool): Whether to open the HTML report in a browser after each run. Skipped on a
+                headless session (see result_saver.is_headless).
+            cache (ResponseCache, optional): A response cache consulted before every agent's model call.
+            rate_limiter (RateLimiter, optional): A scheduler that throttles and retries every model call.
+                When model_client is given, cache and rate_limiter are only used for reporting and the
+                client is expected to be built with them already (see create_model_client).
+            stream_tokens (bool): Stream model output token by token and render it live while each agent is answering.
+            export_trace (bool): Write a Chrome trace (Perfetto-compatible) of the agent turns after each run.
+            context_policy (str): How much of the transcript each agent sends to the model: "full", "fields"
+                (structured fields of the agents it depends on), "summary" (a digest of older messages plus
+                the most recent ones) or "last_n" (only the most recent ones). See context_policy.py.
+            context_window (int): How many recent messages "summary" and "last_n" keep verbatim.
+            prompt_layout (str): "shared_prefix" sends every agent's requests with one shared system message
+                first and the agent's own instructions last, so the provider's prompt cache can reuse the
+                common prefix across agents; "classic" sends the agent's system message first. See prompt_layout.py.
+            idea_index (IdeaIndex, optional): The index of past ideas; every completed run is added to it.
+            gating (GatingPolicy, optional): The early-exit rules applied to the agents' parsed outputs.
+                Defaults to GatingPolicy with the plan's termination thresholds.
+            printer (PrettyPrinter, optional): Receives the run's output instead of the printer chosen by verbose.
+            output (str): The console output when verbose: "rich", "jsonl" (one JSON line per event), "null",
+                or "auto" (rich on a terminal, jsonl otherwise). See pretty_printer.create_printer.
+            teams (int): How many runs this instance executes at the same time. Each concurrent run uses its own
+                set of agents from a pool; the first set is built here and later ones on demand, and every set
+                is reset and reused by the following runs.
+            router (ModelRouter, optional): Routes each agent to its own chain of models (see model_router.py).
+                Agents without a route, and the system when no model_client is given, use its default route.
+            topic_candidates (int): When above 0, the topic recommender generates this many candidate topics in
+                parallel calls and scores each in its own call (as "topic_scorer") instead of writing five
+                self-scored topics in one reply (see topic_fanout.py).
+            topic_top_k (int): How many of the best-scored candidates are passed on to the later agents.
+            fanout_concurrency (int): The most candidate or scoring calls of one run in flight at the same time.
+            plan (ExecutionPlan, optional): The agents, prompts, dependencies and termination rules to run
+                (see pipeline_spec.py). Defaults to the built-in ten-agent pipeline.
         """
-        if not api_key:
-            raise ValueError("API key cannot be empty.")
-            
-        # NOTE: The base_url points to Google's endpoint for using Gemini via an OpenAI-compatible API.
-        # 참고: base_url은 OpenAI 호환 API를 통해 Gemini를 사용하기 위한 Google의 엔드포인트를 가리킵니다.
-        self.model_client = OpenAIChatCompletionClient(
-            model="gemini-2.0-flash", # As specified in the notebook
-            api_key=api_key,
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-        )
-        self.printer = PrettyPrinter()
-        self.result_saver = ResearchResultSaver()
-        self._setup_advanced_agents()
-
-    def _setup_advanced_agents(self):
-        """Sets up all the specialized AI agents with their system messages and roles."""
-        self.domain_classifier = AssistantAgent(
-            name="domain_classifier",
-            model_client=self.model_client,
-            system_message="You are an expert at accurately identifying the primary domain of a research idea. Respond in the format: 🎯 Domain Analysis\n- Primary Domain: [domain_name]\n- Confidence: [95%]\n- Keywords: [key1, key2]. End your response with 'Domain analysis complete.'"
-        )
-        self.senior_researcher = AssistantAgent(
-            name="senior_researcher",
-            model_client=self.model_client,
-            system_message="You are a senior researcher guiding a junior colleague. Refine their idea into a concrete research plan. Respond in the format: 💡 Refined Idea\n- Core Question: [question]\n- Objective: [objective]\n- Challenges: [challenges]. End your response with 'Idea refinement complete.'"
-        )
-        self.prompt_engineer = AssistantAgent(
-            name="prompt_engineer",
-            model_client=self.model_client,
-            system_message="You are a prompt engineering expert who optimizes research questions. Respond in the format: ✏️ Optimized Questions\n- RQ1: [main_question]\n- RQ2: [sub_question]\n- Validation Method: [method]. End your response with 'Question optimization complete.'"
-        )
-        self.ai_specialist = AssistantAgent(
-            name="ai_specialist",
-            model_client=self.model_client,
-            system_message="You are an expert in AI technology and methodologies. Design the AI-powered solution. Respond in the format: 🤖 AI Technology Design\n- Core Tech: [tech]\n- Strategy: [strategy]\n- Performance: [expected_results]. End with 'AI design complete.'"
-        )
-        self.research_trend_analyst = AssistantAgent(
-            name="research_trend_analyst",
-            model_client=self.model_client,
-            system_message="You analyze research trends from the last 5 years. Respond in the format: 📚 Trend Analysis\n- Key Trends: [trends]\n- Research Gaps: [gaps]\n- Future Outlook: [outlook]. End with 'Trend analysis complete.'"
-        )
-        self.feasibility_evaluator = AssistantAgent(
-            name="feasibility_evaluator",
-            model_client=self.model_client,
-            system_message="You rigorously evaluate research feasibility. Respond in the format: ⚖️ Feasibility Assessment\n- Technical: [8/10] - [reason]\n- Viability: [7/10] - [reason]\n- Verdict: [Proceed/Revise]. End with 'Feasibility assessment complete.'"
-        )
-        self.improvement_strategist = AssistantAgent(
-            name="improvement_strategist",
-            model_client=self.model_client,
-            system_message="You are an expert at identifying and rectifying weaknesses in a research plan. Respond in the format: 🔧 Improvement Strategy\n- Key Weakness: [weakness]\n- Solution: [solution]\n- Expected Outcome: [outcome]. End with 'Strategy formulation complete.'"
-        )
-        self.topic_recommender = AssistantAgent(
-            name="topic_recommender",
-            model_client=self.model_client,
-            system_message="You are an expert system that recommends 5 specific research topics. Respond in the format: 🎯 Topic Recommendations\n1. [Topic 1] - Innovation: 8/10, Feasibility: 9/10\n... End with 'Topic recommendation complete.'"
-        )
-        self.advisor_professor = AssistantAgent(
-            name="advisor_professor",
-            model_client=self.model_client,
-            system_message="You are a professor providing the final review. Respond in the format: 👨‍🏫 Final Review\n- Strengths: [strengths]\n- Concerns: [concerns]\n- Verdict: [APPROVE/REJECT]\n- Next Steps: [actions]. End with 'Final review complete.'"
-        )
-        self.final_resource_engineer = AssistantAgent(
-            name="final_resource_engineer",
-            model_client=self.model_client,
-            system_message="You provide a complete resource package for an approved topic. Respond in the format: 🛠️ Resource Package\n- Datasets: [dataset_info]\n- AI Models: [model_info]\n- Dev Env: [tools]\n- Roadmap: [12-month_plan]. End with 'Resource package complete.'"
-        )
+        if prompt_layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"Unknown prompt layout: {prompt_layout}. Choose from {', '.join(PROMPT_LAYOUTS)}.")
+        if model_client is None:
+            if router is not None:
+                model_client = router.client_for("default")
+            else:
+                model_client = create_model_client(api_key, cache=cache, rate_limiter=rate_limiter)
+        self.model_client = model_client
+        self.router = router
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.stream_tokens = stream_tokens
+        self.export_trace = export_trace
+        self.context_policy = context_policy
+        self.context_window = context_window
+        self.prompt_layout = prompt_layout
+        self.idea_index = idea_index
+        self.topic_candidates = topic_candidates
+        self.topic_top_k = topic_top_k
+        self.fanout_concurrency = fanout_concurrency
+        self.printer = printer or (create_printer(output) if verbose else QuietPrinter())
+        self.open_browser = open_browser
+        self.plan = plan or load_plan()
+        self.result_saver = ResearchResultSaver(plan=self.plan)
+        self.gating = gating or GatingPolicy(**self.plan.termination)
+        self.team_pool = TeamPool(self._create_team, size=teams)
+        self.team_pool.warm()
 
-    async def execute_research_process(self, user_idea: str):
+    def _agent_client(self, agent_name: str, instrumentation: RunInstrumentation) -> ChatCompletionClient:
+        """Returns the model client for one agent: the shared (or routed) client in the configured prompt
+        layout, instrumented per agent."""
+        client = self.router.client_for(agent_name) if self.router is not None else self.model_client
+        return InstrumentedChatCompletionClient(apply_prompt_layout(client, self.prompt_layout), agent_name,
+                                                instrumentation)
+
+    def _agent_context(self, agent_name: str, context_savings: ContextSavings):
+        """Returns the model context for one agent, compacted according to the context policy."""
+        return create_model_context(self.context_policy, agent_name, context_savings, self.context_window,
+                                    self.plan.dependencies)
+
+    def _create_agents(self, instrumentation: RunInstrumentation, context_savings: ContextSavings) -> List[AssistantAgent]:
         """
-        Executes the entire research process asynchronously.
+        Creates the pipeline's agents with their system messages and roles.
 
         Args:
-            user_idea (str): The research idea provided by the user.
-        
+            instrumentation (RunInstrumentation): The recorder the agents' model calls report to.
+            context_savings (ContextSavings): The counter the agents' model contexts report to.
+
         Returns:
-            dict: A dictionary containing the processed messages and saved file info.
+            List[AssistantAgent]: The agents in their round-robin speaking order.
         """
-        self.printer.print_header()
-        
-        # The group chat termination condition
-        termination_condition = MaxMessageTermination(max_messages=12)
-
-        team = RoundRobinGroupChat(
-            participants=[
-                self.domain_classifier, self.senior_researcher, self.prompt_engineer,
-                self.ai_specialist, self.research_trend_analyst, self.feasibility_evaluator,
-                self.improvement_strategist, self.topic_recommender, self.advisor_professor,
-                self.final_resource_engineer
-            ],
-            termination_condition=termination_condition
-        )
-        
-        # Initial message to kick off the process
-        initial_message_content = (
+        agents = []
+        for name in self.plan.order:
+            if name == "topic_recommender" and self.topic_candidates > 0:
+                agents.append(TopicFanOutAgent(
+                    name=name,
+                    generator_client=self._agent_client(name, instrumentation),
+                    scorer_client=self._agent_client("topic_scorer", instrumentation),
+                    model_context=self._agent_context(name, context_savings),
+                    candidates=self.topic_candidates,
+                    top_k=self.topic_top_k,
+                    concurrency=self.fanout_concurrency
+                ))
+                continue
+            agents.append(AssistantAgent(
+                name=name,
+                model_client=self._agent_client(name, instrumentation),
+                model_context=self._agent_context(name, context_savings),
+                model_client_stream=self.stream_tokens,
+                system_message=self.plan.system_messages[name]
+            ))
+        return agents
+
+    def _create_team(self) -> ResearchTeam:
+        """Builds a team: a new set of agents with its own gating state, instrumentation and context savings."""
+        instrumentation = RunInstrumentation(MODEL_NAME, pipeline=self.plan.name)
+        context_savings = ContextSavings()
+        agents = self._create_agents(instrumentation, context_savings)
+        if self.gating.agent_order is None:
+            self.gating.agent_order = [agent.name for agent in agents]
+        # Each team gets its own copy of the policy: the thresholds are shared, the run state is not.
+        gating = copy.copy(self.gating)
+        gating.reset()
+        return ResearchTeam(agents, self.model_client, gating, instrumentation, context_savings,
+                            self.plan.dependencies, self.plan.stages)
+
+    @staticmethod
+    def _initial_message(user_idea: str) -> str:
+        """The user message that kicks off the round-robin group chat."""
+        return (
             f'Start the analysis for the research idea: "{user_idea}"\n\n'
             'Each expert must perform their analysis and end their response with "[Role] complete."\n'
             'When the entire process is finished, declare "Research process complete."'
         )
-        
+
+    async def _round_robin_messages(self, team: ResearchTeam, user_idea: str, restored: List[dict]):
+        """
+        Yields (kind, agent, content, timing) for each message of the round-robin group chat,
+        and ("chunk", agent, text, None) for streamed model output when token streaming is on.
+
+        The agents speak in order, except where the gating policy ends the run early, loops back to the
+        improvement strategist or skips an agent. Restored messages from a checkpoint are replayed to the
+        team as its task, so completed turns are not re-queried.
+        """
         # Wrapping in TextMessage is important for autogen
-        initial_task = TextMessage(content=initial_message_content, source="user")
+        if restored:
+            task = [TextMessage(content=m["content"], source=m["agent"]) for m in restored]
+        else:
+            task = [TextMessage(content=self._initial_message(user_idea), source="user")]
+
+        # The gating policy sees every message (the restored ones included) through the termination
+        # condition, and picks the next speaker from its state, so a resumed run continues after the
+        # last agent that spoke.
+        run_start = time.perf_counter()
+        last_finished = 0.0
+        replayed = 0
+        async for result in team.group_chat.run_stream(task=task):
+            if restored and replayed < len(task):
+                replayed += 1 # The team echoes the task messages first; they are already recorded
+                continue
+            if isinstance(result, ModelClientStreamingChunkEvent):
+                yield "chunk", result.source, result.content, None
+                continue
+            finished = time.perf_counter() - run_start
+            timing = {"started": last_finished, "finished": finished, "duration": finished - last_finished}
+            last_finished = finished
+            yield "message", getattr(result, 'source', None), getattr(result, 'content', ''), timing
+
+    async def _dag_messages(self, team: ResearchTeam, user_idea: str, restored: List[dict]):
+        """Yields (kind, agent, content, timing) for each agent of the dependency pipeline as it finishes."""
+        completed = {m["agent"]: m["content"] for m in restored}
+        async for result in team.pipeline.run_stream(user_idea, completed=completed, gate=team.gating):
+            if result["type"] == "chunk":
+                yield "chunk", result["agent"], result["content"], None
+                continue
+            timing = {key: result[key] for key in ("started", "finished", "duration")}
+            yield "message", result["agent"], result["content"], timing
+
+    async def execute_research_process(
+        self,
+        user_idea: str,
+        execution_mode: str = "round_robin",
+        run_id: Optional[str] = None,
+        resume: bool = False,
+        reuse_messages: Optional[List[dict]] = None
+    ):
+        """
+        Executes the entire research process asynchronously.
+
+        Every agent message is appended to a checkpoint under research_results/checkpoints as soon
+        as it arrives, so an interrupted run can be continued with resume=True.
+
+        Args:
+            user_idea (str): The research idea provided by the user. Ignored when resuming.
+            execution_mode (str): "round_robin" runs the agents one after another in a group chat,
+                "dag" runs independent agents concurrently following their declared dependencies.
+                Ignored when resuming.
+            run_id (str, optional): A unique name for the checkpoint and saved files.
+                Defaults to the current timestamp and a hash of the idea.
+            resume (bool): Continue the checkpointed run run_id from the next agent. A completed run is refused.
+            reuse_messages (List[dict], optional): Messages taken over from an earlier run of a near-duplicate
+                idea (see idea_dedup.load_reusable_messages). They are recorded as already completed stages.
+        
+        Returns:
+            dict: A dictionary containing the run id, processed messages, the parsed ResearchRecord,
+            stage timings, any error and saved file info.
+        """
+        checkpoint_dir = os.path.join(self.result_saver.output_dir, "checkpoints")
+        if resume:
+            if not run_id:
+                raise ValueError("A run id is required to resume a run.")
+            checkpoint = await asyncio.to_thread(RunCheckpoint.load, run_id, checkpoint_dir)
+            if checkpoint.completed:
+                report = checkpoint.saved_files.get("html_file") or checkpoint.saved_files.get("json_file")
+                raise ValueError(f"Run '{run_id}' already completed; nothing to resume."
+                                 + (f" Its report is {report}." if report else ""))
+            user_idea, execution_mode = checkpoint.user_idea, checkpoint.execution_mode
+        else:
+            run_id = run_id or RunCheckpoint.make_run_id(user_idea)
+            checkpoint = await asyncio.to_thread(RunCheckpoint.create, run_id, user_idea, execution_mode, checkpoint_dir)
+            for message_data in reuse_messages or []:
+                if message_data["agent"] == "user":
+                    # The reused run was about a paraphrase; the new run's task names the new idea.
+                    message_data = {**message_data, "content": self._initial_message(user_idea)}
+                checkpoint.messages.append(await asyncio.to_thread(checkpoint.append_message, message_data))
+
+        if execution_mode not in ("round_robin", "dag"):
+            raise ValueError(f"Unknown execution mode: {execution_mode}")
+
+        # The run takes a team of its own, so concurrent runs on this system never share agent state.
+        team = await self.team_pool.acquire()
+        result = None
+        try:
+            await team.reset(execution_mode)
+            result = await self._run_team(team, user_idea, execution_mode, run_id, checkpoint)
+        finally:
+            # Rendering may still be in progress on the printer's thread; wait without blocking the event loop.
+            await asyncio.to_thread(self.printer.flush)
+            # A team whose run failed may have been interrupted mid-turn; build a fresh one instead.
+            discard = result is None or result["error"] is not None
+            if not discard:
+                await team.clear_history(execution_mode) # The run's messages are in its checkpoint and reports
+            self.team_pool.release(team, discard=discard)
+        return result
+
+    def _open_report(self, user_idea: str, run_id: str, restored: List[dict]) -> StreamingReportWriter:
+        """Opens the run's reports and writes the messages restored from its checkpoint (on a worker thread)."""
+        report = self.result_saver.open_report(user_idea, run_id)
+        for message_data in restored:
+            report.write_message(message_data)
+        return report
+
+    @staticmethod
+    def _persist_message(checkpoint: RunCheckpoint, report: StreamingReportWriter, message_data: dict,
+                         timing: dict) -> MessageRecord:
+        """Appends one message to the checkpoint and the reports (on a worker thread)."""
+        record = checkpoint.append_message(message_data, timing)
+        report.write_message(message_data)
+        return record
+
+    async def _run_team(self, team: ResearchTeam, user_idea: str, execution_mode: str, run_id: str,
+                        checkpoint: RunCheckpoint) -> dict:
+        """Runs the agents of a freshly reset team and reports and saves the run (see execute_research_process)."""
+        if execution_mode == "round_robin":
+            stream = self._round_robin_messages(team, user_idea, checkpoint.messages)
+            expected_messages = len(team.agents) + 1 # The user's task is the first message
+        else:
+            stream = self._dag_messages(team, user_idea, checkpoint.messages)
+            expected_messages = len(team.agents)
+
+        current_run_id.set(run_id) # Labels this run's events on a printer shared with concurrent runs
+        current_plan.set(self.plan)
+        self.printer.print_header(len(team.agents))
+        self.printer.print_run_info(run_id, len(checkpoint.messages))
         
-        stream = team.run_stream(task=initial_task)
-        processed_messages = []
-        message_count = 0
+        processed_messages = list(checkpoint.messages)
+        report = await asyncio.to_thread(self._open_report, user_idea, run_id, processed_messages)
+        record = parse_research_messages(processed_messages)
+        stage_timings = []
+        message_count = checkpoint.last_step
+        error = None
+        run_start = time.perf_counter()
 
         try:
-            async for result in stream:
+            async for kind, source, content, timing in stream:
+                if kind == "chunk":
+                    self.printer.print_agent_stream_chunk(source, content)
+                    continue
+
                 message_count += 1
                 
                 # Extract clean message data
-                agent = getattr(result, 'source', f'agent_{message_count}')
-                content = getattr(result, 'content', '').strip()
+                agent = source or f'agent_{message_count}'
+                content = (content or '').strip() if isinstance(content, str) else ''
                 
                 if not content:
                     continue # Skip empty messages
                 
                 message_data = {"step": message_count, "agent": agent, "content": content}
-                processed_messages.append(message_data)
+                # Only a compact record is kept for the rest of the run; the body stays in the checkpoint.
+                processed_messages.append(
+                    await asyncio.to_thread(self._persist_message, checkpoint, report, message_data, timing)
+                )
+                stage_timings.append({"step": message_count, "agent": agent, **timing})
+                parse_agent_output(agent, content, record)
                 
                 # Print formatted output to the console
                 self.printer.print_agent_response(
@@ -152,26 +420,70 @@ class AdvancedAIPlusXSystem:
                     agent=agent,
                     content=content
                 )
-                self.printer.print_progress(message_count, 10)
-
-                if message_count > 15: # Safety break
-                    self.printer.console.print("⚠️ Reached message limit. Finalizing process.", style="bold yellow")
-                    break
+                self.printer.print_progress(message_count, expected_messages)
         except Exception as e:
-            self.printer.console.print(f"❌ An error occurred: {e}", style="bold red")
+            error = str(e)
+            self.printer.print_error(f"An error occurred: {e}")
+        finally:
+            await stream.aclose()
+            self.printer.stop_streams()
+        total_duration = time.perf_counter() - run_start
 
         # Finalize the process
-        self.printer.print_completion(len(processed_messages))
-        self.printer.print_summary_table(processed_messages)
+        self.printer.print_completion(len(processed_messages), len(team.agents))
+        self.printer.print_research_record(record)
+        self.printer.print_gate_decisions(team.gating.decisions)
+        usage = team.instrumentation.summary()
+        self.printer.print_summary_table(processed_messages, team.instrumentation.turns)
+        self.printer.print_stage_timings(stage_timings, total_duration)
+        self.printer.print_usage_summary(usage, total_duration)
+        context_savings = team.context_savings.summary()
+        if self.context_policy != "full":
+            self.printer.print_context_savings(self.context_policy, context_savings)
+        if self.cache is not None:
+            self.printer.print_cache_stats(self.cache.stats())
+        if self.rate_limiter is not None:
+            self.printer.print_rate_limiter_metrics(self.rate_limiter.metrics())
+        router_metrics = self.router.metrics() if self.router is not None else None
+        if router_metrics is not None:
+            self.printer.print_router_metrics(router_metrics)
+        topic_fanout = next((agent.last_stats for agent in team.agents if isinstance(agent, TopicFanOutAgent)), None)
+        if topic_fanout is not None:
+            self.printer.print_topic_fanout(topic_fanout)
         
-        # Save results
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        saved_files = self.result_saver.save_results(processed_messages, user_idea, timestamp)
+        # Close the reports that were written as the messages arrived. The file work runs on worker threads
+        # so the other runs in flight keep receiving their messages meanwhile.
+        saved_files = await asyncio.to_thread(report.close, record.to_dict())
+        if error is None:
+            await asyncio.to_thread(checkpoint.mark_complete, saved_files)
+            if self.idea_index is not None:
+                await asyncio.to_thread(self.idea_index.add, run_id, user_idea, saved_files)
         
+        if self.export_trace:
+            saved_files["trace_file"] = await asyncio.to_thread(
+                team.instrumentation.export_chrome_trace,
+                os.path.join(self.result_saver.output_dir, "traces", f"trace_{run_id}.json"), run_id
+            )
+
         # Print file info and open report
         html_url = f"file://{saved_files['html_file']}"
         self.printer.print_file_info(saved_files, html_url)
-        self.result_saver.open_html_report(saved_files['html_file'])
+        if self.open_browser:
+            await asyncio.to_thread(self.result_saver.open_html_report, saved_files['html_file'])
         
-        return {"messages": processed_messages, "saved_files": saved_files}
-
+        return {
+            "run_id": run_id,
+            "pipeline": self.plan.describe(),
+            "messages": processed_messages,
+            "record": record,
+            "gate_decisions": list(team.gating.decisions),
+            "stage_timings": stage_timings,
+            "turns": list(team.instrumentation.turns),
+            "usage": usage,
+            "context_savings": context_savings,
+            "router_metrics": router_metrics,
+            "topic_fanout": topic_fanout,
+            "total_duration": total_duration,
+            "error": error,
+            "saved_files": saved_files
+        }
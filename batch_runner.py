@@ -0,0 +1,191 @@
+# batch_runner.py
+
+import asyncio
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from autogen_core.models import ChatCompletionClient
+
+from ai_system import AdvancedAIPlusXSystem, create_model_client
+from gating import GatingPolicy
+from idea_dedup import IdeaIndex
+from model_router import ModelRouter
+from pipeline_spec import ExecutionPlan
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+from result_saver import atomic_write
+
+
+def load_ideas(path: str) -> List[Dict]:
+    """
+    Loads research ideas from a JSONL or CSV file.
+
+    JSONL lines may be plain strings or objects with an "idea" field; CSV files need an "idea" column.
+    Both formats may carry an optional "id" used to label the result.
+
+    Args:
+        path (str): The path to a .jsonl or .csv file.
+
+    Returns:
+        List[Dict]: One {"id", "idea"} dictionary per non-empty idea, in file order.
+
+    Raises:
+        ValueError: If the file is malformed, e.g. a JSONL line that is neither a string nor an object.
+    """
+    ideas = []
+    if path.lower().endswith(".csv"):
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames is None or "idea" not in reader.fieldnames:
+                raise ValueError(f"CSV file {path} must have an 'idea' column.")
+            rows = list(reader)
+    else:
+        with open(path, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    for index, row in enumerate(rows, start=1):
+        if isinstance(row, str):
+            row = {"idea": row}
+        if not isinstance(row, dict) or not isinstance(row.get("idea") or "", str):
+            raise ValueError(f"Idea #{index} in {path} must be a string or an object with an 'idea' string (got {row!r}).")
+        idea = (row.get("idea") or "").strip()
+        if idea:
+            ideas.append({"id": str(row.get("id") or index), "idea": idea})
+    return ideas
+
+
+class BatchRunner:
+    """
+    Runs many research ideas concurrently on a bounded pool of workers that share one model client.
+    하나의 모델 클라이언트를 공유하는 제한된 워커 풀에서 여러 연구 아이디어를 동시에 실행합니다.
+    """
+
+    def __init__(self, api_key: str, concurrency: int = 4, execution_mode: str = "round_robin",
+                 cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None,
+                 idea_index: Optional[IdeaIndex] = None, router: Optional[ModelRouter] = None,
+                 model_client: Optional[ChatCompletionClient] = None, plan: Optional[ExecutionPlan] = None,
+                 gating: Optional[GatingPolicy] = None, context_policy: str = "full", context_window: int = 3,
+                 prompt_layout: str = "shared_prefix"):
+        """
+        Initializes the runner.
+
+        Args:
+            api_key (str): The API key for the language model.
+            concurrency (int): The maximum number of ideas processed at the same time.
+            execution_mode (str): The execution mode passed to each research run.
+            cache (ResponseCache, optional): A response cache shared by all workers.
+            rate_limiter (RateLimiter, optional): A scheduler shared by all workers to stay within the API limits.
+            idea_index (IdeaIndex, optional): Past ideas; an idea that near-duplicates one of them is answered
+                with the earlier report instead of being run, and every completed run is added to it.
+            router (ModelRouter, optional): Routes each agent to its own chain of models instead of one shared client.
+            model_client (ChatCompletionClient, optional): A ready client to use instead of creating one
+                (e.g. a ReplayChatCompletionClient).
+            plan (ExecutionPlan, optional): The pipeline every idea runs through. Defaults to the built-in one.
+            gating (GatingPolicy, optional): The gating rules of every run. Defaults to the plan's termination rules.
+            context_policy (str): What each agent sees of the earlier messages (see context_policy.py).
+            context_window (int): The number of recent messages kept by the "last_n" policy.
+            prompt_layout (str): How each agent's request is laid out (see prompt_layout.py).
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1.")
+        if model_client is not None:
+            self.model_client = model_client
+        elif router is not None:
+            self.model_client = router.client_for("default")
+        else:
+            self.model_client = create_model_client(api_key, cache=cache, rate_limiter=rate_limiter)
+        self.router = router
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.execution_mode = execution_mode
+        self.idea_index = idea_index
+        self.plan = plan
+        self.gating = gating
+        self.context_policy = context_policy
+        self.context_window = context_window
+        self.prompt_layout = prompt_layout
+
+    async def _worker(self, system: AdvancedAIPlusXSystem, queue: asyncio.Queue, results: List[Dict], batch_id: str):
+        """Processes ideas from the queue one at a time; each run borrows a team from the shared system."""
+        while True:
+            try:
+                index, item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            record = {"id": item["id"], "idea": item["idea"]}
+            start = time.perf_counter()
+            duplicate = self.idea_index.find_duplicate(item["idea"]) if self.idea_index is not None else None
+            if duplicate:
+                record.update({"status": "duplicate", "error": None, "duplicate_of": duplicate["run_id"],
+                               "similarity": round(duplicate["similarity"], 3), "total_messages": 0,
+                               "saved_files": duplicate["saved_files"]})
+            else:
+                try:
+                    result = await system.execute_research_process(
+                        item["idea"],
+                        execution_mode=self.execution_mode,
+                        run_id=f"{batch_id}_{index:04d}"
+                    )
+                    record.update({
+                        "status": "error" if result["error"] else "ok",
+                        "error": result["error"],
+                        "total_messages": len(result["messages"]),
+                        "structured": result["record"].to_dict(),
+                        "pipeline": result["pipeline"],
+                        "usage": result["usage"],
+                        "saved_files": result["saved_files"]
+                    })
+                except Exception as e:
+                    record.update({"status": "error", "error": str(e), "total_messages": 0, "saved_files": {}})
+            record["duration"] = round(time.perf_counter() - start, 3)
+            results[index] = record
+            print(f"[{sum(r is not None for r in results)}/{len(results)}] {record['status']:5} "
+                  f"{record['duration']:7.1f}s  {record['id']}: {record['idea'][:60]}")
+
+    async def run(self, ideas: List[Dict]) -> Dict:
+        """
+        Runs all ideas and writes a JSONL summary with one line per idea.
+
+        Args:
+            ideas (List[Dict]): The ideas as returned by load_ideas.
+
+        Returns:
+            Dict: The per-idea results (in input order) and the path of the summary file.
+        """
+        batch_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, item in enumerate(ideas):
+            queue.put_nowait((index, item))
+        results: List[Dict] = [None] * len(ideas)
+
+        try:
+            workers = min(self.concurrency, len(ideas))
+            # An empty ideas file builds no system (a team pool needs at least one team) and gets an empty summary.
+            if workers:
+                system = AdvancedAIPlusXSystem(model_client=self.model_client, verbose=False, open_browser=False,
+                                               idea_index=self.idea_index, teams=workers, router=self.router,
+                                               plan=self.plan, gating=self.gating, context_policy=self.context_policy,
+                                               context_window=self.context_window, prompt_layout=self.prompt_layout)
+                await asyncio.gather(*(self._worker(system, queue, results, batch_id) for _ in range(workers)))
+        finally:
+            await (self.router.close() if self.router is not None else self.model_client.close())
+
+        summary_dir = os.path.join("research_results", "batch")
+        os.makedirs(summary_dir, exist_ok=True)
+        summary_file = os.path.join(summary_dir, f"batch_{batch_id}.jsonl")
+        summary = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in results)
+        await asyncio.to_thread(atomic_write, summary_file, summary)
+
+        return {
+            "results": results,
+            "summary_file": os.path.abspath(summary_file),
+            "cache_stats": self.cache.stats() if self.cache is not None else None,
+            "rate_limiter_metrics": self.rate_limiter.metrics() if self.rate_limiter is not None else None,
+            "router_metrics": self.router.metrics() if self.router is not None else None
+        }
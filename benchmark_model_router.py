@@ -0,0 +1,190 @@
+# benchmark_model_router.py
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from autogen_core.models import UserMessage
+
+from ai_system import AdvancedAIPlusXSystem
+from fake_openai_server import FakeOpenAIServer
+from gating import GatingPolicy
+from model_router import ModelRouter
+
+IDEA = "Develop an AI system to detect wildfires early using drones"
+
+
+def _router(primary: FakeOpenAIServer, backup: FakeOpenAIServer, hedge_after: Optional[float]) -> ModelRouter:
+    """Routes every agent to the primary endpoint first and to the backup endpoint second."""
+    return ModelRouter({
+        "providers": {"primary": {"base_url": primary.base_url, "api_key": "benchmark"},
+                      "backup": {"base_url": backup.base_url, "api_key": "benchmark"}},
+        "routes": {"default": {"providers": ["primary", "backup"], "hedge_after": hedge_after}},
+    })
+
+
+async def _routed_run(scenario: str, execution_mode: str, latency: float, hedge_after: float) -> Dict:
+    """
+    Runs one idea through a two-provider route and returns what happened. In the "fallback" scenario the
+    primary endpoint answers every request with HTTP 429; in the "hedging" scenario it answers after
+    `latency` seconds, while the backup answers at once.
+    """
+    primary = FakeOpenAIServer(fail_first=sys.maxsize) if scenario == "fallback" else FakeOpenAIServer(latency=latency)
+    async with primary, FakeOpenAIServer() as backup:
+        router = _router(primary, backup, hedge_after if scenario == "hedging" else None)
+        # The fake replies carry no verdicts or scores, so every agent speaks exactly once.
+        system = AdvancedAIPlusXSystem(router=router, verbose=False, gating=GatingPolicy(enabled=False))
+        start = time.perf_counter()
+        result = await system.execute_research_process(IDEA, execution_mode=execution_mode,
+                                                       run_id=f"model_router_{scenario}_{execution_mode}")
+        elapsed = time.perf_counter() - start
+        await router.close()
+        return {"result": result, "metrics": router.metrics(), "primary": len(primary.requests) + primary.rejected,
+                "backup": len(backup.requests), "agents": len(system.plan.order), "elapsed": elapsed}
+
+
+async def _cancelled_call(latency: float, hedge_after: float) -> Dict:
+    """Cancels a hedged call while both attempts are in flight and returns how the cancellation ended."""
+    async with FakeOpenAIServer(latency=latency) as primary, FakeOpenAIServer(latency=latency) as backup:
+        router = _router(primary, backup, hedge_after)
+        call = asyncio.ensure_future(router.client_for("default").create([UserMessage(content=IDEA, source="user")]))
+        await asyncio.sleep(hedge_after * 2)
+        start = time.perf_counter()
+        call.cancel()
+        try:
+            await call
+            outcome = "completed"
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+        except Exception as e:
+            outcome = f"failed ({type(e).__name__})"
+        elapsed = time.perf_counter() - start
+        await router.close()
+        return {"outcome": outcome, "elapsed": elapsed, "hedged": router.stats["backup"].hedges}
+
+
+def check_run(scenario: str, run: Dict, latency: float) -> List[str]:
+    """
+    Checks a routed run: it succeeded with every agent answering once and every call ended on the backup.
+    In the fallback scenario each call first failed on the primary; in the hedging scenario each call was
+    hedged and finished well before the slow primary would have answered.
+
+    Args:
+        scenario (str): "fallback" or "hedging".
+        run (Dict): What _routed_run returned.
+        latency (float): The primary endpoint's latency in the hedging scenario.
+
+    Returns:
+        List[str]: A description of every violation.
+    """
+    problems = []
+    result, metrics = run["result"], run["metrics"]
+    if result["error"] is not None:
+        problems.append(f"the run failed: {result['error'].splitlines()[0]}")
+    agents = [message["agent"] for message in result["messages"] if message["agent"] != "user"]
+    if len(agents) != run["agents"] or len(set(agents)) != len(agents):
+        problems.append(f"expected each of the {run['agents']} agents to answer once, got {agents}")
+    turns = len(result["turns"])
+    backup = metrics["providers"]["backup"]
+    if metrics["calls"] != turns or backup["wins"] != turns or metrics["failed_calls"]:
+        problems.append(f"{backup['wins']} of {metrics['calls']} routed calls ({turns} agent turns) were answered "
+                        f"by the backup, {metrics['failed_calls']} failed")
+    if scenario == "fallback":
+        primary = metrics["providers"]["primary"]
+        if metrics["fallback_calls"] != turns:
+            problems.append(f"{metrics['fallback_calls']} of {turns} calls fell back to the backup")
+        if not primary["failures"] == primary["requests"] == run["primary"] == turns:
+            problems.append(f"the primary was sent {run['primary']} requests for {turns} turns and counted "
+                            f"{primary['failures']} failures: the 429s were not failed over once per call")
+    else:
+        if metrics["hedged_calls"] != turns or backup["hedges"] != turns:
+            problems.append(f"{metrics['hedged_calls']} of {turns} calls were hedged")
+        slowest = max((turn["duration"] for turn in result["turns"]), default=0.0)
+        if slowest >= latency:
+            problems.append(f"the slowest turn took {slowest:.2f}s, not less than the slow primary's {latency}s")
+    return problems
+
+
+def check_cancellation(cancelled: Dict, latency: float) -> List[str]:
+    """Checks that cancelling a hedged call raises CancelledError at once instead of being swallowed."""
+    problems = []
+    if cancelled["hedged"] != 1:
+        problems.append(f"the cancelled call sent {cancelled['hedged']} hedged requests instead of 1")
+    if cancelled["outcome"] != "cancelled":
+        problems.append(f"cancelling a hedged call {cancelled['outcome']} instead of raising CancelledError")
+    elif cancelled["elapsed"] >= latency:
+        problems.append(f"cancelling a hedged call took {cancelled['elapsed']:.2f}s")
+    return problems
+
+
+async def run_benchmark(latency: float = 1.0, hedge_after: float = 0.1) -> Dict:
+    """
+    Runs the agents in both execution modes through a route whose primary provider is rate-limited
+    (fallback) or slow (hedging), and cancels one hedged call.
+
+    Args:
+        latency (float): Seconds the slow primary takes to answer.
+        hedge_after (float): Seconds after which the route sends a hedged request.
+
+    Returns:
+        Dict: Per scenario and mode, the routing counts, the run time and any problems; and the cancellation check.
+    """
+    results: Dict[str, Dict] = {}
+    output_dir = tempfile.mkdtemp(prefix="benchmark_model_router_")
+    cwd = os.getcwd()
+    os.chdir(output_dir) # Keep the benchmark's reports and checkpoints out of research_results
+    try:
+        for scenario in ("fallback", "hedging"):
+            for execution_mode in ("round_robin", "dag"):
+                run = await _routed_run(scenario, execution_mode, latency, hedge_after)
+                results[f"{scenario} ({execution_mode})"] = {
+                    "calls": run["metrics"]["calls"],
+                    "fallbacks": run["metrics"]["fallback_calls"],
+                    "hedged": run["metrics"]["hedged_calls"],
+                    "primary": run["primary"],
+                    "backup": run["backup"],
+                    "p95": run["metrics"]["providers"]["backup"]["p95"],
+                    "elapsed": run["elapsed"],
+                    "problems": check_run(scenario, run, latency),
+                }
+        cancelled = await _cancelled_call(latency, hedge_after)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return {"runs": results, "cancellation": {**cancelled, "problems": check_cancellation(cancelled, latency)}}
+
+
+def main():
+    """Prints the results; exits with 1 when the router did not fall back, hedge or cancel as expected."""
+    parser = argparse.ArgumentParser(description="Drive the model router through a rate-limited and a slow "
+                                                 "provider on local fake endpoints.")
+    parser.add_argument("--latency", type=float, default=1.0,
+                        help="Seconds the slow provider takes to answer (default: 1.0).")
+    parser.add_argument("--hedge-after", type=float, default=0.1,
+                        help="Seconds after which a hedged request is sent (default: 0.1).")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.latency, args.hedge_after))
+    print(f"{'scenario':24} {'calls':>6} {'fallbacks':>10} {'hedged':>7} {'primary':>8} {'backup':>7} "
+          f"{'p95 s':>6} {'run s':>7}")
+    for name, result in results["runs"].items():
+        print(f"{name:24} {result['calls']:6} {result['fallbacks']:10} {result['hedged']:7} {result['primary']:8} "
+              f"{result['backup']:7} {result['p95'] or 0.0:6.2f} {result['elapsed']:7.2f}")
+    cancellation = results["cancellation"]
+    print(f"cancelled hedged call: {cancellation['outcome']} after {cancellation['elapsed']:.3f}s")
+    problems = [f"{name}: {problem}" for name, result in results["runs"].items() for problem in result["problems"]]
+    problems += [f"cancellation: {problem}" for problem in cancellation["problems"]]
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✅ Rate-limited calls fell back, slow calls were hedged, and a cancelled call was cancelled.")
+
+
+if __name__ == "__main__":
+    main()
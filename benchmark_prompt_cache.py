@@ -0,0 +1,133 @@
+# benchmark_prompt_cache.py
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Dict, List
+
+from ai_system import AdvancedAIPlusXSystem, create_model_client
+from fake_openai_server import FakeOpenAIServer
+from prompt_layout import PROMPT_LAYOUTS, SHARED_SYSTEM_MESSAGE
+
+IDEA = "Develop an AI system to detect wildfires early using drones"
+
+
+async def _record_runs(layout: str, execution_mode: str, runs: int) -> Dict:
+    """Runs the same idea several times against a fake endpoint with prompt caching and returns its requests."""
+    async with FakeOpenAIServer(prompt_cache=True) as server:
+        client = create_model_client("benchmark", base_url=server.base_url)
+        system = AdvancedAIPlusXSystem(model_client=client, verbose=False, open_browser=False, prompt_layout=layout)
+        requests: List[List[Dict]] = []
+        usage: Dict = {}
+        for i in range(runs):
+            first = len(server.requests)
+            result = await system.execute_research_process(IDEA, execution_mode=execution_mode,
+                                                           run_id=f"prompt_cache_{layout}_{execution_mode}_{i}")
+            if result["error"]:
+                raise RuntimeError(f"The {layout} {execution_mode} run failed: {result['error']}")
+            requests.append([request["messages"] for request in server.requests[first:]])
+            usage = result["usage"] if i == 0 else usage # The first run shows the cache within one run
+        await client.close()
+    return {"requests": requests, "usage": usage}
+
+
+def check_prefix_stability(requests: List[List[Dict]], execution_mode: str) -> List[str]:
+    """
+    Checks the shared-prefix layout: every request starts with the same system message, repeated runs send
+    byte-identical prefixes, and in a round-robin run each request extends the previous request's prefix.
+
+    Args:
+        requests (List[List[Dict]]): The messages of every request, per run.
+        execution_mode (str): The execution mode of the runs.
+
+    Returns:
+        List[str]: A description of every violation.
+    """
+    problems = []
+    for run, run_requests in enumerate(requests):
+        for index, messages in enumerate(run_requests):
+            if messages[0] != {"role": "system", "content": SHARED_SYSTEM_MESSAGE}:
+                problems.append(f"run {run}, request {index}: does not start with the shared system message")
+
+    # The prefix is everything but the trailing agent instructions; key it by those instructions, since the
+    # agents of a dependency pipeline finish in no fixed order.
+    def prefixes(run_requests: List[List[Dict]]) -> Dict[str, List[str]]:
+        keyed: Dict[str, List[str]] = {}
+        for messages in run_requests:
+            keyed.setdefault(json.dumps(messages[-1]), []).append(json.dumps(messages[:-1], ensure_ascii=False))
+        return keyed
+
+    first = prefixes(requests[0])
+    for run, run_requests in enumerate(requests[1:], 1):
+        if prefixes(run_requests) != first:
+            problems.append(f"run {run}: the prompt prefixes differ from run 0")
+
+    if execution_mode == "round_robin":
+        for index, (previous, current) in enumerate(zip(requests[0], requests[0][1:]), 1):
+            if current[:len(previous) - 1] != previous[:-1]:
+                problems.append(f"request {index}: does not extend the prefix of request {index - 1}")
+    return problems
+
+
+async def run_benchmark(runs: int = 2) -> Dict[str, Dict]:
+    """
+    Compares the prompt layouts in both execution modes against a local endpoint that reports the prefix
+    each request shares with an earlier one as cached tokens, and checks that the shared prefix is byte-stable.
+
+    Args:
+        runs (int): Runs of the same idea per layout and mode (at least 2 to compare prefixes across runs).
+
+    Returns:
+        Dict[str, Dict]: Per layout and mode, the prompt and cached tokens of the first run and any problems.
+    """
+    results: Dict[str, Dict] = {}
+    output_dir = tempfile.mkdtemp(prefix="benchmark_prompt_cache_")
+    cwd = os.getcwd()
+    os.chdir(output_dir) # Keep the benchmark's reports and checkpoints out of research_results
+    try:
+        for execution_mode in ("round_robin", "dag"):
+            for layout in PROMPT_LAYOUTS:
+                recorded = await _record_runs(layout, execution_mode, runs)
+                usage = recorded["usage"]
+                problems = []
+                if layout == "shared_prefix":
+                    problems = check_prefix_stability(recorded["requests"], execution_mode)
+                results[f"{layout} ({execution_mode})"] = {
+                    "prompt_tokens": usage["prompt_tokens"],
+                    "cached_prompt_tokens": usage["cached_prompt_tokens"],
+                    "cached_ratio": usage["cached_prompt_tokens"] / usage["prompt_tokens"] if usage["prompt_tokens"] else 0.0,
+                    "cost": usage["cost"],
+                    "problems": problems,
+                }
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    """Prints the comparison; exits with 1 when the shared prefix is not byte-stable."""
+    parser = argparse.ArgumentParser(description="Compare the prompt layouts' provider-side cache hits "
+                                                 "against a local fake endpoint.")
+    parser.add_argument("--runs", type=int, default=2, help="Runs of the same idea per layout and mode (default: 2).")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(max(2, args.runs)))
+    print(f"{'layout':28} {'prompt':>8} {'cached':>8} {'ratio':>7} {'cost $':>10}")
+    for name, result in results.items():
+        print(f"{name:28} {result['prompt_tokens']:8} {result['cached_prompt_tokens']:8} "
+              f"{result['cached_ratio']:7.1%} {result['cost']:10.6f}")
+    problems = [f"{name}: {problem}" for name, result in results.items() for problem in result["problems"]]
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✅ The shared prefix is byte-stable across agents and runs.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# benchmark_rate_limiter.py
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from ai_system import AdvancedAIPlusXSystem, create_model_client
+from fake_openai_server import FakeOpenAIServer
+from gating import GatingPolicy
+from rate_limiter import RateLimiter
+
+IDEA = "Develop an AI system to detect wildfires early using drones"
+
+
+async def _throttled_run(execution_mode: str, fail_first: int, fail_every: int, retry_after: float) -> Dict:
+    """Runs one idea against a fake endpoint that answers some requests with HTTP 429 and returns what happened."""
+    async with FakeOpenAIServer(fail_first=fail_first, fail_every=fail_every, retry_after=retry_after) as server:
+        limiter = RateLimiter(max_retries=5, base_delay=0.05, max_delay=1.0)
+        client = create_model_client("benchmark", base_url=server.base_url, rate_limiter=limiter)
+        # The fake replies carry no verdicts or scores, so every agent speaks exactly once.
+        system = AdvancedAIPlusXSystem(model_client=client, verbose=False, rate_limiter=limiter,
+                                       gating=GatingPolicy(enabled=False))
+        start = time.perf_counter()
+        result = await system.execute_research_process(IDEA, execution_mode=execution_mode,
+                                                       run_id=f"rate_limiter_{execution_mode}")
+        elapsed = time.perf_counter() - start
+        await client.close()
+        return {"result": result, "metrics": limiter.metrics(), "accepted": len(server.requests),
+                "rejected": server.rejected, "agents": len(system.plan.order), "elapsed": elapsed}
+
+
+def check_run(run: Dict, retry_after: float) -> List[str]:
+    """
+    Checks a throttled run: it succeeded with every agent answering once, each rejected call was retried on
+    its own (one accepted request per agent turn, one retry per 429), and the limiter counted every backoff.
+
+    Args:
+        run (Dict): What _throttled_run returned.
+        retry_after (float): The Retry-After the endpoint sent with its 429 responses.
+
+    Returns:
+        List[str]: A description of every violation.
+    """
+    problems = []
+    result, metrics = run["result"], run["metrics"]
+    if result["error"] is not None:
+        problems.append(f"the run failed: {result['error'].splitlines()[0]}")
+    agents = [message["agent"] for message in result["messages"] if message["agent"] != "user"]
+    if len(agents) != run["agents"] or len(set(agents)) != len(agents):
+        problems.append(f"expected each of the {run['agents']} agents to answer once, got {agents}")
+    if run["rejected"] == 0:
+        problems.append("the endpoint rejected no request, so nothing was tested")
+    if run["accepted"] != len(result["turns"]):
+        problems.append(f"{run['accepted']} requests were answered for {len(result['turns'])} agent turns: "
+                        f"more than the failed calls were sent again")
+    turn_retries = sum(turn["retries"] for turn in result["turns"])
+    if not metrics["retries"] == turn_retries == run["rejected"]:
+        problems.append(f"{run['rejected']} calls were rejected but the limiter counted {metrics['retries']} "
+                        f"retries ({turn_retries} in the agent turns)")
+    if metrics["throttled"] != run["rejected"]:
+        problems.append(f"{run['rejected']} calls were rejected with 429 but {metrics['throttled']} were counted as throttled")
+    if metrics["failures"]:
+        problems.append(f"{metrics['failures']} calls failed after their retries")
+    if metrics["wait_seconds"] < retry_after:
+        problems.append(f"the calls waited {metrics['wait_seconds']:.3f}s in total, less than one Retry-After "
+                        f"of {retry_after}s")
+    return problems
+
+
+async def run_benchmark(fail_first: int = 2, fail_every: int = 4, retry_after: float = 0.2) -> Dict[str, Dict]:
+    """
+    Runs the agents in both execution modes against a local endpoint that answers the first fail_first
+    requests and then every fail_every-th request with HTTP 429 and a Retry-After header.
+
+    Args:
+        fail_first (int): How many requests are rejected first.
+        fail_every (int): After that, every Nth request is rejected.
+        retry_after (float): The Retry-After value in seconds.
+
+    Returns:
+        Dict[str, Dict]: Per mode, the request counts, the limiter metrics, the run time and any problems.
+    """
+    results: Dict[str, Dict] = {}
+    output_dir = tempfile.mkdtemp(prefix="benchmark_rate_limiter_")
+    cwd = os.getcwd()
+    os.chdir(output_dir) # Keep the benchmark's reports and checkpoints out of research_results
+    try:
+        for execution_mode in ("round_robin", "dag"):
+            run = await _throttled_run(execution_mode, fail_first, fail_every, retry_after)
+            results[execution_mode] = {
+                "accepted": run["accepted"],
+                "rejected": run["rejected"],
+                "throttled": run["metrics"]["throttled"],
+                "retries": run["metrics"]["retries"],
+                "wait_seconds": run["metrics"]["wait_seconds"],
+                "elapsed": run["elapsed"],
+                "problems": check_run(run, retry_after),
+            }
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    """Prints the results; exits with 1 when the scheduler did not retry, count or recover as expected."""
+    parser = argparse.ArgumentParser(description="Drive the rate limiter through HTTP 429 responses with "
+                                                 "Retry-After from a local fake endpoint.")
+    parser.add_argument("--fail-first", type=int, default=2, help="Reject the first N requests (default: 2).")
+    parser.add_argument("--fail-every", type=int, default=4, help="Then reject every Nth request (default: 4).")
+    parser.add_argument("--retry-after", type=float, default=0.2,
+                        help="Retry-After seconds sent with each 429 (default: 0.2).")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.fail_first, args.fail_every, args.retry_after))
+    print(f"{'mode':12} {'answered':>9} {'429s':>6} {'throttled':>10} {'retries':>8} {'queued s':>9} {'run s':>7}")
+    for mode, result in results.items():
+        print(f"{mode:12} {result['accepted']:9} {result['rejected']:6} {result['throttled']:10} "
+              f"{result['retries']:8} {result['wait_seconds']:9.2f} {result['elapsed']:7.2f}")
+    problems = [f"{mode}: {problem}" for mode, result in results.items() for problem in result["problems"]]
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✅ Every rejected call was retried on its own after its Retry-After, and both runs succeeded.")
+
+
+if __name__ == "__main__":
+    main()
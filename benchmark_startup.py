@@ -0,0 +1,88 @@
+# benchmark_startup.py
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# Modules that must not be imported by the commands that never call the model.
+# 모델을 호출하지 않는 명령에서는 가져오면 안 되는 모듈입니다.
+HEAVY_MODULES = ("autogen_agentchat", "autogen_core", "autogen_ext", "openai", "httpx", "rich", "numpy")
+
+# The commands measured by default: both exit without running any agent.
+DEFAULT_COMMANDS = [["main.py", "--help"], ["main.py", "--list", "1"]]
+
+
+def import_times(args: List[str]) -> Dict[str, int]:
+    """
+    Runs a Python command with -X importtime.
+
+    Args:
+        args (List[str]): The arguments after the interpreter, e.g. ["main.py", "--help"].
+
+    Returns:
+        Dict[str, int]: The self import time in microseconds of every module the command imported.
+    """
+    completed = subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    times = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(1))
+    return times
+
+
+def wall_time(args: List[str], repeats: int) -> float:
+    """Returns the fastest of several runs of the command, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], capture_output=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def check_command(args: List[str], baseline: Dict[str, int], budget_ms: float, repeats: int) -> bool:
+    """
+    Measures one command against the bare interpreter and prints the result.
+
+    Returns:
+        bool: True when the command stays within the budget and imports none of the HEAVY_MODULES.
+    """
+    times = import_times(args)
+    extra = {name: micros for name, micros in times.items() if name not in baseline}
+    extra_ms = sum(extra.values()) / 1000
+    heavy = sorted({name.split(".")[0] for name in extra if name.split(".")[0] in HEAVY_MODULES})
+    ok = extra_ms <= budget_ms and not heavy
+
+    print(f"{'✅' if ok else '❌'} python {' '.join(args)}: {extra_ms:.1f} ms of imports beyond the interpreter "
+          f"(budget {budget_ms:g} ms), {wall_time(args, repeats):.0f} ms wall clock")
+    for name, micros in sorted(extra.items(), key=lambda item: -item[1])[:5]:
+        print(f"    {micros / 1000:7.1f} ms  {name}")
+    if heavy:
+        print(f"    heavy modules imported: {', '.join(heavy)}")
+    return ok
+
+
+def main():
+    """Checks the import-time budget of the commands that do not run the agents; exits with 1 on failure."""
+    parser = argparse.ArgumentParser(description="Check the import-time budget of the fast CLI paths.")
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="Allowed import time beyond the bare interpreter, per command (default: 150).")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per command for the wall-clock time.")
+    args = parser.parse_args()
+
+    baseline = import_times(["-c", "pass"])
+    results = [check_command(command, baseline, args.budget_ms, args.repeats) for command in DEFAULT_COMMANDS]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
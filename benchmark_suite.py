@@ -0,0 +1,278 @@
+# benchmark_suite.py
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from rich.console import Console
+
+from ai_system import AdvancedAIPlusXSystem
+from batch_runner import BatchRunner
+from pipeline_spec import ExecutionPlan, load_plan
+from pretty_printer import PrettyPrinter
+from replay_client import ReplayChatCompletionClient, ReplayLibrary
+from result_saver import ResearchResultSaver
+
+IDEAS = [
+    "Develop an AI system to detect wildfires early using drones",
+    "Predict crop yields from satellite imagery and weather data",
+    "Use graph neural networks to discover new battery materials",
+    "Detect early signs of depression from smartphone usage patterns",
+]
+
+
+def _metric(value: float, unit: str, higher_is_better: bool = False) -> Dict:
+    return {"value": round(value, 3), "unit": unit, "higher_is_better": higher_is_better}
+
+
+async def _single_runs(client: ReplayChatCompletionClient, execution_mode: str, runs: int,
+                       plan: Optional[ExecutionPlan] = None) -> Dict:
+    """Runs one idea at a time on a warm system and returns the median run time and the last run's result."""
+    system = AdvancedAIPlusXSystem(model_client=client, verbose=False, open_browser=False, plan=plan)
+    samples: List[float] = []
+    result = None
+    for i in range(runs):
+        start = time.perf_counter()
+        result = await system.execute_research_process(IDEAS[i % len(IDEAS)], execution_mode=execution_mode,
+                                                       run_id=f"benchmark_{execution_mode}_{i}")
+        samples.append((time.perf_counter() - start) * 1000)
+        if result["error"]:
+            raise RuntimeError(f"The {execution_mode} run failed: {result['error']}")
+    return {"median_ms": statistics.median(samples), "result": result}
+
+
+async def _run_batch(client: ReplayChatCompletionClient, concurrency: int, ideas: int, execution_mode: str,
+                     directory: str, plan: Optional[ExecutionPlan] = None) -> float:
+    """Runs a batch in its own directory and returns the elapsed seconds."""
+    runner = BatchRunner(api_key="replay", concurrency=concurrency, execution_mode=execution_mode,
+                         model_client=client, plan=plan)
+    batch_ideas = [{"id": f"idea_{i}", "idea": f"{IDEAS[i % len(IDEAS)]} (variant {i})"} for i in range(ideas)]
+    # Batches started within the same second share their run ids, so each one gets its own directory
+    os.makedirs(directory, exist_ok=True)
+    os.chdir(directory)
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()): # The runner prints one line per idea
+            batch = await runner.run(batch_ideas)
+    finally:
+        os.chdir("..")
+    elapsed = time.perf_counter() - start
+    failed = [record for record in batch["results"] if record["status"] != "ok"]
+    if failed:
+        raise RuntimeError(f"{len(failed)} batch runs failed, e.g.: {failed[0]['error']}")
+    return elapsed
+
+
+async def _batch_throughput(client: ReplayChatCompletionClient, concurrency: int, ideas: int,
+                            execution_mode: str, plan: Optional[ExecutionPlan] = None) -> float:
+    """Runs a batch and returns the completed ideas per second."""
+    return ideas / await _run_batch(client, concurrency, ideas, execution_mode, f"batch_{concurrency}", plan)
+
+
+async def _batch_memory(client: ReplayChatCompletionClient, concurrency: int, ideas: int,
+                        plan: Optional[ExecutionPlan] = None) -> float:
+    """Runs a batch under tracemalloc and returns its peak allocated memory per concurrent run in KiB."""
+    tracemalloc.start()
+    try:
+        await _run_batch(client, concurrency, ideas, "round_robin", f"memory_{ideas}", plan)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / concurrency
+
+
+def _report_generation(messages: List[Dict], repeats: int) -> Dict:
+    """Measures writing the JSON, Markdown and HTML reports of a run, and the peak memory it allocates."""
+    saver = ResearchResultSaver(output_dir="benchmark_reports")
+    samples: List[float] = []
+    tracemalloc.start()
+    for i in range(repeats):
+        start = time.perf_counter()
+        saver.save_results(messages, IDEAS[0], f"benchmark_{i}", structured={})
+        samples.append((time.perf_counter() - start) * 1000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    saver.index.close()
+    return {"median_ms": statistics.median(samples), "peak_kib": peak / 1024}
+
+
+def _console_rendering(messages: List[Dict], turns: List[Dict], repeats: int) -> float:
+    """Measures rendering a run's agent panels and summary table to an in-memory terminal."""
+    printer = PrettyPrinter()
+    samples: List[float] = []
+    for _ in range(repeats):
+        printer.console = Console(file=io.StringIO(), width=120, force_terminal=True)
+        start = time.perf_counter()
+        for message in messages:
+            printer.print_agent_response(message["step"], message["agent"], message["content"])
+        printer.print_summary_table(messages, turns)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def run_suite(replay_dir: Optional[str] = None, latency: float = 0.0, runs: int = 5,
+                    concurrency: List[int] = (1, 4), batch_size: int = 8, repeats: int = 20,
+                    plan: Optional[ExecutionPlan] = None) -> Dict[str, Dict]:
+    """
+    Runs the end-to-end benchmarks against a replayed model, so no API key or network is needed and only
+    the system's own cost (plus the configured latency) is measured.
+
+    Args:
+        replay_dir (str, optional): A directory of saved JSON reports to replay; the built-in synthetic run
+            is used when it is None or holds no reports.
+        latency (float): Seconds each replayed reply is delayed by.
+        runs (int): Runs per execution mode for the single-run latency.
+        concurrency (List[int]): The batch concurrency levels to measure; the memory measurement uses the highest.
+        batch_size (int): Ideas per batch.
+        repeats (int): Repetitions of the report and rendering measurements.
+        plan (ExecutionPlan, optional): The pipeline to measure, e.g. to compare two variants against the
+            same baseline. Defaults to the built-in one.
+
+    Returns:
+        Dict[str, Dict]: Each metric's value, unit and whether a higher value is better.
+    """
+    library = ReplayLibrary.from_directory(replay_dir) if replay_dir else ReplayLibrary([])
+    client = ReplayChatCompletionClient(library if library.runs else ReplayLibrary.synthetic(), latency=latency)
+    metrics: Dict[str, Dict] = {}
+    output_dir = tempfile.mkdtemp(prefix="benchmark_suite_")
+    cwd = os.getcwd()
+    os.chdir(output_dir) # Keep the benchmark's reports and checkpoints out of research_results
+    try:
+        last = None
+        for mode in ("round_robin", "dag"):
+            single = await _single_runs(client, mode, runs, plan)
+            metrics[f"single run latency ({mode})"] = _metric(single["median_ms"], "ms")
+            usage = single["result"]["usage"]
+            metrics[f"single run tokens ({mode})"] = _metric(usage["prompt_tokens"] + usage["completion_tokens"], "tokens")
+            last = single["result"]
+        for level in concurrency:
+            throughput = await _batch_throughput(client, level, batch_size, "round_robin", plan)
+            metrics[f"batch throughput (concurrency {level})"] = _metric(throughput, "ideas/s", higher_is_better=True)
+        # With message bodies spilled to the checkpoints, the peak should stay flat as the batch grows.
+        for ideas in (batch_size, 4 * batch_size):
+            peak = await _batch_memory(client, max(concurrency), ideas, plan)
+            metrics[f"peak memory per concurrent run ({ideas} ideas)"] = _metric(peak, "KiB")
+
+        report = _report_generation(last["messages"], repeats)
+        metrics["report generation"] = _metric(report["median_ms"], "ms")
+        metrics["report generation peak memory"] = _metric(report["peak_kib"], "KiB")
+        metrics["console rendering"] = _metric(_console_rendering(last["messages"], last["turns"], repeats), "ms")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return metrics
+
+
+def check_memory_growth(metrics: Dict[str, Dict], batch_size: int, tolerance: float) -> List[str]:
+    """
+    Checks that the peak memory per concurrent run stays flat as the batch grows from batch_size to
+    4 * batch_size ideas, i.e. that finished runs leave no message bodies behind.
+
+    Args:
+        metrics (Dict[str, Dict]): The results of run_suite.
+        batch_size (int): The batch size run_suite was called with.
+        tolerance (float): The allowed relative growth of the larger batch's peak, e.g. 0.25 for 25%.
+
+    Returns:
+        List[str]: A description of the growth when it exceeds the tolerance.
+    """
+    small = metrics[f"peak memory per concurrent run ({batch_size} ideas)"]["value"]
+    large = metrics[f"peak memory per concurrent run ({4 * batch_size} ideas)"]["value"]
+    growth = (large - small) / small if small else 0.0
+    if growth > tolerance:
+        return [f"peak memory per concurrent run grew from {small:g} to {large:g} KiB ({growth * 100:+.0f}%) "
+                f"from {batch_size} to {4 * batch_size} ideas, more than {tolerance * 100:.0f}%"]
+    return []
+
+
+def compare(metrics: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    Compares the metrics with a baseline.
+
+    Args:
+        metrics (Dict[str, Dict]): The current results of run_suite.
+        baseline (Dict[str, Dict]): Earlier results of run_suite.
+        tolerance (float): The allowed relative change in the worse direction, e.g. 0.2 for 20%.
+
+    Returns:
+        List[str]: A description of every metric that regressed beyond the tolerance.
+    """
+    regressions = []
+    for name, metric in metrics.items():
+        if name not in baseline or not baseline[name]["value"]:
+            continue
+        before, after = baseline[name]["value"], metric["value"]
+        change = (after - before) / before
+        if (-change if metric["higher_is_better"] else change) > tolerance:
+            regressions.append(f"{name}: {before:g} -> {after:g} {metric['unit']} ({change * 100:+.0f}%)")
+    return regressions
+
+
+def main():
+    """
+    Prints the benchmark results; exits with 1 when the peak memory per run grows with the batch size, or,
+    with --baseline, when a metric regressed.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the research pipeline end to end against replayed replies.")
+    parser.add_argument("--replay", metavar="DIR", help="Directory of saved JSON reports to replay "
+                                                        "(default: the built-in synthetic run).")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds each replayed reply is delayed by (default: 0).")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per execution mode for the single-run latency (default: 5).")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4],
+                        help="Batch concurrency levels to measure (default: 1 4).")
+    parser.add_argument("--batch-size", type=int, default=8, help="Ideas per batch (default: 8).")
+    parser.add_argument("--repeats", type=int, default=20,
+                        help="Repetitions of the report and rendering measurements (default: 20).")
+    parser.add_argument("--pipeline", metavar="SPEC", help="Pipeline spec to measure (default: the built-in pipeline); "
+                                                           "compare variants with --json and --baseline.")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25,
+                        help="Allowed growth of the peak memory per concurrent run from --batch-size to four "
+                             "times as many ideas (default: 0.25).")
+    parser.add_argument("--json", metavar="FILE", help="Also write the results to a JSON file (usable as a baseline).")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare with the results of an earlier --json run.")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative regression against the baseline (default: 0.2).")
+    args = parser.parse_args()
+
+    replay_dir = os.path.abspath(args.replay) if args.replay else None
+    plan = load_plan(args.pipeline)
+    metrics = asyncio.run(run_suite(replay_dir, args.latency, args.runs, args.concurrency, args.batch_size,
+                                    args.repeats, plan))
+    print(f"🧩 Pipeline '{plan.name}' ({plan.fingerprint}): {len(plan.order)} agents in {len(plan.stages)} stages")
+    print(f"{'metric':42} {'value':>12}  unit")
+    for name, metric in metrics.items():
+        print(f"{name:42} {metric['value']:12.2f}  {metric['unit']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(metrics, f, indent=2)
+    growth = check_memory_growth(metrics, args.batch_size, args.memory_tolerance)
+    for problem in growth:
+        print(f"❌ {problem}")
+    if not growth:
+        print(f"✅ The peak memory per concurrent run stayed within {args.memory_tolerance * 100:.0f}% "
+              f"from {args.batch_size} to {4 * args.batch_size} ideas.")
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(metrics, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        if not regressions:
+            print(f"✅ No metric regressed by more than {args.tolerance * 100:.0f}% against {args.baseline}.")
+    if growth or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmark_teams.py
+
+import argparse
+import asyncio
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from ai_system import AdvancedAIPlusXSystem, create_model_client
+from fake_openai_server import FakeOpenAIServer
+
+
+async def _measure(repeats: int, step: Callable[[], Awaitable]) -> Dict:
+    """Runs the step repeatedly and returns the mean and median wall time in milliseconds."""
+    samples: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await step()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"mean_ms": statistics.mean(samples), "median_ms": statistics.median(samples)}
+
+
+async def run_benchmark(repeats: int = 20, runs: int = 5, execution_mode: str = "round_robin") -> Dict[str, Dict]:
+    """
+    Measures the setup overhead of a run with and without a warm system, against a local stand-in model
+    that answers instantly, so that only the system's own cost is measured.
+
+    Args:
+        repeats (int): How often each setup step is measured.
+        runs (int): How many complete runs are measured per variant.
+        execution_mode (str): The execution mode of the complete runs.
+
+    Returns:
+        Dict[str, Dict]: The timings of each measured step.
+    """
+    results: Dict[str, Dict] = {}
+    output_dir = tempfile.mkdtemp(prefix="benchmark_teams_")
+    cwd = os.getcwd()
+    os.chdir(output_dir) # Keep the benchmark's reports and checkpoints out of research_results
+    try:
+        async with FakeOpenAIServer() as server:
+            client = create_model_client("benchmark", base_url=server.base_url)
+
+            def new_system(**kwargs) -> AdvancedAIPlusXSystem:
+                return AdvancedAIPlusXSystem(model_client=client, verbose=False, open_browser=False, **kwargs)
+
+            system = new_system()
+
+            async def cold_system():
+                team = await new_system().team_pool.acquire()
+                await team.reset(execution_mode)
+
+            async def cold_team():
+                await system._create_team().reset(execution_mode)
+
+            async def warm_team():
+                team = await system.team_pool.acquire()
+                await team.reset(execution_mode)
+                system.team_pool.release(team)
+
+            results["setup: new system per run"] = await _measure(repeats, cold_system)
+            results["setup: new team per run"] = await _measure(repeats, cold_team)
+            results["setup: warm team from the pool"] = await _measure(repeats, warm_team)
+
+            counter = iter(range(1_000_000))
+
+            async def full_run(target: AdvancedAIPlusXSystem):
+                await target.execute_research_process("benchmark idea", execution_mode=execution_mode,
+                                                      run_id=f"benchmark_{next(counter)}")
+
+            results["run: new system per run"] = await _measure(runs, lambda: full_run(new_system()))
+            results["run: one warm system"] = await _measure(runs, lambda: full_run(system))
+            await client.close()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    """Prints the benchmark results as a table."""
+    parser = argparse.ArgumentParser(description="Measure the per-run setup overhead of the research system.")
+    parser.add_argument("--repeats", type=int, default=20, help="Measurements per setup step (default: 20).")
+    parser.add_argument("--runs", type=int, default=5, help="Complete runs per variant (default: 5).")
+    parser.add_argument("--mode", choices=["round_robin", "dag"], default="round_robin")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.repeats, args.runs, args.mode))
+    print(f"{'step':34} {'mean ms':>10} {'median ms':>10}")
+    for name, timing in results.items():
+        print(f"{name:34} {timing['mean_ms']:10.2f} {timing['median_ms']:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+# checkpoint.py
+
+import hashlib
+import json
+import os
+import secrets
+import sys
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class MessageRecord(Mapping):
+    """
+    A compact, read-only agent message whose body stays in the run's checkpoint log: only the step, the
+    (interned) agent name, the first line and the position of the log line are kept in memory, and the
+    content is read back from disk when it is accessed. It reads like the {"step", "agent", "content"}
+    dictionary it replaces.
+    본문은 실행의 체크포인트 로그에 두고 단계, 에이전트 이름, 첫 줄, 로그 위치만 메모리에 유지하는 간결한 메시지 레코드입니다.
+    """
+
+    __slots__ = ("step", "agent", "summary", "path", "offset", "length")
+    KEYS = ("step", "agent", "content")
+
+    def __init__(self, step: int, agent: str, summary: str, path: str, offset: int, length: int):
+        """
+        Args:
+            step (int): The step number of the message.
+            agent (str): The agent that wrote it.
+            summary (str): The first line of the content, for tables and listings.
+            path (str): The checkpoint file holding the message.
+            offset (int): The byte offset of the message's line in the file.
+            length (int): The byte length of that line.
+        """
+        self.step = step
+        self.agent = sys.intern(agent)
+        self.summary = summary
+        self.path = path
+        self.offset = offset
+        self.length = length
+
+    @staticmethod
+    def first_line(content: str, limit: int = 120) -> str:
+        """Returns the first line of a message, shortened to limit characters."""
+        line = content.split('\n', 1)[0]
+        return line if len(line) <= limit else line[:limit] + "..."
+
+    @property
+    def content(self) -> str:
+        """The message body, read from the checkpoint log."""
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            return json.loads(f.read(self.length))["content"]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return f"MessageRecord(step={self.step}, agent={self.agent!r}, summary={self.summary!r})"
+
+
+class RunCheckpoint:
+    """
+    An append-only JSONL log of one research run, written as each agent message arrives so an
+    interrupted run can be resumed without re-querying the agents that already answered.
+    각 에이전트 메시지가 도착할 때마다 기록되는 추가 전용 JSONL 로그로, 중단된 실행을 완료된 에이전트를 다시 호출하지 않고 재개할 수 있습니다.
+    """
+
+    def __init__(self, run_id: str, directory: str):
+        """
+        Args:
+            run_id (str): The identifier of the run.
+            directory (str): The directory holding the checkpoint files.
+        """
+        self.run_id = run_id
+        self.path = os.path.join(directory, f"{run_id}.jsonl")
+        self.user_idea = ""
+        self.execution_mode = "round_robin"
+        self.messages: List[MessageRecord] = []
+        self.completed = False
+        self.saved_files: Dict = {}
+        # Set by load when the file ends in a torn record; cut off before the next append.
+        self._valid_length: Optional[int] = None
+
+    @staticmethod
+    def make_run_id(user_idea: str, timestamp: Optional[str] = None) -> str:
+        """
+        Builds a run identifier from the timestamp, a short hash of the idea and a random suffix, so the same
+        idea started twice within one second still gets two runs.
+
+        Args:
+            user_idea (str): The research idea provided by the user.
+            timestamp (str, optional): Defaults to the current time.
+
+        Returns:
+            str: An identifier such as "20250101_120000_1a2b3c4d_5e6f7a".
+        """
+        timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+        digest = hashlib.sha1(user_idea.encode('utf-8')).hexdigest()[:8]
+        return f"{timestamp}_{digest}_{secrets.token_hex(3)}"
+
+    @classmethod
+    def create(cls, run_id: str, user_idea: str, execution_mode: str, directory: str) -> "RunCheckpoint":
+        """
+        Starts a new checkpoint file with a header record.
+
+        Args:
+            run_id (str): The identifier of the run.
+            user_idea (str): The research idea provided by the user.
+            execution_mode (str): The execution mode of the run.
+            directory (str): The directory holding the checkpoint files.
+
+        Returns:
+            RunCheckpoint: The new checkpoint.
+        """
+        os.makedirs(directory, exist_ok=True)
+        checkpoint = cls(run_id, directory)
+        if os.path.exists(checkpoint.path):
+            raise ValueError(f"A checkpoint for run '{run_id}' already exists. Use resume instead.")
+        checkpoint.user_idea = user_idea
+        checkpoint.execution_mode = execution_mode
+        checkpoint._append({
+            "type": "run",
+            "run_id": run_id,
+            "user_idea": user_idea,
+            "execution_mode": execution_mode,
+            "started": datetime.now().isoformat()
+        })
+        return checkpoint
+
+    @classmethod
+    def load(cls, run_id: str, directory: str) -> "RunCheckpoint":
+        """
+        Reads an existing checkpoint. A partially written last line (from a crash mid-write) is ignored
+        and removed before the next record is appended.
+
+        Args:
+            run_id (str): The identifier of the run.
+            directory (str): The directory holding the checkpoint files.
+
+        Returns:
+            RunCheckpoint: The checkpoint with its idea, mode and recorded messages (bodies left on disk).
+        """
+        checkpoint = cls(run_id, directory)
+        if not os.path.exists(checkpoint.path):
+            raise ValueError(f"No checkpoint found for run '{run_id}' in {directory}.")
+
+        offset = 0
+        with open(checkpoint.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break # The write of this record was cut short, even if it happens to parse
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record["type"] == "run":
+                    checkpoint.user_idea = record["user_idea"]
+                    checkpoint.execution_mode = record["execution_mode"]
+                elif record["type"] == "message":
+                    checkpoint.messages.append(MessageRecord(
+                        record["step"], record["agent"], MessageRecord.first_line(record["content"]),
+                        checkpoint.path, offset, len(line)
+                    ))
+                elif record["type"] == "complete":
+                    checkpoint.completed = True
+                    checkpoint.saved_files = record.get("saved_files", {})
+                offset += len(line)
+        if offset < os.path.getsize(checkpoint.path):
+            checkpoint._valid_length = offset
+        return checkpoint
+
+    @property
+    def last_step(self) -> int:
+        """The step number of the last recorded message, or 0 if there is none."""
+        return self.messages[-1]["step"] if self.messages else 0
+
+    def _append(self, record: Dict) -> Tuple[int, int]:
+        """Appends one record and forces it to disk; returns the byte offset and length of its line."""
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+        if self._valid_length is not None:
+            os.truncate(self.path, self._valid_length)
+            self._valid_length = None
+        with open(self.path, 'ab') as f:
+            offset = f.tell()
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        return offset, len(line)
+
+    def append_message(self, message_data: Dict, timing: Optional[Dict] = None) -> MessageRecord:
+        """
+        Records one agent message.
+
+        Args:
+            message_data (Dict): The message with its 'step', 'agent' and 'content'.
+            timing (Dict, optional): The stage timing of the message.
+
+        Returns:
+            MessageRecord: The message with its body left in the checkpoint file.
+        """
+        offset, length = self._append({"type": "message", **message_data, "timing": timing})
+        return MessageRecord(message_data["step"], message_data["agent"],
+                             MessageRecord.first_line(message_data["content"]), self.path, offset, length)
+
+    def mark_complete(self, saved_files: Dict):
+        """
+        Records that the run finished and where its reports were saved.
+
+        Args:
+            saved_files (Dict): The paths returned by ResearchResultSaver.save_results.
+        """
+        self.completed = True
+        self.saved_files = saved_files
+        self._append({"type": "complete", "finished": datetime.now().isoformat(), "saved_files": saved_files})
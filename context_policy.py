@@ -0,0 +1,183 @@
+# context_policy.py
+
+import re
+from typing import Dict, List, Optional
+
+from autogen_core.model_context import ChatCompletionContext, UnboundedChatCompletionContext
+from autogen_core.models import LLMMessage, UserMessage
+
+from model_clients import estimate_tokens
+from pipeline import AGENT_DEPENDENCIES
+
+CONTEXT_POLICIES = ("full", "fields", "summary", "last_n")
+
+# Lines in the agents' response formats that carry the structured results,
+# e.g. "- Primary Domain: Forestry", "- RQ1: ..." or "1. [Topic] - Innovation: 8/10".
+# 에이전트 응답 형식에서 구조화된 결과를 담은 줄입니다.
+STRUCTURED_LINE = re.compile(r"^\s*(?:[-*•]\s*(?:\*\*)?[A-Za-z][\w /&()-]{0,40}?(?:\*\*)?\s*:|\d+[.)]\s)\s*\S")
+
+
+def extract_structured_lines(content: str) -> str:
+    """
+    Keeps only the structured field lines of an agent response.
+
+    Args:
+        content (str): The full response text.
+
+    Returns:
+        str: The field lines joined by newlines, or a shortened response if it has no field lines.
+    """
+    lines = [line.strip() for line in content.splitlines() if STRUCTURED_LINE.match(line)]
+    if lines:
+        return "\n".join(lines)
+    return content if len(content) <= 300 else content[:300] + " …"
+
+
+class ContextSavings:
+    """
+    Counts the prompt tokens the context policy removed, across all agents of a run.
+    실행 중 모든 에이전트에서 컨텍스트 정책이 줄인 프롬프트 토큰 수를 집계합니다.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clears the counters at the start of a run."""
+        self.full_tokens = 0
+        self.sent_tokens = 0
+
+    def record(self, full: List[LLMMessage], sent: List[LLMMessage]):
+        """Adds one model request: its history before and after compaction."""
+        self.full_tokens += estimate_tokens(full)
+        self.sent_tokens += estimate_tokens(sent)
+
+    def summary(self) -> Dict:
+        """
+        Returns the estimated prompt tokens with and without compaction.
+
+        Returns:
+            Dict: full_tokens, sent_tokens, saved_tokens and saved_ratio.
+        """
+        saved = self.full_tokens - self.sent_tokens
+        return {
+            "full_tokens": self.full_tokens,
+            "sent_tokens": self.sent_tokens,
+            "saved_tokens": saved,
+            "saved_ratio": saved / self.full_tokens if self.full_tokens else 0.0,
+        }
+
+
+class CompactingChatCompletionContext(UnboundedChatCompletionContext):
+    """
+    Keeps the full history but sends a compacted view of it to the model. The first message
+    (the task with the user's idea) is always sent unchanged.
+    전체 기록을 유지하면서 모델에는 압축된 보기를 보내는 컨텍스트입니다. 첫 번째 메시지(사용자 아이디어가 담긴 작업)는 항상 그대로 전달됩니다.
+    """
+
+    def __init__(self, agent_name: str, savings: ContextSavings, window: int = 3):
+        """
+        Args:
+            agent_name (str): The agent that owns this context.
+            savings (ContextSavings): The run-wide savings counter.
+            window (int): How many of the most recent messages are kept verbatim.
+        """
+        super().__init__()
+        self.agent_name = agent_name
+        self.savings = savings
+        self.window = window
+
+    def compact(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        """Returns the messages to send. Subclasses override this; the default sends everything."""
+        return messages
+
+    async def get_messages(self) -> List[LLMMessage]:
+        messages = await super().get_messages()
+        compacted = messages[:1] + self.compact(messages[1:]) if messages else []
+        self.savings.record(messages, compacted)
+        return compacted
+
+
+class LastNContext(CompactingChatCompletionContext):
+    """Sends the task plus only the last `window` messages."""
+
+    def compact(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        return messages[-self.window:] if self.window > 0 else []
+
+
+class StructuredFieldsContext(CompactingChatCompletionContext):
+    """
+    Sends the task plus only the structured field lines of the agents this agent depends on
+    (pipeline.AGENT_DEPENDENCIES) and its own earlier replies. When the agent speaks again, e.g. the
+    feasibility evaluator after a gating revision, the messages since its last reply are kept as well,
+    so it sees the revision. Other agents' messages are dropped.
+    """
+
+    def __init__(self, agent_name: str, savings: ContextSavings, window: int = 3,
+                 dependencies: Optional[Dict[str, List[str]]] = None):
+        super().__init__(agent_name, savings, window)
+        dependencies = dependencies if dependencies is not None else AGENT_DEPENDENCIES
+        self.sources = set(dependencies.get(agent_name, []))
+
+    def compact(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        own = [index for index, message in enumerate(messages) if getattr(message, "source", None) == self.agent_name]
+        since_last_reply = own[-1] + 1 if own else len(messages)
+        compacted = []
+        for index, message in enumerate(messages):
+            source = getattr(message, "source", None)
+            if source == self.agent_name:
+                compacted.append(message)
+            elif (source in self.sources or index >= since_last_reply) and isinstance(message.content, str):
+                compacted.append(UserMessage(content=extract_structured_lines(message.content), source=message.source))
+        return compacted
+
+
+class RollingSummaryContext(CompactingChatCompletionContext):
+    """
+    Sends the task, one digest of the structured fields of all older messages, and the last `window`
+    messages verbatim. The digest is extractive, so it costs no extra model call.
+    """
+
+    def compact(self, messages: List[LLMMessage]) -> List[LLMMessage]:
+        split = max(0, len(messages) - self.window)
+        older, recent = messages[:split], messages[split:]
+        if not older:
+            return recent
+        digest = "\n\n".join(
+            f"[{getattr(message, 'source', 'unknown')}]\n{extract_structured_lines(message.content)}"
+            for message in older if isinstance(message.content, str)
+        )
+        summary = UserMessage(content=f"Summary of earlier analysis:\n\n{digest}", source="summary")
+        if estimate_tokens([summary]) >= estimate_tokens(older):
+            return messages # Short unstructured replies are cheaper to send as they are
+        return [summary] + recent
+
+
+def create_model_context(policy: str, agent_name: str, savings: ContextSavings, window: int = 3,
+                         dependencies: Optional[Dict[str, List[str]]] = None) -> ChatCompletionContext:
+    """
+    Creates the model context for one agent.
+
+    Args:
+        policy (str): "full" (the whole transcript), "fields" (structured fields of declared dependencies),
+            "summary" (digest of older messages plus the last `window`), or "last_n" (only the last `window`).
+        agent_name (str): The agent that owns the context.
+        savings (ContextSavings): The run-wide savings counter.
+        window (int): The number of recent messages kept verbatim by "summary" and "last_n".
+        dependencies (Dict[str, List[str]], optional): The pipeline's dependency graph, used by "fields".
+            Defaults to AGENT_DEPENDENCIES.
+
+    Returns:
+        ChatCompletionContext: The context to pass as the agent's model_context.
+    """
+    contexts = {
+        "full": CompactingChatCompletionContext,
+        "fields": StructuredFieldsContext,
+        "summary": RollingSummaryContext,
+        "last_n": LastNContext,
+    }
+    if policy not in contexts:
+        raise ValueError(f"Unknown context policy: {policy}. Choose from {', '.join(CONTEXT_POLICIES)}.")
+    if policy == "fields":
+        return StructuredFieldsContext(agent_name, savings, window, dependencies)
+    return contexts[policy](agent_name, savings, window)
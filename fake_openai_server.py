@@ -0,0 +1,180 @@
+# fake_openai_server.py
+
+import asyncio
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+
+def default_reply(request: Dict) -> str:
+    """Echoes which agent (system message) asked and how many messages it sent."""
+    messages = request.get("messages", [])
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    return f"Fake reply to a {len(messages)}-message request. Role: {system[:60]}"
+
+
+class FakeOpenAIServer:
+    """
+    A minimal local OpenAI-compatible chat completions server for exercising the clients without network access.
+    It can inject 429 responses and latency to simulate a rate-limited provider, and report cached prompt
+    tokens to simulate a provider with automatic prompt caching.
+    네트워크 없이 클라이언트를 검증하기 위한 최소한의 로컬 OpenAI 호환 서버로, 429 응답과 지연을 주입할 수 있습니다.
+    """
+
+    def __init__(self, reply: Callable[[Dict], str] = default_reply, latency: float = 0.0,
+                 fail_first: int = 0, fail_every: int = 0, retry_after: Optional[float] = None,
+                 prompt_cache: bool = False, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            reply (Callable[[Dict], str]): Builds the reply text from the decoded request body.
+            latency (float): Seconds to wait before answering each request.
+            fail_first (int): Answer the first N requests with HTTP 429.
+            fail_every (int): After that, answer every Nth request with HTTP 429 (0 disables it).
+            retry_after (float, optional): The Retry-After header value sent with 429 responses.
+            prompt_cache (bool): Report the longest prefix a request's messages share with an earlier request
+                as usage.prompt_tokens_details.cached_tokens.
+            host (str): The interface to bind.
+            port (int): The port to bind; 0 picks a free one.
+        """
+        self.reply = reply
+        self.latency = latency
+        self.fail_first = fail_first
+        self.fail_every = fail_every
+        self.retry_after = retry_after
+        self.prompt_cache = prompt_cache
+        self._prompts: List[str] = []
+        self.host = host
+        self.port = port
+        self.requests: List[Dict] = []
+        self.rejected = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+
+    @property
+    def base_url(self) -> str:
+        """The base URL to give an OpenAI-compatible client."""
+        return f"http://{self.host}:{self.port}/v1/"
+
+    async def start(self):
+        """Starts listening; the chosen port is available through base_url afterwards."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stops the server and closes open connections."""
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeOpenAIServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def _should_fail(self) -> bool:
+        count = len(self.requests) + self.rejected
+        if count < self.fail_first:
+            return True
+        return bool(self.fail_every) and (count - self.fail_first + 1) % self.fail_every == 0
+
+    def build_completion(self, request: Dict, content: str) -> Dict:
+        """Builds a chat.completion response body, with usage estimated from character counts."""
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in request.get("messages", [])) // 4 + 1
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content) // 4 + 1,
+            "total_tokens": prompt_tokens + len(content) // 4 + 1,
+        }
+        if self.prompt_cache:
+            prompt = json.dumps(request.get("messages", []), ensure_ascii=False)
+            shared = max((len(os.path.commonprefix([prompt, earlier])) for earlier in self._prompts), default=0)
+            self._prompts.append(prompt)
+            usage["prompt_tokens_details"] = {"cached_tokens": min(shared // 4, prompt_tokens)}
+        return {
+            "id": f"chatcmpl-fake-{len(self.requests)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                await self._respond(request_line.decode("latin-1").split(" ")[1], body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _respond(self, path: str, body: bytes, writer: asyncio.StreamWriter):
+        if not path.rstrip("/").endswith("/chat/completions"):
+            self._write(writer, 404, {"error": {"message": f"Unknown path {path}"}})
+            return
+        request = json.loads(body or b"{}")
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._should_fail():
+            self.rejected += 1
+            extra = {"retry-after": str(self.retry_after)} if self.retry_after is not None else {}
+            self._write(writer, 429, {"error": {"message": "Resource exhausted", "code": 429}}, extra)
+            return
+
+        self.requests.append(request)
+        completion = self.build_completion(request, self.reply(request))
+        if not request.get("stream"):
+            self._write(writer, 200, completion)
+            return
+
+        # Server-sent events: one chunk per word, then a usage chunk, then [DONE].
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n")
+        content = completion["choices"][0]["message"]["content"]
+        words = content.split(" ")
+        base = {"id": completion["id"], "object": "chat.completion.chunk",
+                "created": completion["created"], "model": completion["model"]}
+        for i, word in enumerate(words):
+            delta = word if i == 0 else " " + word
+            self._write_event(writer, {**base, "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]})
+            await writer.drain()
+        self._write_event(writer, {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        self._write_event(writer, {**base, "choices": [], "usage": completion["usage"]})
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def _write(self, writer: asyncio.StreamWriter, status: int, payload: Dict, headers: Optional[Dict] = None):
+        body = json.dumps(payload).encode("utf-8")
+        reason = {200: "OK", 404: "Not Found", 429: "Too Many Requests"}.get(status, "Error")
+        head = f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        for name, value in (headers or {}).items():
+            head += f"{name}: {value}\r\n"
+        writer.write(head.encode("latin-1") + b"\r\n" + body)
+
+    def _write_event(self, writer: asyncio.StreamWriter, payload: Dict):
+        self._write_chunk(writer, f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+    def _write_chunk(self, writer: asyncio.StreamWriter, data: bytes):
+        writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
@@ -0,0 +1,166 @@
+# gating.py
+
+from typing import Dict, List, Optional, Sequence
+
+from autogen_agentchat.base import TerminationCondition
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, StopMessage
+
+from output_parser import ResearchRecord, parse_agent_output
+
+
+class GatingPolicy:
+    """
+    Decides, from the parsed outputs of earlier agents, whether the run continues, ends early, loops back to
+    the improvement strategist for a revision, or skips an agent. It also picks the next speaker so that a
+    run ends after the last agent instead of after a fixed number of messages.
+    이전 에이전트의 파싱된 출력을 바탕으로 실행을 계속할지, 조기 종료할지, 개선 전략가로 되돌아갈지, 에이전트를 건너뛸지 결정합니다.
+    """
+
+    def __init__(self, min_domain_confidence: float = 0.5, min_feasibility_score: float = 5.0,
+                 max_revisions: int = 1, require_approval: bool = True, enabled: bool = True,
+                 agent_order: Optional[List[str]] = None):
+        """
+        Args:
+            min_domain_confidence (float): End the run when the domain classifier's confidence (0-1) is lower.
+            min_feasibility_score (float): End the run when the mean feasibility score (out of 10) is lower.
+            max_revisions (int): How often a "Revise" verdict loops back to the improvement strategist
+                (followed by a new feasibility assessment) before the run ends.
+            require_approval (bool): Skip the final resource engineer unless the professor says APPROVE.
+            enabled (bool): When False no rule applies and every agent speaks once.
+            agent_order (List[str], optional): The agents in their speaking order. The system sets it to its
+                agents when it is not given.
+        """
+        self.agent_order = agent_order
+        self.min_domain_confidence = min_domain_confidence
+        self.min_feasibility_score = min_feasibility_score
+        self.max_revisions = max_revisions
+        self.require_approval = require_approval
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self, can_loop: bool = True):
+        """
+        Clears the state at the start of a run.
+
+        Args:
+            can_loop (bool): Whether the execution mode can run an agent again. When False (the "dag" mode)
+                a "Revise" verdict with acceptable scores lets the run continue.
+        """
+        self.can_loop = can_loop
+        self.record = ResearchRecord()
+        self.decisions: List[Dict] = []
+        self.skipped: set = set()
+        self.last_agent: Optional[str] = None
+        self.revisions = 0
+        self.revising = False
+        self.stopped = False
+
+    @property
+    def max_messages(self) -> int:
+        """The most agent messages a run can produce (a safety limit for the group chat)."""
+        return len(self.agent_order or []) + 2 * self.max_revisions
+
+    def _decide(self, agent: str, action: str, reason: str, target: Optional[str] = None) -> Dict:
+        decision = {"agent": agent, "action": action, "reason": reason, "target": target}
+        self.decisions.append(decision)
+        if action == "stop":
+            self.stopped = True
+        elif action == "skip":
+            self.skipped.add(target)
+        return decision
+
+    def observe(self, agent: str, content: str) -> Optional[Dict]:
+        """
+        Parses one agent message and applies the rules for that agent.
+
+        Args:
+            agent (str): The agent that wrote the message.
+            content (str): The message content.
+
+        Returns:
+            Dict: The decision ('agent', 'action' = "stop", "loop" or "skip", 'reason', 'target'),
+            or None when the run simply continues.
+        """
+        if agent not in self.agent_order:
+            return None
+        self.last_agent = agent
+        parse_agent_output(agent, content, self.record)
+        if not self.enabled:
+            return None
+        record = self.record
+
+        if agent == "domain_classifier":
+            if record.domain_confidence is not None and record.domain_confidence < self.min_domain_confidence:
+                return self._decide(agent, "stop", f"domain confidence {record.domain_confidence:.0%} is below "
+                                                   f"{self.min_domain_confidence:.0%}")
+
+        elif agent == "feasibility_evaluator":
+            scores = [s for s in (record.technical_score, record.viability_score) if s is not None]
+            mean = sum(scores) / len(scores) if scores else None
+            if mean is not None and mean < self.min_feasibility_score:
+                return self._decide(agent, "stop", f"mean feasibility score {mean:.1f}/10 is below "
+                                                   f"{self.min_feasibility_score:g}")
+            self.revising = False
+            # A pipeline without an improvement strategist has nothing to loop back to
+            if record.feasibility_verdict == "Revise" and self.can_loop and "improvement_strategist" in self.agent_order:
+                if self.revisions >= self.max_revisions:
+                    return self._decide(agent, "stop", f"still 'Revise' after {self.revisions} revision(s)")
+                self.revisions += 1
+                self.revising = True
+                return self._decide(agent, "loop", "verdict 'Revise'", target="improvement_strategist")
+
+        elif agent == "advisor_professor":
+            if self.require_approval and record.verdict != "APPROVE":
+                return self._decide(agent, "skip", f"professor verdict is {record.verdict or 'missing'}",
+                                    target="final_resource_engineer")
+        return None
+
+    def next_speaker(self) -> Optional[str]:
+        """
+        Returns the agent that speaks next in the sequential (round-robin) mode, or None when the run is over.
+        During a revision the improvement strategist is followed by the feasibility evaluator; once the
+        revised plan passes, the run continues after the improvement strategist.
+        """
+        if self.stopped:
+            return None
+        last = self.last_agent
+        if last == "improvement_strategist" and self.revising:
+            return "feasibility_evaluator"
+        if last == "feasibility_evaluator" and self.revisions and not self.revising:
+            last = "improvement_strategist" # The revision has already been made
+        index = self.agent_order.index(last) + 1 if last is not None else 0
+        for agent in self.agent_order[index:]:
+            if agent not in self.skipped:
+                return agent
+        return None
+
+
+class GatingTermination(TerminationCondition):
+    """
+    A group chat termination condition that feeds every message to a GatingPolicy and stops the team
+    when the policy ends the run or has no next speaker.
+    모든 메시지를 GatingPolicy에 전달하고, 정책이 실행을 끝내거나 다음 발언자가 없으면 팀을 중지하는 종료 조건입니다.
+    """
+
+    def __init__(self, policy: GatingPolicy):
+        self.policy = policy
+        self._terminated = False
+
+    @property
+    def terminated(self) -> bool:
+        return self._terminated
+
+    async def __call__(self, messages: Sequence[BaseAgentEvent | BaseChatMessage]) -> StopMessage | None:
+        if self._terminated:
+            return None
+        for message in messages:
+            if isinstance(message, BaseChatMessage) and isinstance(getattr(message, "content", None), str):
+                self.policy.observe(message.source, message.content)
+        if self.policy.next_speaker() is None:
+            self._terminated = True
+            reason = self.policy.decisions[-1]["reason"] if self.policy.stopped else "no agent left to speak"
+            return StopMessage(content=f"Gating: {reason}", source="GatingTermination")
+        return None
+
+    async def reset(self) -> None:
+        self._terminated = False
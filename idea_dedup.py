@@ -0,0 +1,185 @@
+# idea_dedup.py
+
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from pipeline import AGENT_DEPENDENCIES
+
+# The analysis stages that only look at the idea itself, reused by default when an idea is a near-duplicate.
+# 아이디어 자체만 분석하는 단계로, 유사 아이디어일 때 기본적으로 재사용됩니다.
+DEFAULT_REUSED_AGENTS = ["domain_classifier", "senior_researcher", "prompt_engineer", "ai_specialist",
+                         "research_trend_analyst"]
+
+
+class HashedNgramVectorizer:
+    """
+    Embeds short texts without a model: character n-grams and word uni/bigrams are hashed into a fixed
+    number of buckets and the vector is L2-normalized, so a dot product is the cosine similarity.
+    모델 없이 짧은 텍스트를 벡터화합니다. 문자 n-gram과 단어 유니/바이그램을 고정된 버킷 수로 해싱하고 L2 정규화합니다.
+    """
+
+    def __init__(self, dim: int = 1024, char_ngrams: tuple = (3, 4, 5)):
+        """
+        Args:
+            dim (int): The number of hash buckets (vector size).
+            char_ngrams (tuple): The character n-gram lengths to use.
+        """
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+
+    def _features(self, text: str) -> List[str]:
+        words = re.findall(r"\w+", text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        padded = f" {' '.join(words)} "
+        for n in self.char_ngrams:
+            features.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        return features
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """
+        Vectorizes the texts.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            np.ndarray: A (len(texts), dim) float32 matrix of unit-length rows (zero rows for empty texts).
+        """
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                # crc32 is stable across processes, unlike hash(), so stored vectors stay comparable.
+                matrix[row, zlib.crc32(feature.encode('utf-8')) % self.dim] += 1.0
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+
+class IdeaIndex:
+    """
+    A persistent index of past research ideas for finding paraphrases of an incoming idea before running
+    the agents. Vectors are appended to a raw float32 file and ideas to a JSONL file next to it.
+    에이전트를 실행하기 전에 새 아이디어의 유사 표현을 찾기 위한 과거 연구 아이디어의 영구 인덱스입니다.
+    """
+
+    def __init__(self, directory: str = os.path.join("research_results", "ideas"), threshold: float = 0.7,
+                 vectorizer: Optional[HashedNgramVectorizer] = None):
+        """
+        Loads the stored ideas and vectors.
+
+        Args:
+            directory (str): The directory holding ideas.jsonl and vectors.f32.
+            threshold (float): The cosine similarity from which an idea counts as a near-duplicate.
+            vectorizer (HashedNgramVectorizer, optional): Must match the one the index was built with.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.threshold = threshold
+        self.vectorizer = vectorizer or HashedNgramVectorizer()
+        self.ideas_file = os.path.join(directory, "ideas.jsonl")
+        self.vectors_file = os.path.join(directory, "vectors.f32")
+        self.entries: List[Dict] = []
+        if os.path.exists(self.ideas_file):
+            with open(self.ideas_file, encoding='utf-8') as f:
+                self.entries = [json.loads(line) for line in f if line.strip()]
+        vectors = np.fromfile(self.vectors_file, dtype=np.float32) if os.path.exists(self.vectors_file) else np.zeros(0, np.float32)
+        vectors = vectors.reshape(-1, self.vectorizer.dim)
+        # A crash between the two appends can leave one more vector than ideas (or vice versa).
+        count = min(len(self.entries), len(vectors))
+        self.entries, self.vectors = self.entries[:count], vectors[:count]
+        self._lock = threading.Lock()
+
+    def add(self, run_id: str, user_idea: str, saved_files: Dict):
+        """
+        Adds a finished run's idea to the index. Safe to call from a worker thread while other runs search
+        the index on the event loop.
+
+        Args:
+            run_id (str): The run identifier.
+            user_idea (str): The research idea.
+            saved_files (Dict): The run's report paths, returned with matches.
+        """
+        vector = self.vectorizer.transform([user_idea])
+        entry = {"run_id": run_id, "idea": user_idea, "saved_files": saved_files}
+        with self._lock:
+            with open(self.vectors_file, 'ab') as f:
+                vector.tofile(f)
+            with open(self.ideas_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            # Replace rather than mutate, entries first, so a concurrent search sees a consistent snapshot.
+            self.entries = self.entries + [entry]
+            self.vectors = np.vstack([self.vectors, vector])
+
+    def search(self, user_idea: str, top_k: int = 3) -> List[Dict]:
+        """
+        Finds the most similar past ideas.
+
+        Args:
+            user_idea (str): The incoming idea.
+            top_k (int): The number of matches returned.
+
+        Returns:
+            List[Dict]: The entries (run_id, idea, saved_files) with their 'similarity', most similar first.
+        """
+        entries = self.entries
+        if not entries:
+            return []
+        scores = self.vectors[:len(entries)] @ self.vectorizer.transform([user_idea])[0]
+        top = np.argsort(-scores)[:top_k]
+        return [{**entries[i], "similarity": float(scores[i])} for i in top]
+
+    def find_duplicate(self, user_idea: str) -> Optional[Dict]:
+        """Returns the most similar past idea whose report still exists, if it passes the threshold."""
+        for match in self.search(user_idea):
+            if match["similarity"] < self.threshold:
+                return None
+            if os.path.exists(match["saved_files"].get("json_file", "")):
+                return match
+        return None
+
+
+def load_reusable_messages(json_file: str, agents: List[str], execution_mode: str,
+                           dependencies: Optional[Dict[str, List[str]]] = None) -> List[Dict]:
+    """
+    Selects the stages of an earlier report that can seed a new run.
+
+    In "dag" mode any agent whose dependencies are reused as well can be taken over. In "round_robin"
+    mode the conversation is replayed, so only the opening messages up to the first agent that is not
+    reused are taken, behind the user message that opens the conversation. A report of a DAG run has no
+    user message, so one naming the earlier idea is put first; the new run replaces it with its own task.
+
+    Args:
+        json_file (str): The earlier run's JSON report.
+        agents (List[str]): The agents whose output should be reused.
+        execution_mode (str): The execution mode of the new run.
+        dependencies (Dict[str, List[str]], optional): The dependency graph of the new run's pipeline.
+            Defaults to AGENT_DEPENDENCIES.
+
+    Returns:
+        List[Dict]: The messages, renumbered from step 1.
+    """
+    with open(json_file, encoding='utf-8') as f:
+        report = json.load(f)
+    messages = report.get("agents_responses", [])
+
+    dependencies = dependencies if dependencies is not None else AGENT_DEPENDENCIES
+    selected: List[Dict] = []
+    if execution_mode == "dag":
+        reused = set()
+        for message in messages:
+            agent = message["agent"]
+            if agent in agents and agent not in reused and all(d in reused for d in dependencies.get(agent, [])):
+                reused.add(agent)
+                selected.append(message)
+    else:
+        for message in messages:
+            if message["agent"] != "user" and message["agent"] not in agents:
+                break
+            selected.append(message)
+        if selected and selected[0]["agent"] != "user":
+            selected.insert(0, {"agent": "user", "content": report.get("user_idea", "")})
+    return [{**message, "step": step} for step, message in enumerate(selected, 1)]
@@ -0,0 +1,207 @@
+# instrumentation.py
+
+import json
+import os
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence, Union
+
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+
+from model_clients import ModelClientWrapper, current_call_stats, usage_cached_tokens
+from result_saver import atomic_write
+
+# List prices in USD per one million (prompt, completion) tokens. Adjust to your billing tier.
+# 100만 토큰당 (프롬프트, 완성) USD 정가입니다. 사용 중인 요금제에 맞게 조정하세요.
+MODEL_PRICING = {
+    "gemini-2.0-flash": (0.10, 0.40),
+}
+# Prompt tokens served from the provider's prompt cache are billed at this fraction of the prompt price.
+# 제공자의 프롬프트 캐시에서 제공된 프롬프트 토큰은 프롬프트 가격의 이 비율로 청구됩니다.
+CACHED_PROMPT_PRICE_RATIO = 0.25
+
+
+class RunInstrumentation:
+    """
+    Records wall-clock time, time to first token, token usage, cost and retries for every agent turn
+    of a run, and exports them as a summary or a Chrome trace (viewable in Perfetto or chrome://tracing).
+    실행의 각 에이전트 턴에 대한 소요 시간, 첫 토큰까지의 시간, 토큰 사용량, 비용, 재시도 횟수를 기록하고 요약 또는 Chrome 트레이스로 내보냅니다.
+    """
+
+    def __init__(self, model: str, pipeline: Optional[str] = None):
+        """
+        Args:
+            model (str): The model name, used to look up pricing.
+            pipeline (str, optional): The name of the pipeline the agents belong to, reported in the summary
+                so runs of different pipeline variants can be compared.
+        """
+        self.model = model
+        self.pipeline = pipeline
+        self.turns: List[Dict] = []
+        self.run_start = time.perf_counter()
+
+    def start_run(self):
+        """Clears the recorded turns and restarts the run clock."""
+        self.turns = []
+        self.run_start = time.perf_counter()
+
+    def now(self) -> float:
+        """Seconds since the start of the run."""
+        return time.perf_counter() - self.run_start
+
+    def cost(self, prompt_tokens: int, completion_tokens: int, model: Optional[str] = None,
+             cached_tokens: int = 0) -> float:
+        """Returns the USD cost of the given token counts (0 if the model has no pricing entry); the
+        cached_tokens part of the prompt is billed at CACHED_PROMPT_PRICE_RATIO of the prompt price."""
+        prompt_price, completion_price = MODEL_PRICING.get(model or self.model, (0.0, 0.0))
+        prompt_cost = (prompt_tokens - cached_tokens + cached_tokens * CACHED_PROMPT_PRICE_RATIO) * prompt_price
+        return (prompt_cost + completion_tokens * completion_price) / 1_000_000
+
+    def record_turn(self, agent: str, started: float, first_token: Optional[float], finished: float,
+                    result: Optional[CreateResult], stats: Dict[str, Any], error: Optional[str] = None):
+        """
+        Records one model call made on behalf of an agent.
+
+        Args:
+            agent (str): The agent that made the call.
+            started (float): The start offset in seconds from the run start.
+            first_token (float, optional): The offset at which the first token arrived.
+            finished (float): The end offset in seconds from the run start.
+            result (CreateResult, optional): The model result, if the call succeeded.
+            stats (Dict[str, Any]): Per-call counters filled in by the wrapped clients (e.g. retries, and
+                the prompt tokens the provider served from its prompt cache as cached_tokens).
+            error (str, optional): The error message, if the call failed.
+        """
+        cached = bool(result is not None and result.cached)
+        usage = result.usage if result is not None else None
+        prompt_tokens = usage.prompt_tokens if usage is not None else 0
+        completion_tokens = usage.completion_tokens if usage is not None else 0
+        # The provider's cached prompt tokens, from the usage where it carries them, otherwise from the SDK hook
+        reported = usage_cached_tokens(usage)
+        cached_tokens = 0 if cached else min(reported if reported is not None else stats.get("cached_tokens", 0),
+                                             prompt_tokens)
+        # A routed call reports the model that actually answered it.
+        model = stats.get("model", self.model)
+        self.turns.append({
+            "agent": agent,
+            "model": model,
+            "started": started,
+            "finished": finished,
+            "duration": finished - started,
+            "ttft": (first_token if first_token is not None else finished) - started,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": cached_tokens,
+            "cost": 0.0 if cached else self.cost(prompt_tokens, completion_tokens, model, cached_tokens),
+            "retries": stats.get("retries", 0),
+            "cached": cached,
+            "error": error,
+        })
+
+    def summary(self) -> Dict:
+        """
+        Aggregates the recorded turns.
+
+        Returns:
+            Dict: The pipeline name, call count, total prompt/completion tokens, the prompt tokens served
+            from the provider's prompt cache (in total and per agent), cost, retries and the sum of turn durations.
+        """
+        cached_by_agent: Dict[str, int] = {}
+        for turn in self.turns:
+            cached_by_agent[turn["agent"]] = cached_by_agent.get(turn["agent"], 0) + turn["cached_tokens"]
+        return {
+            "pipeline": self.pipeline,
+            "calls": len(self.turns),
+            "prompt_tokens": sum(t["prompt_tokens"] for t in self.turns),
+            "completion_tokens": sum(t["completion_tokens"] for t in self.turns),
+            "cached_prompt_tokens": sum(cached_by_agent.values()),
+            "cached_prompt_tokens_by_agent": cached_by_agent,
+            "cost": sum(t["cost"] for t in self.turns),
+            "retries": sum(t["retries"] for t in self.turns),
+            "cached_calls": sum(t["cached"] for t in self.turns),
+            "model_seconds": sum(t["duration"] for t in self.turns),
+        }
+
+    def export_chrome_trace(self, path: str, run_id: str) -> str:
+        """
+        Writes the turns in the Chrome trace event format, one track per agent.
+
+        Args:
+            path (str): The output file path.
+            run_id (str): The run identifier, used as the process name.
+
+        Returns:
+            str: The absolute path of the written file.
+        """
+        lanes: Dict[str, int] = {}
+        events: List[Dict] = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": f"run {run_id}"}}]
+        for turn in self.turns:
+            if turn["agent"] not in lanes:
+                lanes[turn["agent"]] = len(lanes) + 1
+                events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": lanes[turn["agent"]],
+                               "args": {"name": turn["agent"]}})
+            tid = lanes[turn["agent"]]
+            args = {key: turn[key] for key in ("model", "prompt_tokens", "completion_tokens", "cached_tokens", "cost", "retries", "cached", "error")}
+            events.append({"name": turn["agent"], "cat": "agent_turn", "ph": "X", "pid": 1, "tid": tid,
+                           "ts": turn["started"] * 1e6, "dur": turn["duration"] * 1e6, "args": args})
+            events.append({"name": "first token", "cat": "ttft", "ph": "i", "s": "t", "pid": 1, "tid": tid,
+                           "ts": (turn["started"] + turn["ttft"]) * 1e6})
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        atomic_write(path, json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        return os.path.abspath(path)
+
+
+class InstrumentedChatCompletionClient(ModelClientWrapper):
+    """
+    A per-agent model client that records every call it makes into a RunInstrumentation.
+    에이전트별 모델 클라이언트로, 모든 호출을 RunInstrumentation에 기록합니다.
+    """
+
+    def __init__(self, inner: ChatCompletionClient, agent_name: str, instrumentation: RunInstrumentation):
+        """
+        Args:
+            inner (ChatCompletionClient): The (shared) model client to call.
+            agent_name (str): The agent this client belongs to.
+            instrumentation (RunInstrumentation): The recorder of the current run.
+        """
+        super().__init__(inner)
+        self.agent_name = agent_name
+        self.instrumentation = instrumentation
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        stats: Dict[str, Any] = {"agent": self.agent_name}
+        token = current_call_stats.set(stats)
+        started = self.instrumentation.now()
+        try:
+            result = await self.inner.create(messages, **kwargs)
+        except Exception as e:
+            self.instrumentation.record_turn(self.agent_name, started, None, self.instrumentation.now(),
+                                             None, stats, error=str(e))
+            raise
+        finally:
+            current_call_stats.reset(token)
+        self.instrumentation.record_turn(self.agent_name, started, None, self.instrumentation.now(), result, stats)
+        return result
+
+    async def create_stream(self, messages: Sequence[LLMMessage], **kwargs: Any) -> AsyncGenerator[Union[str, CreateResult], None]:
+        stats: Dict[str, Any] = {"agent": self.agent_name}
+        previous = current_call_stats.get()
+        current_call_stats.set(stats)
+        started = self.instrumentation.now()
+        first_token = None
+        result = None
+        try:
+            async for chunk in self.inner.create_stream(messages, **kwargs):
+                if first_token is None and isinstance(chunk, str) and chunk:
+                    first_token = self.instrumentation.now()
+                if isinstance(chunk, CreateResult):
+                    result = chunk
+                yield chunk
+        except Exception as e:
+            self.instrumentation.record_turn(self.agent_name, started, first_token, self.instrumentation.now(),
+                                             None, stats, error=str(e))
+            raise
+        finally:
+            # An async generator cannot reliably reset a token across yields, so the previous value is restored.
+            current_call_stats.set(previous)
+        self.instrumentation.record_turn(self.agent_name, started, first_token, self.instrumentation.now(), result, stats)
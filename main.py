@@ -1,21 +1,62 @@
 # main.py
 
-import asyncio
+import argparse
+import importlib
+import json
 import os
-from ai_system import AdvancedAIPlusXSystem
+import threading
+from typing import TYPE_CHECKING
+
+# The agent framework, the OpenAI SDK, rich and NumPy take over a second to import, so they are only
+# imported by the code paths that run the agents; `--help` and `--list` start with the standard library.
+# 에이전트 프레임워크, OpenAI SDK, rich, NumPy는 가져오는 데 1초 이상 걸리므로 에이전트를 실행하는 경로에서만 가져옵니다.
+if TYPE_CHECKING:
+    from gating import GatingPolicy
+    from idea_dedup import IdeaIndex
+    from pipeline_spec import ExecutionPlan
+    from rate_limiter import RateLimiter
+    from response_cache import ResponseCache
 
 # In a real application, it's better to use environment variables.
 # 실제 애플리케이션에서는 환경 변수를 사용하는 것이 좋습니다.
 GOOGLE_API_KEY = "YOUR_API_KEY_HERE" #  중요: 여기에 당신의 Gemini API 키를 입력하세요.
 
-async def main():
+async def main(execution_mode: str = "round_robin", cache: "ResponseCache" = None,
+               rate_limiter: "RateLimiter" = None, resume_run_id: str = None, stream_tokens: bool = False,
+               export_trace: bool = False, context_policy: str = "full", context_window: int = 3,
+               idea_index: "IdeaIndex" = None, gating: "GatingPolicy" = None, models_config: str = None,
+               replay_dir: str = None, replay_latency: float = 0.0, output: str = "auto",
+               topic_candidates: int = 0, topic_top_k: int = 5, fanout_concurrency: int = 4,
+               prompt_layout: str = "shared_prefix", open_browser: bool = False, plan: "ExecutionPlan" = None):
     """
     Main asynchronous function to run the application.
     It provides a simple command-line interface for the user.
     애플리케이션을 실행하는 메인 비동기 함수입니다.
     사용자를 위한 간단한 명령줄 인터페이스를 제공합니다.
+
+    Args:
+        execution_mode (str): How the agents are scheduled ("round_robin" or "dag").
+        cache (ResponseCache, optional): The response cache for agent model calls.
+        rate_limiter (RateLimiter, optional): The scheduler that throttles and retries model calls.
+        resume_run_id (str, optional): Continue this checkpointed run instead of asking for a new idea.
+        stream_tokens (bool): Render each agent's output live as the model streams it.
+        export_trace (bool): Write a Chrome/Perfetto trace of the agent turns.
+        context_policy (str): How much of the transcript each agent sends to the model.
+        context_window (int): How many recent messages the "summary" and "last_n" policies keep verbatim.
+        idea_index (IdeaIndex, optional): Past ideas checked for near-duplicates before a new run starts.
+        gating (GatingPolicy, optional): The early-exit rules applied to the agents' parsed outputs.
+        models_config (str, optional): A JSON file routing each agent to its own chain of models.
+        replay_dir (str, optional): Answer from the reports saved in this directory instead of calling a model.
+        replay_latency (float): Seconds each replayed reply is delayed by.
+        output (str): The console output: "rich", "jsonl", "null" or "auto" (rich on a terminal, jsonl otherwise).
+        topic_candidates (int): Generate and score this many topic candidates in parallel (0: one topic call).
+        topic_top_k (int): How many of the best-scored topic candidates the later agents review.
+        fanout_concurrency (int): The most topic candidate or scoring calls in flight at the same time.
+        prompt_layout (str): "shared_prefix" (a cache-friendly prefix shared by all agents) or "classic".
+        open_browser (bool): Open the HTML report in a browser when the run is done (skipped when headless).
+        plan (ExecutionPlan, optional): The pipeline to run (see pipeline_spec.py). Defaults to the built-in one.
     """
-    if GOOGLE_API_KEY == "YOUR_API_KEY_HERE":
+    if GOOGLE_API_KEY == "YOUR_API_KEY_HERE" and replay_dir is None:
         print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
         print("!!! ERROR: Please set your GOOGLE_API_KEY in main.py !!!")
         print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
@@ -25,16 +66,62 @@ async def main():
     print("="*60)
     
     try:
-        # Get user input for the research idea
-        user_idea = input("📝 Please enter your research idea: ").strip()
+        model_client = load_replay_client(replay_dir, replay_latency)
+        router = load_router(models_config, cache, rate_limiter, plan) if model_client is None else None
+        if resume_run_id:
+            from ai_system import AdvancedAIPlusXSystem
+            print(f"♻️ Resuming run {resume_run_id}...")
+            system = AdvancedAIPlusXSystem(
+                api_key=GOOGLE_API_KEY, model_client=model_client, cache=cache, rate_limiter=rate_limiter,
+                stream_tokens=stream_tokens, export_trace=export_trace,
+                context_policy=context_policy, context_window=context_window, idea_index=idea_index,
+                gating=gating, router=router, output=output, topic_candidates=topic_candidates,
+                topic_top_k=topic_top_k, fanout_concurrency=fanout_concurrency, prompt_layout=prompt_layout,
+                open_browser=open_browser, plan=plan
+            )
+            await system.execute_research_process(None, run_id=resume_run_id, resume=True)
+        else:
+            # Import the agents in the background while the user is typing
+            preload = threading.Thread(target=importlib.import_module, args=("ai_system",), daemon=True)
+            preload.start()
+
+            # Get user input for the research idea
+            user_idea = input("📝 Please enter your research idea: ").strip()
+            from ai_system import AdvancedAIPlusXSystem
+            from idea_dedup import DEFAULT_REUSED_AGENTS, load_reusable_messages
+
+            if not user_idea:
+                user_idea = "Develop an AI system to detect wildfires early using drones"
+                print(f"🎯 No input received. Using a default example idea: '{user_idea}'")
 
-        if not user_idea:
-            user_idea = "Develop an AI system to detect wildfires early using drones"
-            print(f"🎯 No input received. Using a default example idea: '{user_idea}'")
+            # Look for an earlier run of the same idea in other words
+            reuse_messages = None
+            duplicate = idea_index.find_duplicate(user_idea) if idea_index is not None else None
+            if duplicate:
+                print(f"♻️ A similar idea was already analysed (similarity {duplicate['similarity']:.2f}): "
+                      f"'{duplicate['idea']}'")
+                choice = input("   Reuse its report [r], reuse its early analysis stages [s], or run from scratch [n]? ").strip().lower()
+                if choice == "r":
+                    for kind, path in duplicate["saved_files"].items():
+                        print(f"   {kind}: {path}")
+                    return
+                if choice == "s":
+                    reuse_messages = load_reusable_messages(
+                        duplicate["saved_files"]["json_file"], DEFAULT_REUSED_AGENTS, execution_mode,
+                        plan.dependencies if plan is not None else None
+                    )
 
-        # Initialize and run the system
-        system = AdvancedAIPlusXSystem(api_key=GOOGLE_API_KEY)
-        await system.execute_research_process(user_idea)
+            # Initialize and run the system
+            system = AdvancedAIPlusXSystem(
+                api_key=GOOGLE_API_KEY, model_client=model_client, cache=cache, rate_limiter=rate_limiter,
+                stream_tokens=stream_tokens, export_trace=export_trace,
+                context_policy=context_policy, context_window=context_window, idea_index=idea_index,
+                gating=gating, router=router, output=output, topic_candidates=topic_candidates,
+                topic_top_k=topic_top_k, fanout_concurrency=fanout_concurrency, prompt_layout=prompt_layout,
+                open_browser=open_browser, plan=plan
+            )
+            await system.execute_research_process(user_idea, execution_mode=execution_mode,
+                                                  reuse_messages=reuse_messages)
 
     except ValueError as ve:
         print(f"Configuration Error: {ve}")
@@ -43,11 +130,284 @@ async def main():
         
     print("\n✅ Jarvis Research System has completed its run!")
 
+def load_router(models_config: str, cache: "ResponseCache" = None, rate_limiter: "RateLimiter" = None,
+                plan: "ExecutionPlan" = None):
+    """
+    Loads the per-agent model routing from a JSON file merged with the pipeline's own models and routes,
+    or returns None when neither a file nor the pipeline configures any.
+    """
+    config = None
+    if models_config:
+        with open(models_config, encoding='utf-8') as f:
+            config = json.load(f)
+    if plan is not None:
+        config = plan.router_config(config)
+    if config is None:
+        return None
+    from model_router import ModelRouter
+    return ModelRouter(config, api_key=GOOGLE_API_KEY, cache=cache, rate_limiter=rate_limiter)
+
+def load_replay_client(replay_dir: str, latency: float = 0.0):
+    """Returns a client replaying the reports in replay_dir, or None when no directory is given."""
+    if replay_dir is None:
+        return None
+    from replay_client import ReplayChatCompletionClient, ReplayLibrary
+    library = ReplayLibrary.from_directory(replay_dir)
+    if not library.runs:
+        print(f"🎞️ No saved reports in {replay_dir}; replaying the built-in synthetic run.")
+        library = ReplayLibrary.synthetic()
+    else:
+        print(f"🎞️ Replaying {len(library.runs)} saved runs from {replay_dir} (no model is called).")
+    return ReplayChatCompletionClient(library, latency=latency)
+
+async def run_batch(path: str, concurrency: int, execution_mode: str, cache: "ResponseCache" = None,
+                    rate_limiter: "RateLimiter" = None, idea_index: "IdeaIndex" = None, models_config: str = None,
+                    replay_dir: str = None, replay_latency: float = 0.0, plan: "ExecutionPlan" = None,
+                    gating: "GatingPolicy" = None, context_policy: str = "full", context_window: int = 3,
+                    prompt_layout: str = "shared_prefix"):
+    """
+    Runs every idea in a JSONL or CSV file concurrently without interactive output.
+
+    Args:
+        path (str): The file containing the research ideas.
+        concurrency (int): The maximum number of ideas processed at the same time.
+        execution_mode (str): How the agents are scheduled ("round_robin" or "dag").
+        cache (ResponseCache, optional): The response cache shared by all runs.
+        rate_limiter (RateLimiter, optional): The scheduler shared by all runs.
+        idea_index (IdeaIndex, optional): Ideas that near-duplicate an earlier run are not run again.
+        models_config (str, optional): A JSON file routing each agent to its own chain of models.
+        replay_dir (str, optional): Answer from the reports saved in this directory instead of calling a model.
+        replay_latency (float): Seconds each replayed reply is delayed by.
+        plan (ExecutionPlan, optional): The pipeline every idea runs through. Defaults to the built-in one.
+        gating (GatingPolicy, optional): The gating rules of every run.
+        context_policy (str): What each agent sees of the earlier messages.
+        context_window (int): The number of recent messages kept by the "last_n" policy.
+        prompt_layout (str): How each agent's request is laid out ("shared_prefix" or "classic").
+    """
+    if GOOGLE_API_KEY == "YOUR_API_KEY_HERE" and replay_dir is None:
+        print("!!! ERROR: Please set your GOOGLE_API_KEY in main.py !!!")
+        return
+
+    from batch_runner import BatchRunner, load_ideas
+    try:
+        ideas = load_ideas(path)
+    except (OSError, ValueError) as e:
+        print(f"Configuration Error: {e}")
+        return
+    model_client = load_replay_client(replay_dir, replay_latency)
+    print(f"📦 Running {len(ideas)} ideas with concurrency {concurrency}...")
+    runner = BatchRunner(api_key=GOOGLE_API_KEY, concurrency=concurrency, execution_mode=execution_mode,
+                         cache=cache, rate_limiter=rate_limiter, idea_index=idea_index,
+                         router=load_router(models_config, cache, rate_limiter, plan) if model_client is None else None,
+                         model_client=model_client, plan=plan, gating=gating, context_policy=context_policy,
+                         context_window=context_window, prompt_layout=prompt_layout)
+    batch = await runner.run(ideas)
+
+    failed = sum(record["status"] == "error" for record in batch["results"])
+    duplicates = sum(record["status"] == "duplicate" for record in batch["results"])
+    print(f"✅ Batch complete: {len(ideas) - failed - duplicates} succeeded, {duplicates} reused, {failed} failed.")
+    print(f"📄 Summary: {batch['summary_file']}")
+    if batch["cache_stats"]:
+        stats = batch["cache_stats"]
+        print(f"🗄️ Response cache: {stats['hits']} hits, {stats['misses']} misses")
+    if batch["rate_limiter_metrics"]:
+        metrics = batch["rate_limiter_metrics"]
+        print(f"🚦 Rate limiter: {metrics['requests']} requests, {metrics['throttled']} throttled, "
+              f"{metrics['retries']} retries, {metrics['wait_seconds']:.1f}s queued")
+    if batch["router_metrics"]:
+        metrics = batch["router_metrics"]
+        print(f"🧭 Model routing: {metrics['calls']} calls, {metrics['fallback_calls']} served by a fallback, "
+              f"{metrics['hedged_calls']} hedged, {metrics['failed_calls']} failed")
+
+def parse_args():
+    """Parses the command-line options."""
+    parser = argparse.ArgumentParser(description="Jarvis Research System")
+    parser.add_argument(
+        "--mode", choices=["round_robin", "dag"], default="round_robin",
+        help="round_robin runs the agents one by one; dag runs independent agents in parallel."
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Stream each agent's output to the console token by token while it is generated."
+    )
+    parser.add_argument(
+        "--trace", action="store_true",
+        help="Export a Chrome trace of the agent turns (open in https://ui.perfetto.dev)."
+    )
+    parser.add_argument(
+        "--context", choices=["full", "fields", "summary", "last_n"], default="full",
+        help="How much of the transcript each agent sends to the model: full, fields (structured fields of "
+             "the agents it depends on), summary (digest of older messages) or last_n (default: full)."
+    )
+    parser.add_argument(
+        "--context-window", type=int, default=3,
+        help="Number of recent messages kept verbatim by the summary and last_n policies (default: 3)."
+    )
+    parser.add_argument(
+        "--pipeline", metavar="SPEC",
+        help="JSON (or, with PyYAML, YAML) file defining the agents, their prompts, dependencies, models and "
+             "termination rules (see pipeline.example.json; default: the built-in ten-agent pipeline)."
+    )
+    parser.add_argument(
+        "--min-confidence", type=float,
+        help="End the run when the domain classifier's confidence is below this fraction "
+             "(default: the pipeline's, 0.5 for the built-in one)."
+    )
+    parser.add_argument(
+        "--min-feasibility", type=float,
+        help="End the run when the mean feasibility score is below this value out of 10 "
+             "(default: the pipeline's, 5 for the built-in one)."
+    )
+    parser.add_argument(
+        "--max-revisions", type=int,
+        help="How often a 'Revise' verdict loops back to the improvement strategist "
+             "(default: the pipeline's, 1 for the built-in one)."
+    )
+    parser.add_argument(
+        "--no-gating", action="store_true",
+        help="Run every agent once regardless of the earlier agents' verdicts and scores."
+    )
+    parser.add_argument(
+        "--dedup-threshold", type=float, default=0.7,
+        help="Similarity (0-1) from which an idea counts as a paraphrase of an earlier run (default: 0.7)."
+    )
+    parser.add_argument(
+        "--no-dedup", action="store_true",
+        help="Do not check for or record near-duplicate ideas."
+    )
+    parser.add_argument(
+        "--topic-candidates", type=int, default=0, metavar="N",
+        help="Generate N topic candidates in parallel calls, score each in its own call and keep the best "
+             "(default: 0, one call recommends five self-scored topics)."
+    )
+    parser.add_argument(
+        "--topic-top-k", type=int, default=5,
+        help="With --topic-candidates, how many of the best-scored topics are reviewed (default: 5)."
+    )
+    parser.add_argument(
+        "--fanout-concurrency", type=int, default=4,
+        help="With --topic-candidates, the most candidate or scoring calls in flight at once (default: 4)."
+    )
+    parser.add_argument(
+        "--open-browser", action="store_true",
+        help="Open the HTML report in a browser when the run is done (skipped on a headless session)."
+    )
+    parser.add_argument(
+        "--prompt-layout", choices=["shared_prefix", "classic"], default="shared_prefix",
+        help="shared_prefix sends one byte-identical system message and the shared transcript first and each "
+             "agent's instructions last, so the provider's prompt cache can reuse the prefix; classic sends "
+             "each agent's system message first (default: shared_prefix)."
+    )
+    parser.add_argument(
+        "--output", choices=["auto", "rich", "jsonl", "null"], default="auto",
+        help="Console output: rich panels, one JSON line per event, or nothing. auto picks rich on a terminal "
+             "and jsonl otherwise (default: auto)."
+    )
+    parser.add_argument("--batch", metavar="FILE", help="Run every idea in a JSONL or CSV file.")
+    parser.add_argument(
+        "--list", nargs="?", const=20, type=int, metavar="N",
+        help="List the N most recent saved runs (default: 20) from the search index and exit."
+    )
+    parser.add_argument(
+        "--resume", metavar="RUN_ID",
+        help="Continue an interrupted run from its checkpoint without re-querying completed agents."
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4,
+        help="Maximum number of ideas processed at the same time in batch mode (default: 4)."
+    )
+    parser.add_argument(
+        "--cache", action="store_true",
+        help="Reuse stored model responses for identical agent requests (research_results/cache/)."
+    )
+    parser.add_argument(
+        "--cache-bypass", action="store_true",
+        help="With --cache, always call the model and refresh the stored responses."
+    )
+    parser.add_argument(
+        "--models", metavar="CONFIG",
+        help="JSON file routing each agent to its own chain of models with fallback and hedging "
+             "(see models.example.json)."
+    )
+    parser.add_argument(
+        "--replay", nargs="?", const=os.path.join("research_results", "json"), metavar="DIR",
+        help="Answer every agent from the reports saved in DIR (default: research_results/json) instead of "
+             "calling a model; needs no API key or network."
+    )
+    parser.add_argument(
+        "--replay-latency", type=float, default=0.0, metavar="SECONDS",
+        help="With --replay, delay every replayed reply by this many seconds (default: 0)."
+    )
+    parser.add_argument("--rpm", type=float, help="Client-side limit on model requests per minute.")
+    parser.add_argument("--tpm", type=float, help="Client-side limit on prompt + completion tokens per minute.")
+    parser.add_argument(
+        "--max-retries", type=int,
+        help="How often the client-side scheduler retries a rate-limited or timed-out agent call (default: 5). "
+             "Without --rpm, --tpm or --max-retries the model SDK's own retries are used."
+    )
+    return parser.parse_args()
+
+def list_runs(limit: int):
+    """Prints the most recent saved runs without loading the agents."""
+    from result_index import ResultIndex, print_runs
+    if not os.path.exists(ResultIndex.DEFAULT_PATH):
+        print("🗂️ No saved runs yet.")
+        return
+    index = ResultIndex()
+    print_runs(index.search(limit=limit))
+    print(f"🗂️ {min(limit, index.count())} of {index.count()} indexed runs")
+    index.close()
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.list is not None:
+        list_runs(args.list)
+        raise SystemExit(0)
+
+    import asyncio
+    from gating import GatingPolicy
+    from idea_dedup import IdeaIndex
+    from pipeline_spec import load_plan
+    from rate_limiter import RateLimiter
+    from response_cache import ResponseCache
+    try:
+        plan = load_plan(args.pipeline)
+    except ValueError as ve:
+        print(f"Configuration Error: {ve}")
+        raise SystemExit(1)
+    cache = ResponseCache(bypass=args.cache_bypass) if args.cache else None
+    # Thresholds given on the command line override the pipeline's termination rules.
+    termination = dict(plan.termination)
+    for option, value in (("min_domain_confidence", args.min_confidence), ("min_feasibility_score", args.min_feasibility),
+                          ("max_revisions", args.max_revisions)):
+        if value is not None:
+            termination[option] = value
+    if args.no_gating:
+        termination["enabled"] = False
+    gating = GatingPolicy(**termination)
+    idea_index = None if args.no_dedup else IdeaIndex(threshold=args.dedup_threshold)
+    # The scheduler takes over retries from the SDK, so it is only used when it was asked for.
+    rate_limiter = None
+    if args.rpm is not None or args.tpm is not None or args.max_retries is not None:
+        rate_limiter = RateLimiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm,
+                                   max_retries=args.max_retries if args.max_retries is not None else 5)
     # This setup is needed to run asyncio in some environments like standard Python scripts.
     # 이 설정은 표준 Python 스크립트와 같은 일부 환경에서 asyncio를 실행하는 데 필요합니다.
     try:
-        asyncio.run(main())
+        if args.batch:
+            asyncio.run(run_batch(args.batch, args.concurrency, args.mode, cache, rate_limiter, idea_index,
+                                  args.models, args.replay, args.replay_latency, plan, gating, args.context,
+                                  args.context_window, args.prompt_layout))
+        else:
+            asyncio.run(main(execution_mode=args.mode, cache=cache, rate_limiter=rate_limiter,
+                             resume_run_id=args.resume, stream_tokens=args.stream,
+                             export_trace=args.trace, context_policy=args.context,
+                             context_window=args.context_window, idea_index=idea_index,
+                             gating=gating, models_config=args.models, replay_dir=args.replay,
+                             replay_latency=args.replay_latency, output=args.output,
+                             topic_candidates=args.topic_candidates, topic_top_k=args.topic_top_k,
+                             fanout_concurrency=args.fanout_concurrency, prompt_layout=args.prompt_layout,
+                             open_browser=args.open_browser, plan=plan))
     except KeyboardInterrupt:
         print("\n👋 Program interrupted by user. Exiting.")
 
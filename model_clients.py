@@ -0,0 +1,69 @@
+# model_clients.py
+
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Dict, Optional, Sequence, Union
+
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, ModelInfo, RequestUsage
+
+# Per-call statistics of the model call currently in progress, shared by the wrappers in a client stack
+# (e.g. the rate limiter counts its retries here and the instrumentation reads them).
+# 현재 진행 중인 모델 호출의 통계로, 클라이언트 스택의 래퍼들이 공유합니다.
+current_call_stats: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_call_stats", default=None)
+
+
+def estimate_tokens(messages: Sequence[LLMMessage]) -> int:
+    """Roughly estimates the prompt size (about four characters per token) without a tokenizer."""
+    return sum(len(str(getattr(message, "content", ""))) for message in messages) // 4 + 1
+
+
+def usage_cached_tokens(usage: Any) -> Optional[int]:
+    """
+    Returns the cached prompt token count a CreateResult's usage reports, or None when it carries none
+    (autogen's RequestUsage currently keeps only the prompt and completion token counts).
+    """
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else getattr(usage, "cached_tokens", None)
+    return cached if isinstance(cached, int) else None
+
+
+class ModelClientWrapper(ChatCompletionClient):
+    """
+    Base class for model clients that add behaviour around another client and delegate everything else to it.
+    다른 모델 클라이언트를 감싸 기능을 추가하고 나머지는 모두 내부 클라이언트에 위임하는 기본 클래스입니다.
+    """
+
+    def __init__(self, inner: ChatCompletionClient):
+        """
+        Args:
+            inner (ChatCompletionClient): The wrapped model client.
+        """
+        self.inner = inner
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        return await self.inner.create(messages, **kwargs)
+
+    def create_stream(self, messages: Sequence[LLMMessage], **kwargs: Any) -> AsyncGenerator[Union[str, CreateResult], None]:
+        return self.inner.create_stream(messages, **kwargs)
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self.inner.actual_usage()
+
+    def total_usage(self) -> RequestUsage:
+        return self.inner.total_usage()
+
+    def count_tokens(self, messages: Sequence[LLMMessage], **kwargs: Any) -> int:
+        return self.inner.count_tokens(messages, **kwargs)
+
+    def remaining_tokens(self, messages: Sequence[LLMMessage], **kwargs: Any) -> int:
+        return self.inner.remaining_tokens(messages, **kwargs)
+
+    @property
+    def capabilities(self):  # type: ignore
+        return self.inner.capabilities
+
+    @property
+    def model_info(self) -> ModelInfo:
+        return self.inner.model_info
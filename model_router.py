@@ -0,0 +1,289 @@
+# model_router.py
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+
+from ai_system import GEMINI_BASE_URL, MODEL_NAME, create_model_client
+from instrumentation import MODEL_PRICING
+from model_clients import ModelClientWrapper, current_call_stats
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+
+
+class ProviderStats:
+    """
+    Request, failure and latency counters of one provider. Latencies are kept for the most recent calls
+    so percentiles reflect the provider's current state.
+    한 제공자의 요청·실패·지연 시간 통계로, 백분위수가 현재 상태를 반영하도록 최근 호출의 지연 시간만 보관합니다.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.wins = 0
+        self.hedges = 0
+        self.latencies: deque = deque(maxlen=window)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Returns the latency (seconds) below which the given fraction of recent successful calls finished."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self) -> Dict:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "wins": self.wins,
+            "hedges": self.hedges,
+            "p50": round(p50, 3) if p50 is not None else None,
+            "p95": round(p95, 3) if p95 is not None else None,
+        }
+
+
+class RoutedChatCompletionClient(ModelClientWrapper):
+    """
+    A model client for one route: an ordered chain of providers. A call goes to the first provider; when it
+    fails or exceeds its timeout the next one is tried, and when it has not answered after `hedge_after`
+    seconds a duplicate call is sent to the next provider (or the same one if the chain has only one) and
+    whichever answers first is kept. For streamed calls the race is decided by the first chunk.
+    제공자 체인으로 구성된 라우트의 모델 클라이언트로, 실패·시간 초과 시 다음 제공자로 넘어가고 지연 시 중복(헤지) 요청을 보내 먼저 도착한 응답을 사용합니다.
+    """
+
+    def __init__(self, router: "ModelRouter", chain: List[str], hedge_after: Optional[float] = None,
+                 timeout: Optional[float] = None):
+        """
+        Args:
+            router (ModelRouter): The router owning the provider clients and their statistics.
+            chain (List[str]): The provider names in fallback order.
+            hedge_after (float, optional): Seconds after which a hedged duplicate call is sent. None disables hedging.
+            timeout (float, optional): Seconds after which one provider's attempt counts as failed
+                (for streamed calls: until the first chunk).
+        """
+        super().__init__(router.providers[chain[0]])
+        self.router = router
+        self.chain = chain
+        self.hedge_after = hedge_after
+        self.timeout = timeout
+
+    async def _race(self, attempt: Callable[[ChatCompletionClient], Awaitable[Any]],
+                    discard: Callable[[Any], Awaitable[None]]) -> Any:
+        """
+        Runs attempts along the chain with fallback and hedging and returns the first successful result.
+
+        Args:
+            attempt (Callable): Starts one call on a provider client.
+            discard (Callable): Releases the result of an attempt that finished but lost the race.
+        """
+        stats = current_call_stats.get()
+        remaining = list(self.chain)
+        running: Dict[asyncio.Task, Tuple[str, float]] = {}
+        hedged = False
+        errors: List[BaseException] = []
+
+        def launch(hedge: bool = False):
+            # A single-provider route hedges against itself.
+            name = remaining.pop(0) if remaining else self.chain[0]
+            provider = self.router.stats[name]
+            provider.requests += 1
+            provider.hedges += hedge
+            task = asyncio.ensure_future(asyncio.wait_for(attempt(self.router.providers[name]), self.timeout))
+            running[task] = (name, time.perf_counter())
+
+        launch()
+        try:
+            while running:
+                can_hedge = self.hedge_after is not None and not hedged
+                done, _ = await asyncio.wait(running, timeout=self.hedge_after if can_hedge else None,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    launch(hedge=True)
+                    continue
+                for task in done:
+                    name, started = running.pop(task)
+                    provider = self.router.stats[name]
+                    if task.exception() is None:
+                        provider.wins += 1
+                        provider.latencies.append(time.perf_counter() - started)
+                        self.router.record_call(self.chain, name, hedged)
+                        if stats is not None:
+                            stats.update({"provider": name, "model": self.router.models[name], "hedged": hedged})
+                        return task.result()
+                    provider.failures += 1
+                    provider.timeouts += isinstance(task.exception(), asyncio.TimeoutError)
+                    errors.append(task.exception())
+                if remaining and len(running) < 2:
+                    launch()
+            self.router.failed_calls += 1
+            raise errors[-1]
+        finally:
+            # Cancel the attempts that lost the race and release any that finished at the same time.
+            for task in running:
+                task.cancel()
+            for task in running:
+                try:
+                    await discard(await task)
+                except asyncio.CancelledError:
+                    # Only the loser's own cancellation is expected; a cancellation of this call is passed on.
+                    if asyncio.current_task().cancelling():
+                        raise
+                except Exception:
+                    pass
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        async def attempt(client: ChatCompletionClient) -> CreateResult:
+            return await client.create(messages, **kwargs)
+
+        async def discard(result: CreateResult):
+            pass
+
+        return await self._race(attempt, discard)
+
+    async def create_stream(self, messages: Sequence[LLMMessage], **kwargs: Any) -> AsyncGenerator[Union[str, CreateResult], None]:
+        async def attempt(client: ChatCompletionClient):
+            stream = client.create_stream(messages, **kwargs)
+            try:
+                return stream, await stream.__anext__()
+            except BaseException:
+                await stream.aclose()
+                raise
+
+        async def discard(result):
+            await result[0].aclose()
+
+        stream, first = await self._race(attempt, discard)
+        try:
+            yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+
+class ModelRouter:
+    """
+    Routes every agent to a chain of model providers read from a JSON config, so that cheap steps can use a
+    small model and heavy generation a larger one, with fallback and hedged requests between providers.
+    JSON 설정에 따라 각 에이전트를 모델 제공자 체인으로 라우팅하여, 가벼운 단계는 작은 모델을, 무거운 생성 단계는 큰 모델을 사용하고 제공자 간 폴백과 헤지 요청을 수행합니다.
+
+    Config format:
+        {
+          "providers": {
+            "flash": {"model": "gemini-2.0-flash", "base_url": "...", "api_key_env": "GOOGLE_API_KEY",
+                      "price": [0.10, 0.40], "max_retries": 0, "model_info": {...}},
+            ...
+          },
+          "routes": {
+            "default": ["flash"],
+            "final_resource_engineer": {"providers": ["pro", "flash"], "hedge_after": 20, "timeout": 90}
+          },
+          "hedge_after": 8.0,
+          "timeout": 60
+        }
+    """
+
+    def __init__(self, config: Dict, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None):
+        """
+        Creates one client per provider.
+
+        Args:
+            config (Dict): The routing config (see the class docstring).
+            api_key (str, optional): The key for providers that name neither "api_key" nor "api_key_env".
+            cache (ResponseCache, optional): Shared by all providers (the model name is part of every key).
+            rate_limiter (RateLimiter, optional): Used for providers without their own "rpm"/"tpm" limits.
+        """
+        self.providers: Dict[str, ChatCompletionClient] = {}
+        self.models: Dict[str, str] = {}
+        self.stats: Dict[str, ProviderStats] = {}
+        self.rate_limiters: Dict[str, RateLimiter] = {}
+        for name, provider in config.get("providers", {}).items():
+            model = provider.get("model", MODEL_NAME)
+            key = provider.get("api_key") or os.environ.get(provider.get("api_key_env", ""), "") or api_key
+            limiter = rate_limiter
+            if provider.get("rpm") or provider.get("tpm"):
+                limiter = RateLimiter(requests_per_minute=provider.get("rpm"), tokens_per_minute=provider.get("tpm"))
+            if limiter is not None:
+                self.rate_limiters[name] = limiter
+            options = {option: provider[option] for option in ("model_info", "timeout") if option in provider}
+            # The fallback chain takes over from the SDK's own retries unless the config asks for them.
+            options["max_retries"] = provider.get("max_retries", 0)
+            self.providers[name] = create_model_client(key, base_url=provider.get("base_url", GEMINI_BASE_URL),
+                                                       cache=cache, rate_limiter=limiter, model=model, **options)
+            self.models[name] = model
+            self.stats[name] = ProviderStats()
+            if provider.get("price"):
+                MODEL_PRICING[model] = tuple(provider["price"])
+
+        self.routes: Dict[str, Dict] = {}
+        for agent, route in config.get("routes", {}).items():
+            route = {"providers": route} if isinstance(route, list) else dict(route)
+            for name in route["providers"]:
+                if name not in self.providers:
+                    raise ValueError(f"Route '{agent}' uses unknown provider '{name}'.")
+            route.setdefault("hedge_after", config.get("hedge_after"))
+            route.setdefault("timeout", config.get("timeout"))
+            self.routes[agent] = route
+        if "default" not in self.routes:
+            if not self.providers:
+                raise ValueError("The model config defines no providers.")
+            self.routes["default"] = {"providers": [next(iter(self.providers))],
+                                      "hedge_after": config.get("hedge_after"), "timeout": config.get("timeout")}
+        self._clients: Dict[str, RoutedChatCompletionClient] = {}
+        self.calls = 0
+        self.fallback_calls = 0
+        self.hedged_calls = 0
+        self.failed_calls = 0
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "ModelRouter":
+        """Loads the routing config from a JSON file; see __init__ for the keyword arguments."""
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f), **kwargs)
+
+    def client_for(self, agent_name: str) -> ChatCompletionClient:
+        """Returns the routed client for an agent (its own route, or the default one)."""
+        route_name = agent_name if agent_name in self.routes else "default"
+        if route_name not in self._clients:
+            route = self.routes[route_name]
+            self._clients[route_name] = RoutedChatCompletionClient(self, route["providers"], route["hedge_after"],
+                                                                   route["timeout"])
+        return self._clients[route_name]
+
+    def record_call(self, chain: List[str], provider: str, hedged: bool):
+        """Counts one successful routed call."""
+        self.calls += 1
+        self.fallback_calls += provider != chain[0]
+        self.hedged_calls += hedged
+
+    def metrics(self) -> Dict:
+        """
+        Returns the routing metrics.
+
+        Returns:
+            Dict: calls, fallback_calls, hedged_calls, failed_calls and per-provider statistics
+            (model, requests, failures, timeouts, wins, hedges, p50 and p95 latency in seconds).
+        """
+        return {
+            "calls": self.calls,
+            "fallback_calls": self.fallback_calls,
+            "hedged_calls": self.hedged_calls,
+            "failed_calls": self.failed_calls,
+            "providers": {name: {"model": self.models[name], **stats.summary()} for name, stats in self.stats.items()},
+        }
+
+    async def close(self):
+        """Closes every provider client."""
+        for client in self.providers.values():
+            await client.close()
@@ -0,0 +1,266 @@
+# output_parser.py
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from research_domain import ResearchDomain
+
+# Free-form domain labels the model tends to use, mapped to the closest ResearchDomain.
+# 모델이 자주 사용하는 자유 형식 분야 이름을 가장 가까운 ResearchDomain에 대응시킵니다.
+DOMAIN_ALIASES = {
+    "artificial intelligence": ResearchDomain.COMPUTER_SCIENCE,
+    "machine learning": ResearchDomain.COMPUTER_SCIENCE,
+    "computer vision": ResearchDomain.COMPUTER_SCIENCE,
+    "robotics": ResearchDomain.MECHANICAL_ENGINEERING,
+    "software": ResearchDomain.COMPUTER_SCIENCE,
+    "biomedical": ResearchDomain.BIOENGINEERING,
+    "biotechnology": ResearchDomain.BIOENGINEERING,
+    "medicine": ResearchDomain.HEALTHCARE,
+    "medical": ResearchDomain.HEALTHCARE,
+    "health": ResearchDomain.HEALTHCARE,
+    "electronics": ResearchDomain.ELECTRICAL_ENGINEERING,
+    "energy": ResearchDomain.ELECTRICAL_ENGINEERING,
+    "materials": ResearchDomain.MATERIALS_SCIENCE,
+    "climate": ResearchDomain.ENVIRONMENTAL_SCIENCE,
+    "ecology": ResearchDomain.ENVIRONMENTAL_SCIENCE,
+    "environment": ResearchDomain.ENVIRONMENTAL_SCIENCE,
+    "wildfire": ResearchDomain.FORESTRY,
+    "forest": ResearchDomain.FORESTRY,
+    "farming": ResearchDomain.AGRICULTURE,
+    "crop": ResearchDomain.AGRICULTURE,
+    "economics": ResearchDomain.FINANCE,
+    "fintech": ResearchDomain.FINANCE,
+}
+
+FIELD_LINE = re.compile(r"^\s*[-*•]?\s*([A-Za-z][\w /&()-]*?)\s*:\s*(.+?)\s*$")
+TOPIC_LINE = re.compile(r"^\s*\d+[.)]\s*(.+?)\s*(?:[-–—|]\s*)?Innovation\s*:?\s*(\d+(?:\.\d+)?)\s*/\s*10"
+                        r"(?:.*?Feasibility\s*:?\s*(\d+(?:\.\d+)?)\s*/\s*10)?", re.IGNORECASE)
+SCORE = re.compile(r"(\d+(?:\.\d+)?)\s*/\s*10")
+PERCENT = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+
+
+@dataclass
+class TopicScore:
+    """
+    One recommended topic with its innovation and feasibility scores (out of 10).
+    혁신성 및 실현 가능성 점수(10점 만점)가 포함된 추천 주제입니다.
+    """
+    title: str
+    innovation: Optional[float] = None
+    feasibility: Optional[float] = None
+
+
+@dataclass
+class ResearchRecord:
+    """
+    The typed results of one research run, parsed from the agents' formatted replies.
+    Fields stay None when an agent's reply could not be parsed; the reason is kept in parse_errors.
+    에이전트의 서식화된 응답에서 추출한 연구 실행의 구조화된 결과입니다. 파싱할 수 없는 필드는 None으로 남고 그 이유는 parse_errors에 기록됩니다.
+    """
+    domain: Optional[ResearchDomain] = None
+    domain_label: Optional[str] = None
+    domain_confidence: Optional[float] = None
+    keywords: List[str] = field(default_factory=list)
+    technical_score: Optional[float] = None
+    viability_score: Optional[float] = None
+    feasibility_verdict: Optional[str] = None
+    verdict: Optional[str] = None
+    topics: List[TopicScore] = field(default_factory=list)
+    parse_errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        """Returns the record as a JSON-serializable dictionary (the domain as its enum value)."""
+        data = asdict(self)
+        data["domain"] = self.domain.value if self.domain is not None else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ResearchRecord":
+        """Rebuilds a record from the dictionary returned by to_dict."""
+        data = dict(data)
+        data["domain"] = ResearchDomain(data["domain"]) if data.get("domain") else None
+        data["topics"] = [TopicScore(**topic) for topic in data.get("topics", [])]
+        return cls(**{key: value for key, value in data.items() if key in cls.__dataclass_fields__})
+
+
+def _clean(value: str) -> str:
+    """Strips markdown emphasis and template brackets from a field value."""
+    return value.replace("**", "").replace("__", "").strip().strip("[]").strip()
+
+
+def _fields(content: str) -> Dict[str, str]:
+    """Collects the `- Field: value` lines of a reply, keyed by the lower-cased field name (first one wins)."""
+    fields: Dict[str, str] = {}
+    for line in content.splitlines():
+        match = FIELD_LINE.match(line.replace("**", ""))
+        if match:
+            fields.setdefault(match.group(1).strip().lower(), _clean(match.group(2)))
+    return fields
+
+
+def _choice(value: Optional[str], choices: List[str]) -> Optional[str]:
+    """Returns the single choice mentioned in the value, or None if there is none or more than one."""
+    if not value:
+        return None
+    found = [choice for choice in choices if re.search(rf"\b{choice}\b", value, re.IGNORECASE)]
+    return found[0] if len(found) == 1 else None
+
+
+def _score(value: Optional[str]) -> Optional[float]:
+    """Parses an 'N/10' score."""
+    match = SCORE.search(value or "")
+    return float(match.group(1)) if match else None
+
+
+def map_domain(label: str) -> Optional[ResearchDomain]:
+    """
+    Maps a free-form domain label to a ResearchDomain.
+
+    Args:
+        label (str): The label reported by the domain classifier, e.g. "Environmental Science / Forestry".
+
+    Returns:
+        ResearchDomain: The matching domain, or None if no domain or alias matches.
+    """
+    normalized = re.sub(r"[^a-z]+", " ", label.lower()).strip()
+    for domain in ResearchDomain:
+        if domain.value.replace("_", " ") in normalized:
+            return domain
+    for alias, domain in DOMAIN_ALIASES.items():
+        if alias in normalized:
+            return domain
+    return None
+
+
+def parse_confidence(value: Optional[str]) -> Optional[float]:
+    """Parses a confidence such as '95%' or '0.95' into a fraction between 0 and 1."""
+    if not value:
+        return None
+    match = PERCENT.search(value)
+    if match:
+        return min(float(match.group(1)) / 100, 1.0)
+    match = re.search(r"\d+(?:\.\d+)?", value)
+    if match and float(match.group(0)) <= 1:
+        return float(match.group(0))
+    return None
+
+
+def parse_agent_output(agent: str, content: str, record: Optional[ResearchRecord] = None) -> ResearchRecord:
+    """
+    Parses one agent reply into the record. Agents without structured results leave it unchanged,
+    and a reply that does not follow the requested format is recorded in parse_errors instead of raising.
+
+    Args:
+        agent (str): The agent that wrote the reply.
+        content (str): The reply text.
+        record (ResearchRecord, optional): The record to update. A new one is created if omitted.
+
+    Returns:
+        ResearchRecord: The updated record.
+    """
+    record = record if record is not None else ResearchRecord()
+    fields = _fields(content)
+
+    if agent == "domain_classifier":
+        label = fields.get("primary domain")
+        if not label:
+            record.parse_errors.append("domain_classifier: no 'Primary Domain' field")
+        else:
+            record.domain_label = label
+            record.domain = map_domain(label)
+            if record.domain is None:
+                record.parse_errors.append(f"domain_classifier: unknown domain '{label}'")
+        confidence = parse_confidence(fields.get("confidence"))
+        if confidence is not None:
+            record.domain_confidence = confidence
+        if fields.get("keywords"):
+            record.keywords = [_clean(k) for k in fields["keywords"].split(",") if _clean(k)]
+
+    elif agent == "feasibility_evaluator":
+        technical = _score(fields.get("technical"))
+        viability = _score(fields.get("viability"))
+        verdict = _choice(fields.get("verdict"), ["Proceed", "Revise"])
+        if technical is None and viability is None and verdict is None:
+            record.parse_errors.append("feasibility_evaluator: no scores or verdict")
+        else:
+            record.technical_score = technical if technical is not None else record.technical_score
+            record.viability_score = viability if viability is not None else record.viability_score
+            record.feasibility_verdict = verdict.capitalize() if verdict is not None else record.feasibility_verdict
+
+    elif agent == "topic_recommender":
+        topics = []
+        for line in content.splitlines():
+            match = TOPIC_LINE.match(line.replace("**", ""))
+            if match:
+                title = _clean(match.group(1).rstrip(" -–—|,"))
+                topics.append(TopicScore(
+                    title=title,
+                    innovation=float(match.group(2)),
+                    feasibility=float(match.group(3)) if match.group(3) else None
+                ))
+        if topics:
+            record.topics = topics
+        else:
+            record.parse_errors.append("topic_recommender: no scored topics")
+
+    elif agent == "advisor_professor":
+        verdict = _choice(fields.get("verdict"), ["APPROVE", "REJECT"])
+        if verdict is not None:
+            record.verdict = verdict.upper()
+        else:
+            record.parse_errors.append("advisor_professor: no APPROVE/REJECT verdict")
+
+    return record
+
+
+def parse_research_messages(messages: List[Dict]) -> ResearchRecord:
+    """
+    Parses all messages of a run. When an agent spoke more than once, its latest parsable reply wins.
+
+    Args:
+        messages (List[Dict]): The messages with their 'agent' and 'content'.
+
+    Returns:
+        ResearchRecord: The typed results of the run.
+    """
+    record = ResearchRecord()
+    for message in messages:
+        parse_agent_output(message.get("agent", ""), message.get("content", ""), record)
+    return record
+
+
+def parse_topic_candidates(content: str) -> List[str]:
+    """
+    Extracts the proposed topic titles from a topic candidate reply: the '- Topic:' field, or else every
+    numbered topic line (so a full topic_recommender reply also works).
+
+    Args:
+        content (str): The reply text.
+
+    Returns:
+        List[str]: The topic titles, possibly empty.
+    """
+    topic = _fields(content).get("topic")
+    if topic:
+        return [topic]
+    titles = []
+    for line in content.splitlines():
+        match = TOPIC_LINE.match(line.replace("**", ""))
+        if match:
+            titles.append(_clean(match.group(1).rstrip(" -–—|,")))
+    return titles
+
+
+def parse_topic_score(content: str) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Parses a topic scoring reply.
+
+    Args:
+        content (str): The reply with '- Innovation: N/10' and '- Feasibility: N/10' lines.
+
+    Returns:
+        Tuple[Optional[float], Optional[float]]: The innovation and feasibility scores (None when missing).
+    """
+    fields = _fields(content)
+    return _score(fields.get("innovation")), _score(fields.get("feasibility"))
@@ -0,0 +1,159 @@
+# pipeline.py
+
+import asyncio
+import time
+from typing import AsyncGenerator, Dict, List, Optional
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import ModelClientStreamingChunkEvent, TextMessage
+from autogen_core import CancellationToken
+
+from gating import GatingPolicy
+from pipeline_spec import compute_stages, load_plan
+
+# Which earlier outputs each agent needs in the built-in pipeline (see pipeline_spec.DEFAULT_PIPELINE).
+# Agents with no dependencies only see the user idea.
+# 기본 파이프라인에서 각 에이전트가 필요로 하는 이전 단계의 출력입니다. 의존성이 없는 에이전트는 사용자 아이디어만 봅니다.
+AGENT_DEPENDENCIES: Dict[str, List[str]] = load_plan().dependencies
+
+
+class DependencyPipeline:
+    """
+    Runs the agents as a dependency graph, starting every agent as soon as the outputs it declared are ready.
+    선언된 의존성 출력이 준비되는 즉시 각 에이전트를 실행하는 의존성 그래프 기반 파이프라인입니다.
+    """
+
+    def __init__(self, agents: Dict[str, AssistantAgent], dependencies: Optional[Dict[str, List[str]]] = None,
+                 stages: Optional[List[List[str]]] = None):
+        """
+        Validates the dependency graph against the available agents.
+
+        Args:
+            agents (Dict[str, AssistantAgent]): The agents keyed by their name.
+            dependencies (Dict[str, List[str]], optional): The earlier outputs each agent needs.
+                Defaults to AGENT_DEPENDENCIES.
+            stages (List[List[str]], optional): The stages precomputed for these dependencies, e.g. by an
+                ExecutionPlan. Computed from the dependencies when omitted.
+        """
+        self.agents = agents
+        self.dependencies = dependencies if dependencies is not None else AGENT_DEPENDENCIES
+        for name, deps in self.dependencies.items():
+            if name not in self.agents:
+                raise ValueError(f"Unknown agent in pipeline: {name}")
+            for dep in deps:
+                if dep not in self.dependencies:
+                    raise ValueError(f"Agent '{name}' depends on unknown agent '{dep}'.")
+        self.stages = stages if stages is not None else compute_stages(self.dependencies)
+
+    def build_task(self, user_idea: str, agent_name: str, outputs: Dict[str, str]) -> str:
+        """
+        Builds the task text for one agent from the user idea and the outputs it declared.
+
+        Args:
+            user_idea (str): The research idea provided by the user.
+            agent_name (str): The agent the task is for.
+            outputs (Dict[str, str]): The outputs of the agents finished so far.
+
+        Returns:
+            str: The task text for the agent.
+        """
+        task = f'Perform your analysis for the research idea: "{user_idea}"'
+        # The outputs follow the pipeline's agent order rather than the order the dependencies were declared
+        # in, so agents sharing their first dependencies send byte-identical prompt prefixes.
+        declared = set(self.dependencies[agent_name])
+        for dep in self.dependencies:
+            if dep in declared:
+                task += f"\n\n### Output from {dep}\n{outputs[dep]}"
+        return task
+
+    async def _run_agent(self, agent_name: str, task: str, cancellation_token: CancellationToken,
+                         events: asyncio.Queue) -> str:
+        """Resets one agent and runs it on its task, forwarding streamed chunks and returning the reply content."""
+        agent = self.agents[agent_name]
+        await agent.on_reset(cancellation_token)
+        content = ''
+        async for item in agent.on_messages_stream(
+            [TextMessage(content=task, source="user")],
+            cancellation_token=cancellation_token
+        ):
+            if isinstance(item, ModelClientStreamingChunkEvent):
+                events.put_nowait({"type": "chunk", "agent": agent_name, "content": item.content})
+            elif isinstance(item, Response):
+                content = getattr(item.chat_message, 'content', '')
+        return content
+
+    async def run_stream(self, user_idea: str, completed: Optional[Dict[str, str]] = None,
+                         gate: Optional[GatingPolicy] = None) -> AsyncGenerator[Dict, None]:
+        """
+        Runs the pipeline, yielding each agent's result in completion order.
+
+        Args:
+            user_idea (str): The research idea provided by the user.
+            completed (Dict[str, str], optional): Outputs of agents that already ran (e.g. restored
+                from a checkpoint). These agents are not run again.
+            gate (GatingPolicy, optional): Sees every output. When it ends the run, agents still running
+                are cancelled and no new ones start; agents it skips are not started, nor are the agents
+                that depend on them.
+
+        Yields:
+            Dict: Events with a 'type'. "message" events carry the agent name, its content and its
+            start/end offsets in seconds from the run start; "chunk" events carry streamed text
+            (only when the agents stream their model output).
+        """
+        cancellation_token = CancellationToken()
+        outputs: Dict[str, str] = {name: content for name, content in (completed or {}).items()
+                                   if name in self.dependencies}
+        pending = {name: deps for name, deps in self.dependencies.items() if name not in outputs}
+        running: Dict[asyncio.Task, Dict] = {}
+        events: asyncio.Queue = asyncio.Queue()
+        run_start = time.perf_counter()
+        if gate is not None:
+            for name, content in outputs.items():
+                gate.observe(name, content)
+
+        def on_done(task: asyncio.Task):
+            events.put_nowait({"type": "done", "task": task})
+
+        def gated() -> bool:
+            """Drops pending agents that were skipped or depend on a skipped agent; True once the run is ended."""
+            if gate is None:
+                return False
+            skipped = set(gate.skipped)
+            while True:
+                dropped = [n for n, deps in pending.items() if n in skipped or any(d in skipped for d in deps)]
+                if not dropped:
+                    return gate.stopped
+                for name in dropped:
+                    del pending[name]
+                    skipped.add(name)
+
+        try:
+            while not gated() and (pending or running):
+                for name in [n for n, deps in pending.items() if all(d in outputs for d in deps)]:
+                    del pending[name]
+                    task = asyncio.create_task(
+                        self._run_agent(name, self.build_task(user_idea, name, outputs), cancellation_token, events)
+                    )
+                    task.add_done_callback(on_done)
+                    running[task] = {"type": "message", "agent": name, "started": time.perf_counter() - run_start}
+
+                event = await events.get()
+                if event["type"] == "chunk":
+                    yield event
+                    continue
+
+                info = running.pop(event["task"])
+                content = event["task"].result()
+                outputs[info["agent"]] = content
+                info["finished"] = time.perf_counter() - run_start
+                info["duration"] = info["finished"] - info["started"]
+                info["content"] = content
+                if gate is not None:
+                    gate.observe(info["agent"], content)
+                yield info
+        finally:
+            if running:
+                cancellation_token.cancel()
+                for task in running:
+                    task.cancel()
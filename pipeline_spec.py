@@ -0,0 +1,226 @@
+# pipeline_spec.py
+
+import copy
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+AGENT_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+AGENT_FIELDS = ("name", "system_message", "depends_on", "emoji", "color", "route")
+TERMINATION_OPTIONS = ("min_domain_confidence", "min_feasibility_score", "max_revisions", "require_approval", "enabled")
+
+# The built-in pipeline: the ten agents in their round-robin order, the outputs each needs in DAG mode,
+# their console and report styles, and the gating thresholds.
+# 기본 제공 파이프라인: 라운드 로빈 순서의 열 에이전트, DAG 모드에서 각자 필요한 출력, 콘솔·보고서 스타일, 게이팅 기준입니다.
+DEFAULT_PIPELINE: Dict[str, Any] = {
+    "name": "default",
+    "agents": [
+        {"name": "domain_classifier", "emoji": "🔍", "color": "cyan", "depends_on": [],
+         "system_message": "You are an expert at accurately identifying the primary domain of a research idea. Respond in the format: 🎯 Domain Analysis\n- Primary Domain: [domain_name]\n- Confidence: [95%]\n- Keywords: [key1, key2]. End your response with 'Domain analysis complete.'"},
+        {"name": "senior_researcher", "emoji": "👨‍🏫", "color": "green", "depends_on": [],
+         "system_message": "You are a senior researcher guiding a junior colleague. Refine their idea into a concrete research plan. Respond in the format: 💡 Refined Idea\n- Core Question: [question]\n- Objective: [objective]\n- Challenges: [challenges]. End your response with 'Idea refinement complete.'"},
+        {"name": "prompt_engineer", "emoji": "✏️", "color": "yellow", "depends_on": ["senior_researcher"],
+         "system_message": "You are a prompt engineering expert who optimizes research questions. Respond in the format: ✏️ Optimized Questions\n- RQ1: [main_question]\n- RQ2: [sub_question]\n- Validation Method: [method]. End your response with 'Question optimization complete.'"},
+        {"name": "ai_specialist", "emoji": "🤖", "color": "magenta", "depends_on": ["senior_researcher"],
+         "system_message": "You are an expert in AI technology and methodologies. Design the AI-powered solution. Respond in the format: 🤖 AI Technology Design\n- Core Tech: [tech]\n- Strategy: [strategy]\n- Performance: [expected_results]. End with 'AI design complete.'"},
+        {"name": "research_trend_analyst", "emoji": "📚", "color": "blue", "depends_on": ["senior_researcher"],
+         "system_message": "You analyze research trends from the last 5 years. Respond in the format: 📚 Trend Analysis\n- Key Trends: [trends]\n- Research Gaps: [gaps]\n- Future Outlook: [outlook]. End with 'Trend analysis complete.'"},
+        {"name": "feasibility_evaluator", "emoji": "⚖️", "color": "red", "depends_on": ["senior_researcher", "prompt_engineer", "ai_specialist", "research_trend_analyst"],
+         "system_message": "You rigorously evaluate research feasibility. Respond in the format: ⚖️ Feasibility Assessment\n- Technical: [8/10] - [reason]\n- Viability: [7/10] - [reason]\n- Verdict: [Proceed/Revise]. End with 'Feasibility assessment complete.'"},
+        {"name": "improvement_strategist", "emoji": "🔧", "color": "orange3", "depends_on": ["senior_researcher", "feasibility_evaluator"],
+         "system_message": "You are an expert at identifying and rectifying weaknesses in a research plan. Respond in the format: 🔧 Improvement Strategy\n- Key Weakness: [weakness]\n- Solution: [solution]\n- Expected Outcome: [outcome]. End with 'Strategy formulation complete.'"},
+        {"name": "topic_recommender", "emoji": "🎯", "color": "purple", "depends_on": ["domain_classifier", "prompt_engineer", "research_trend_analyst", "improvement_strategist"],
+         "system_message": "You are an expert system that recommends 5 specific research topics. Respond in the format: 🎯 Topic Recommendations\n1. [Topic 1] - Innovation: 8/10, Feasibility: 9/10\n... End with 'Topic recommendation complete.'"},
+        {"name": "advisor_professor", "emoji": "👨‍🏫", "color": "bright_blue", "depends_on": ["senior_researcher", "feasibility_evaluator", "topic_recommender"],
+         "system_message": "You are a professor providing the final review. Respond in the format: 👨‍🏫 Final Review\n- Strengths: [strengths]\n- Concerns: [concerns]\n- Verdict: [APPROVE/REJECT]\n- Next Steps: [actions]. End with 'Final review complete.'"},
+        {"name": "final_resource_engineer", "emoji": "🛠️", "color": "bright_green", "depends_on": ["ai_specialist", "topic_recommender", "advisor_professor"],
+         "system_message": "You provide a complete resource package for an approved topic. Respond in the format: 🛠️ Resource Package\n- Datasets: [dataset_info]\n- AI Models: [model_info]\n- Dev Env: [tools]\n- Roadmap: [12-month_plan]. End with 'Resource package complete.'"}
+    ],
+    "termination": {"min_domain_confidence": 0.5, "min_feasibility_score": 5.0, "max_revisions": 1,
+                    "require_approval": True},
+}
+
+# The styles of the speakers that are not pipeline agents. Each plan holds the styles of its own agents
+# (see ExecutionPlan.emoji and ExecutionPlan.color).
+# 파이프라인 에이전트가 아닌 발화자의 이모지와 색상으로, 에이전트의 스타일은 각 계획이 가지고 있습니다.
+AGENT_EMOJIS: Dict[str, str] = {"user": "👤"}
+AGENT_COLORS: Dict[str, str] = {"user": "white"}
+
+
+def compute_stages(dependencies: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Groups the agents into stages that can run at the same time (Kahn's algorithm).
+
+    Args:
+        dependencies (Dict[str, List[str]]): The earlier outputs each agent needs.
+
+    Returns:
+        List[List[str]]: The agent names of each stage, in execution order.
+    """
+    remaining = {name: set(deps) for name, deps in dependencies.items()}
+    stages = []
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between agents: {', '.join(sorted(remaining))}")
+        stages.append(ready)
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return stages
+
+
+class ExecutionPlan:
+    """
+    A validated pipeline spec compiled for execution: the agent order, prompts and styles, the dependency
+    graph with its stages, the gating thresholds and the model routes. Plans are immutable once compiled
+    and shared by every team of a system.
+    검증된 파이프라인 명세를 실행용으로 컴파일한 계획으로, 에이전트 순서·프롬프트·스타일, 의존성 그래프와 단계, 게이팅 기준, 모델 라우팅을 담습니다.
+    """
+
+    def __init__(self, spec: Dict[str, Any], base_dir: str = "."):
+        """
+        Validates and compiles a spec. See README.md for the format.
+
+        Args:
+            spec (Dict[str, Any]): The pipeline spec, e.g. loaded from a JSON or YAML file.
+            base_dir (str): The directory a "models" file path is relative to.
+        """
+        if not isinstance(spec, dict):
+            raise ValueError("A pipeline spec must be an object with an 'agents' list.")
+        unknown = set(spec) - {"name", "agents", "termination", "models"}
+        if unknown:
+            raise ValueError(f"Unknown pipeline field(s): {', '.join(sorted(unknown))}")
+        agents = spec.get("agents")
+        if not isinstance(agents, list) or not agents:
+            raise ValueError("A pipeline spec needs a non-empty 'agents' list.")
+
+        self.name = str(spec.get("name") or "custom")
+        self.agents: List[Dict[str, Any]] = []
+        for index, agent in enumerate(agents):
+            if not isinstance(agent, dict):
+                raise ValueError(f"Agent #{index + 1} must be an object.")
+            name = agent.get("name", "")
+            if not isinstance(name, str) or not AGENT_NAME.match(name) or name == "user":
+                raise ValueError(f"Agent #{index + 1} needs a valid identifier as 'name' (got {name!r}).")
+            if any(existing["name"] == name for existing in self.agents):
+                raise ValueError(f"Agent '{name}' is defined twice.")
+            unknown = set(agent) - set(AGENT_FIELDS)
+            if unknown:
+                raise ValueError(f"Agent '{name}' has unknown field(s): {', '.join(sorted(unknown))}")
+            if not isinstance(agent.get("system_message"), str) or not agent["system_message"].strip():
+                raise ValueError(f"Agent '{name}' needs a 'system_message'.")
+            depends_on = agent.get("depends_on", [])
+            if not isinstance(depends_on, list) or not all(isinstance(dep, str) for dep in depends_on):
+                raise ValueError(f"Agent '{name}': 'depends_on' must be a list of agent names.")
+            self.agents.append({"name": name, "system_message": agent["system_message"], "depends_on": depends_on,
+                                "emoji": agent.get("emoji", "🔹"), "color": agent.get("color", "white"),
+                                "route": agent.get("route")})
+
+        self.order = [agent["name"] for agent in self.agents]
+        for agent in self.agents:
+            for dep in agent["depends_on"]:
+                if dep not in self.order:
+                    raise ValueError(f"Agent '{agent['name']}' depends on unknown agent '{dep}'.")
+        # Dependencies follow the agent order, so DAG tasks list the outputs in one canonical order.
+        self.dependencies = {agent["name"]: [dep for dep in self.order if dep in agent["depends_on"]]
+                             for agent in self.agents}
+        self.stages = compute_stages(self.dependencies)
+        self.system_messages = {agent["name"]: agent["system_message"] for agent in self.agents}
+        self.emojis = {agent["name"]: agent["emoji"] for agent in self.agents}
+        self.colors = {agent["name"]: agent["color"] for agent in self.agents}
+
+        termination = spec.get("termination", {})
+        unknown = set(termination) - set(TERMINATION_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown termination option(s): {', '.join(sorted(unknown))}. "
+                             f"Choose from {', '.join(TERMINATION_OPTIONS)}.")
+        for option, value in termination.items():
+            flag = option in ("require_approval", "enabled")
+            if isinstance(value, bool) != flag or not isinstance(value, (int, float)):
+                raise ValueError(f"Termination option '{option}' must be {'true or false' if flag else 'a number'}.")
+        self.termination: Dict[str, Any] = dict(termination)
+
+        self.routes = {agent["name"]: agent["route"] for agent in self.agents if agent["route"] is not None}
+        models = spec.get("models")
+        if isinstance(models, str):
+            with open(os.path.join(base_dir, models), encoding='utf-8') as f:
+                models = json.load(f)
+        if models is not None and not isinstance(models, dict):
+            raise ValueError("'models' must be a routing config object or the path of a JSON file.")
+        self.models: Optional[Dict] = models
+
+        canonical = json.dumps({"name": self.name, "agents": self.agents, "termination": self.termination},
+                               ensure_ascii=False, sort_keys=True)
+        self.fingerprint = hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:12]
+
+    def emoji(self, agent: str) -> str:
+        """Returns the emoji of one of this plan's agents (or of the user)."""
+        return self.emojis.get(agent) or AGENT_EMOJIS.get(agent, "🔹")
+
+    def color(self, agent: str) -> str:
+        """Returns the rich color of one of this plan's agents (or of the user)."""
+        return self.colors.get(agent) or AGENT_COLORS.get(agent, "white")
+
+    def router_config(self, models: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Returns the model routing config for this plan: the given config (or the spec's own "models") with
+        the agents' "route" entries added, or None when neither a config nor routes exist.
+
+        Args:
+            models (Dict, optional): A routing config (see model_router.ModelRouter), e.g. from --models.
+        """
+        models = models if models is not None else self.models
+        if models is None:
+            if self.routes:
+                raise ValueError(f"Pipeline '{self.name}' routes agents to providers but no model config is "
+                                 "given (use --models or the spec's \"models\").")
+            return None
+        config = copy.deepcopy(models)
+        config.setdefault("routes", {}).update(copy.deepcopy(self.routes))
+        return config
+
+    def describe(self) -> Dict[str, Any]:
+        """Returns the plan's name, fingerprint, agent count and stages, e.g. for run summaries."""
+        return {"name": self.name, "fingerprint": self.fingerprint, "agents": len(self.order), "stages": self.stages}
+
+
+_PLANS: Dict[Tuple[str, int], ExecutionPlan] = {}
+
+
+def load_plan(path: Optional[str] = None) -> ExecutionPlan:
+    """
+    Loads and compiles a pipeline spec, once per file version; later calls return the cached plan.
+
+    Args:
+        path (str, optional): A .json, .yaml or .yml spec (YAML requires PyYAML). None loads the built-in pipeline.
+
+    Returns:
+        ExecutionPlan: The compiled plan.
+    """
+    if path is None:
+        key = ("<default>", 0)
+        if key not in _PLANS:
+            _PLANS[key] = ExecutionPlan(copy.deepcopy(DEFAULT_PIPELINE))
+        return _PLANS[key]
+
+    path = os.path.abspath(path)
+    try:
+        key = (path, os.stat(path).st_mtime_ns)
+    except OSError as e:
+        raise ValueError(f"Cannot read pipeline spec {path}: {e}")
+    if key not in _PLANS:
+        with open(path, encoding='utf-8') as f:
+            if path.endswith((".yaml", ".yml")):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ValueError("YAML pipeline specs require PyYAML (pip install pyyaml); use a .json file instead.")
+                spec = yaml.safe_load(f)
+            else:
+                spec = json.load(f)
+        _PLANS[key] = ExecutionPlan(spec, base_dir=os.path.dirname(path))
+    return _PLANS[key]
@@ -1,9 +1,27 @@
 # pretty_printer.py
 
-from rich.console import Console
+import contextvars
+import json
+import queue
+import sys
+import threading
+import time
+import traceback
+from rich.console import Console, Group
+from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
-from typing import List, Dict
+from typing import Any, Callable, List, Dict, Optional, TextIO
+
+from pipeline_spec import ExecutionPlan, load_plan
+
+# The run the current task is executing. One printer serves every concurrent run of a system, so the run id
+# travels with the task (and with calls queued by ThreadedPrinter) instead of being stored on the printer.
+# 현재 태스크가 실행 중인 실행 ID로, 하나의 프린터를 여러 동시 실행이 공유하므로 프린터가 아닌 태스크 컨텍스트에 저장합니다.
+current_run_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_run_id", default=None)
+# The pipeline of that run, whose agents' emojis and colors the printer uses; runs sharing a printer may
+# follow different pipelines. 현재 실행의 파이프라인 계획으로, 프린터는 이 계획의 에이전트 이모지와 색상을 사용합니다.
+current_plan: contextvars.ContextVar[Optional[ExecutionPlan]] = contextvars.ContextVar("current_plan", default=None)
 
 class PrettyPrinter:
     """
@@ -12,43 +30,42 @@ class PrettyPrinter:
     """
 
     def __init__(self):
-        """Initializes the Rich Console and sets up colors and emojis for agents."""
+        """Initializes the Rich Console. The agents' colors and emojis come from the plan of each run."""
         self.console = Console()
-        self.agent_colors = {
-            'domain_classifier': 'cyan',
-            'senior_researcher': 'green',
-            'prompt_engineer': 'yellow',
-            'ai_specialist': 'magenta',
-            'research_trend_analyst': 'blue',
-            'feasibility_evaluator': 'red',
-            'improvement_strategist': 'orange3',
-            'topic_recommender': 'purple',
-            'advisor_professor': 'bright_blue',
-            'final_resource_engineer': 'bright_green',
-            'user': 'white'
-        }
-        self.agent_emojis = {
-            'domain_classifier': '🔍',
-            'senior_researcher': '👨‍🏫',
-            'prompt_engineer': '✏️',
-            'ai_specialist': '🤖',
-            'research_trend_analyst': '📚',
-            'feasibility_evaluator': '⚖️',
-            'improvement_strategist': '🔧',
-            'topic_recommender': '🎯',
-            'advisor_professor': '👨‍🏫',
-            'final_resource_engineer': '🛠️',
-            'user': '👤'
-        }
-
-    def print_header(self):
-        """Prints the system's starting header."""
-        header_text = """
+        # Live token streams of the agents currently answering, rendered in one rich Live region.
+        self._live = None
+        self._streams: Dict[str, str] = {}
+
+    @staticmethod
+    def _plan() -> ExecutionPlan:
+        """Returns the plan of the run being printed, or the built-in plan outside a run."""
+        return current_plan.get() or load_plan()
+
+    def print_header(self, agent_count: int = 10):
+        """
+        Prints the system's starting header.
+
+        Args:
+            agent_count (int): The number of agents in the run's pipeline.
+        """
+        header_text = f"""
         🚀 Jarvis Research System
-        Analysis based on 10 expert agents
+        Analysis based on {agent_count} expert agents
         """
         self.console.print(Panel(header_text, style="bold blue", title="🎯 System Start"))
 
+    def print_run_info(self, run_id: str, restored_messages: int = 0):
+        """
+        Prints the run id (needed to resume the run) and how many messages were restored from a checkpoint.
+        
+        Args:
+            run_id (str): The identifier of the run.
+            restored_messages (int): The number of messages restored from the checkpoint.
+        """
+        self.console.print(f"🆔 Run ID: [bold]{run_id}[/bold] (resume with: python main.py --resume {run_id})")
+        if restored_messages:
+            self.console.print(f"♻️ Restored {restored_messages} messages from the checkpoint.", style="bold cyan")
+
     def print_agent_response(self, step: int, agent: str, content: str):
         """
         Prints the response of an agent in a formatted panel.
@@ -58,8 +75,10 @@ class PrettyPrinter:
             agent (str): The name of the agent providing the response.
             content (str): The content of the response.
         """
-        emoji = self.agent_emojis.get(agent, '🔹')
-        color = self.agent_colors.get(agent, 'white')
+        self._finish_agent_stream(agent)
+
+        plan = self._plan()
+        emoji, color = plan.emoji(agent), plan.color(agent)
         agent_name = agent.replace('_', ' ').title()
         
         title = f"{emoji} Step {step}: {agent_name}"
@@ -79,6 +98,52 @@ class PrettyPrinter:
         ))
         self.console.print()  # Add a blank line for spacing
 
+    def _render_streams(self) -> Group:
+        """Builds one live panel per agent that is currently streaming, showing the tail of its output."""
+        panels = []
+        plan = self._plan()
+        for agent, text in self._streams.items():
+            emoji, color = plan.emoji(agent), plan.color(agent)
+            tail = text if len(text) <= 500 else "…" + text[-500:]
+            panels.append(Panel(
+                tail,
+                title=f"{emoji} {agent.replace('_', ' ').title()} (streaming…)",
+                border_style=color,
+                padding=(1, 2)
+            ))
+        return Group(*panels)
+
+    def print_agent_stream_chunk(self, agent: str, text: str):
+        """
+        Appends streamed model output to the agent's live panel, starting the live display if needed.
+        
+        Args:
+            agent (str): The name of the agent that is answering.
+            text (str): The newly received text.
+        """
+        self._streams[agent] = self._streams.get(agent, '') + text
+        if self._live is None:
+            self._live = Live(self._render_streams(), console=self.console, refresh_per_second=12, transient=True)
+            self._live.start()
+        else:
+            self._live.update(self._render_streams())
+
+    def _finish_agent_stream(self, agent: str):
+        """Removes the agent's live panel; the live display stops when no agent is streaming."""
+        if self._streams.pop(agent, None) is None or self._live is None:
+            return
+        if self._streams:
+            self._live.update(self._render_streams())
+        else:
+            self.stop_streams()
+
+    def stop_streams(self):
+        """Stops the live display and discards any unfinished streams (e.g. after an error)."""
+        self._streams.clear()
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+
     def print_progress(self, current: int, total: int):
         """
         Prints the progress of the research process.
@@ -90,22 +155,64 @@ class PrettyPrinter:
         progress_text = f"Progress: {current}/{total} ({current/total*100:.1f}%)"
         self.console.print(f"⏳ {progress_text}", style="bold yellow")
 
-    def print_completion(self, total_messages: int):
+    def print_warning(self, message: str):
+        """
+        Prints a warning line.
+        
+        Args:
+            message (str): The warning text.
+        """
+        self.console.print(f"⚠️ {message}", style="bold yellow")
+
+    def print_error(self, message: str):
+        """
+        Prints an error line.
+        
+        Args:
+            message (str): The error text.
+        """
+        self.console.print(f"❌ {message}", style="bold red")
+
+    def print_completion(self, total_messages: int, agent_count: int = 10):
         """
         Prints a completion message when the process is finished.
         
         Args:
             total_messages (int): The total number of messages processed.
+            agent_count (int): The number of agents in the run's pipeline.
         """
         completion_text = f"""
         ✅ Research analysis process complete!
 
         📊 Total analysis steps processed: {total_messages}
-        🎯 Analysis by 10 expert agents is complete
+        🎯 Analysis by {agent_count} expert agents is complete
         📁 Saving results and generating reports...
         """
         self.console.print(Panel(completion_text, style="bold green", title="🎉 Analysis Complete"))
 
+    def print_research_record(self, record):
+        """
+        Prints the structured results parsed from the agents' replies.
+        
+        Args:
+            record (ResearchRecord): The parsed record of the run.
+        """
+        table = Table(title="🧾 Structured Results", show_header=True, header_style="bold magenta")
+        table.add_column("Field", style="cyan")
+        table.add_column("Value", style="white")
+        domain = record.domain.value if record.domain is not None else f"unmapped ({record.domain_label or '-'})"
+        confidence = f"{record.domain_confidence*100:.0f}%" if record.domain_confidence is not None else "-"
+        table.add_row("Domain", f"{domain}, confidence {confidence}")
+        table.add_row("Feasibility", f"technical {record.technical_score or '-'}/10, viability "
+                      f"{record.viability_score or '-'}/10, {record.feasibility_verdict or '-'}")
+        table.add_row("Verdict", record.verdict or "-")
+        for index, topic in enumerate(record.topics, 1):
+            table.add_row(f"Topic {index}", f"{topic.title} (innovation {topic.innovation or '-'}, "
+                          f"feasibility {topic.feasibility or '-'})")
+        for error in record.parse_errors:
+            table.add_row("[yellow]Unparsed[/yellow]", error)
+        self.console.print(table)
+
     def print_file_info(self, saved_files: dict, html_url: str):
         """
         Prints the information about the saved result files in a table.
@@ -122,35 +229,418 @@ class PrettyPrinter:
         table.add_row("📄 JSON", saved_files.get('json_file', 'N/A'), "Raw Data")
         table.add_row("📝 Markdown", saved_files.get('markdown_file', 'N/A'), "Text Report")
         table.add_row("🌐 HTML", saved_files.get('html_file', 'N/A'), "Web Report")
+        if saved_files.get('trace_file'):
+            table.add_row("⏱️ Trace", saved_files['trace_file'], "Chrome/Perfetto Trace")
 
         self.console.print(table)
         self.console.print(f"\n🔗 [bold blue]Web Report URL:[/bold blue] {html_url}")
 
-    def print_summary_table(self, messages: List[Dict]):
+    def print_summary_table(self, messages: List[Dict], turns: Optional[List[Dict]] = None):
         """
         Prints a summary of the analysis from each agent in a table.
         
         Args:
             messages (List[Dict]): A list of message dictionaries from the agents.
+            turns (List[Dict], optional): Per-call metrics recorded by RunInstrumentation. When given,
+                each agent message is matched with its model call (in order, per agent) and the table
+                shows its latency, time to first token, tokens, provider-cached prompt tokens and retries.
         """
         table = Table(title="📊 Agent Analysis Summary", show_header=True, header_style="bold magenta")
         table.add_column("Step", style="cyan", width=8)
         table.add_column("Agent", style="green", width=25)
-        table.add_column("Key Result", style="yellow")
+        table.add_column("Key Result", style="yellow", min_width=20)
+        if turns is not None:
+            table.add_column("Time (s)", style="cyan", justify="right")
+            table.add_column("TTFT (s)", style="cyan", justify="right")
+            table.add_column("Tokens in/out", style="magenta", justify="right")
+            table.add_column("Prompt cache", style="magenta", justify="right")
+            table.add_column("Retries", style="red", justify="right")
+
+        pending_turns: Dict[str, List[Dict]] = {}
+        for turn in turns or []:
+            if not turn.get('error'):
+                pending_turns.setdefault(turn['agent'], []).append(turn)
 
         for i, msg in enumerate(messages):
             agent = msg.get('agent', 'unknown')
-            content = msg.get('content', '')
+            # Spilled messages (checkpoint.MessageRecord) carry their first line, so their body stays on disk
+            content = getattr(msg, 'summary', None) or msg.get('content', '')
 
             # Extract the first line or a key part of the content
             main_result = content.split('\n')[0] if content else "Analysis complete"
             if len(main_result) > 60:
                 main_result = main_result[:60] + "..."
 
-            emoji = self.agent_emojis.get(agent, '🔹')
-            agent_name = f"{emoji} {agent.replace('_', ' ').title()}"
+            agent_name = f"{self._plan().emoji(agent)} {agent.replace('_', ' ').title()}"
+
+            row = [f"{i+1}", agent_name, main_result]
+            if turns is not None:
+                agent_turns = pending_turns.get(agent)
+                turn = agent_turns.pop(0) if agent_turns else None
+                if turn is None:
+                    row += ["-", "-", "-", "-", "-"]
+                else:
+                    cached = " (cached)" if turn['cached'] else ""
+                    row += [
+                        f"{turn['duration']:.2f}",
+                        f"{turn['ttft']:.2f}",
+                        f"{turn['prompt_tokens']}/{turn['completion_tokens']}{cached}",
+                        f"{turn['cached_tokens']}",
+                        f"{turn['retries']}"
+                    ]
+            table.add_row(*row)
+        
+        self.console.print(table)
+
+    def print_usage_summary(self, usage: Dict, total_duration: float):
+        """
+        Prints the run's total token usage, estimated cost and retries.
+        
+        Args:
+            usage (Dict): The dictionary returned by RunInstrumentation.summary().
+            total_duration (float): The end-to-end wall-clock time of the run in seconds.
+        """
+        pipeline = f"{usage['pipeline']} pipeline: " if usage.get('pipeline') else ""
+        self.console.print(
+            f"🧮 {pipeline}{usage['calls']} model calls ({usage['cached_calls']} cached), "
+            f"{usage['prompt_tokens']} prompt ({usage['cached_prompt_tokens']} from the provider's prompt cache) "
+            f"+ {usage['completion_tokens']} completion tokens, "
+            f"~${usage['cost']:.4f}, {usage['retries']} retries, "
+            f"{usage['model_seconds']:.1f}s model time in {total_duration:.1f}s wall-clock",
+            style="bold cyan"
+        )
+
+    def print_context_savings(self, policy: str, savings: Dict):
+        """
+        Prints how many prompt tokens the context policy saved.
+        
+        Args:
+            policy (str): The context policy in use.
+            savings (Dict): The dictionary returned by ContextSavings.summary().
+        """
+        self.console.print(
+            f"✂️ Context policy '{policy}': ~{savings['sent_tokens']} of ~{savings['full_tokens']} history tokens sent "
+            f"({savings['saved_ratio']*100:.0f}% saved)",
+            style="bold cyan"
+        )
+
+    def print_gate_decisions(self, decisions: List[Dict]):
+        """
+        Prints the early-exit, revision and skip decisions of the gating policy.
+        
+        Args:
+            decisions (List[Dict]): The decisions with their 'agent', 'action', 'reason' and 'target'.
+        """
+        labels = {"stop": "⛔ Ended the run", "loop": "🔁 Looped back to", "skip": "⏭️ Skipped"}
+        for decision in decisions:
+            target = f" {decision['target']}" if decision['target'] else ""
+            self.console.print(
+                f"{labels.get(decision['action'], decision['action'])}{target} after {decision['agent']}: "
+                f"{decision['reason']}",
+                style="bold yellow"
+            )
+
+    def print_stage_timings(self, timings: List[Dict], total_duration: float):
+        """
+        Prints how long each agent stage took and when it ran relative to the start of the run.
+        
+        Args:
+            timings (List[Dict]): Per-stage timing dictionaries with 'agent', 'started', 'finished' and 'duration'.
+            total_duration (float): The end-to-end wall-clock time of the run in seconds.
+        """
+        table = Table(title="⏱️ Stage Timings", show_header=True, header_style="bold magenta")
+        table.add_column("Agent", style="green", width=25)
+        table.add_column("Start (s)", style="cyan", justify="right")
+        table.add_column("End (s)", style="cyan", justify="right")
+        table.add_column("Duration (s)", style="yellow", justify="right")
+
+        for timing in timings:
+            agent = timing.get('agent', 'unknown')
+            table.add_row(
+                f"{self._plan().emoji(agent)} {agent.replace('_', ' ').title()}",
+                f"{timing['started']:.2f}",
+                f"{timing['finished']:.2f}",
+                f"{timing['duration']:.2f}"
+            )
+
+        serial_duration = sum(timing['duration'] for timing in timings)
+        self.console.print(table)
+        self.console.print(
+            f"⏱️ Wall-clock: {total_duration:.2f}s (sum of stage durations: {serial_duration:.2f}s)",
+            style="bold cyan"
+        )
+
+    def print_cache_stats(self, stats: Dict):
+        """
+        Prints the response cache counters.
+        
+        Args:
+            stats (Dict): The dictionary returned by ResponseCache.stats().
+        """
+        self.console.print(
+            f"🗄️ Response cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['hit_rate']*100:.0f}% hit rate), {stats['entries']} entries, {stats['bytes']/1024:.0f} KiB",
+            style="bold cyan"
+        )
+
+    def print_rate_limiter_metrics(self, metrics: Dict):
+        """
+        Prints the rate limiter's throttling metrics.
+        
+        Args:
+            metrics (Dict): The dictionary returned by RateLimiter.metrics().
+        """
+        rpm = f"{metrics['current_rpm']:.0f}" if metrics['current_rpm'] else "unlimited"
+        self.console.print(
+            f"🚦 Rate limiter: {metrics['requests']} requests, {metrics['throttled']} throttled (429), "
+            f"{metrics['retries']} retries, {metrics['wait_seconds']:.1f}s queued, current limit {rpm} RPM",
+            style="bold cyan"
+        )
 
-            table.add_row(f"{i+1}", agent_name, main_result)
+    def print_router_metrics(self, metrics: Dict):
+        """
+        Prints which providers served the routed model calls and how fast.
         
+        Args:
+            metrics (Dict): The dictionary returned by ModelRouter.metrics().
+        """
+        table = Table(title="🧭 Model Routing", show_header=True, header_style="bold magenta")
+        table.add_column("Provider", style="green")
+        table.add_column("Model", style="cyan")
+        table.add_column("Requests", justify="right")
+        table.add_column("Wins", justify="right")
+        table.add_column("Failures", style="red", justify="right")
+        table.add_column("Hedges", justify="right")
+        table.add_column("p50 (s)", style="yellow", justify="right")
+        table.add_column("p95 (s)", style="yellow", justify="right")
+
+        for name, provider in metrics['providers'].items():
+            table.add_row(
+                name, provider['model'], str(provider['requests']), str(provider['wins']),
+                f"{provider['failures']} ({provider['timeouts']} timeouts)", str(provider['hedges']),
+                f"{provider['p50']:.2f}" if provider['p50'] is not None else "-",
+                f"{provider['p95']:.2f}" if provider['p95'] is not None else "-"
+            )
         self.console.print(table)
+        self.console.print(
+            f"🧭 {metrics['calls']} routed calls: {metrics['fallback_calls']} served by a fallback, "
+            f"{metrics['hedged_calls']} hedged, {metrics['failed_calls']} failed on every provider",
+            style="bold cyan"
+        )
+
+    def print_topic_fanout(self, stats: Dict):
+        """
+        Prints how the topic candidates were generated and scored.
+        
+        Args:
+            stats (Dict): The last_stats of the TopicFanOutAgent.
+        """
+        self.console.print(
+            f"🧪 Topic fan-out: {stats['candidates']} candidates from {stats['candidate_calls']} calls "
+            f"({stats['failed_candidate_calls']} failed) in {stats['generation_seconds']:.2f}s, "
+            f"{stats['scored']} scored in {stats['scoring_seconds']:.2f}s, kept the top {stats['kept']}",
+            style="bold cyan"
+        )
+
+    def flush(self):
+        """Waits until everything printed so far has reached the output."""
+        pass
+
+
+class QuietPrinter(PrettyPrinter):
+    """
+    A printer that renders nothing, for batch runs where per-run panels and tables would go unread.
+    패널과 표를 출력하지 않는 프린터로, 출력을 읽지 않는 배치 실행에 사용됩니다.
+    """
+
+    def print_header(self, agent_count: int = 10):
+        pass
+
+    def print_run_info(self, run_id: str, restored_messages: int = 0):
+        pass
+
+    def print_agent_response(self, step: int, agent: str, content: str):
+        pass
+
+    def print_agent_stream_chunk(self, agent: str, text: str):
+        pass
+
+    def print_progress(self, current: int, total: int):
+        pass
+
+    def print_warning(self, message: str):
+        pass
+
+    def print_error(self, message: str):
+        pass
+
+    def print_completion(self, total_messages: int, agent_count: int = 10):
+        pass
+
+    def print_research_record(self, record):
+        pass
+
+    def print_file_info(self, saved_files: dict, html_url: str):
+        pass
+
+    def print_summary_table(self, messages: List[Dict], turns: Optional[List[Dict]] = None):
+        pass
+
+    def print_usage_summary(self, usage: Dict, total_duration: float):
+        pass
+
+    def print_context_savings(self, policy: str, savings: Dict):
+        pass
+
+    def print_gate_decisions(self, decisions: List[Dict]):
+        pass
+
+    def print_stage_timings(self, timings: List[Dict], total_duration: float):
+        pass
+
+    def print_cache_stats(self, stats: Dict):
+        pass
+
+    def print_rate_limiter_metrics(self, metrics: Dict):
+        pass
+
+    def print_router_metrics(self, metrics: Dict):
+        pass
+
+    def print_topic_fanout(self, stats: Dict):
+        pass
+
+
+class JsonLinesPrinter(QuietPrinter):
+    """
+    A printer that writes one compact JSON object per event instead of panels and tables, for CI logs and
+    other non-interactive output. Agent replies are summarized by their first line; the full text is in
+    the saved reports.
+    패널과 표 대신 이벤트마다 한 줄짜리 JSON 객체를 출력하는 프린터로, CI 로그 등 비대화형 출력에 사용됩니다.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        Args:
+            stream (TextIO, optional): Where the lines are written (default: standard output).
+        """
+        super().__init__()
+        self.stream = stream or sys.stdout
+
+    def _emit(self, event: str, **fields: Any):
+        line = {"ts": round(time.time(), 3), "event": event, "run_id": current_run_id.get(), **fields}
+        self.stream.write(json.dumps(line, ensure_ascii=False, default=str) + "\n")
+        self.stream.flush()
+
+    def print_run_info(self, run_id: str, restored_messages: int = 0):
+        current_run_id.set(run_id)
+        self._emit("run_start", restored_messages=restored_messages)
+
+    def print_agent_response(self, step: int, agent: str, content: str):
+        self._emit("message", step=step, agent=agent, chars=len(content), summary=content.split("\n", 1)[0][:120])
+
+    def print_warning(self, message: str):
+        self._emit("warning", message=message)
+
+    def print_error(self, message: str):
+        self._emit("error", message=message)
+
+    def print_completion(self, total_messages: int, agent_count: int = 10):
+        self._emit("complete", total_messages=total_messages, agents=agent_count)
+
+    def print_research_record(self, record):
+        self._emit("record", domain=record.domain.value if record.domain is not None else record.domain_label,
+                   domain_confidence=record.domain_confidence, feasibility_verdict=record.feasibility_verdict,
+                   verdict=record.verdict, topics=len(record.topics))
+
+    def print_gate_decisions(self, decisions: List[Dict]):
+        for decision in decisions:
+            self._emit("gate", **decision)
+
+    def print_usage_summary(self, usage: Dict, total_duration: float):
+        self._emit("usage", wall_clock=round(total_duration, 3), **usage)
+
+    def print_context_savings(self, policy: str, savings: Dict):
+        self._emit("context", policy=policy, **savings)
+
+    def print_cache_stats(self, stats: Dict):
+        self._emit("cache", **stats)
+
+    def print_rate_limiter_metrics(self, metrics: Dict):
+        self._emit("rate_limiter", **metrics)
+
+    def print_router_metrics(self, metrics: Dict):
+        self._emit("router", **metrics)
+
+    def print_topic_fanout(self, stats: Dict):
+        self._emit("topic_fanout", **stats)
 
+    def print_file_info(self, saved_files: dict, html_url: str):
+        self._emit("files", **saved_files)
+
+
+class ThreadedPrinter:
+    """
+    Runs another printer's rendering on a background thread, in call order, so that building rich panels
+    and tables never holds up the event loop that receives the agents' messages. Every print_* call and
+    stop_streams is queued and returns at once; flush() waits until the queue is drained.
+    다른 프린터의 렌더링을 백그라운드 스레드에서 호출 순서대로 실행하여, rich 패널과 표 생성이 에이전트 메시지를 받는 이벤트 루프를 지연시키지 않도록 합니다.
+    """
+
+    def __init__(self, inner: PrettyPrinter):
+        """
+        Args:
+            inner (PrettyPrinter): The printer doing the actual rendering.
+        """
+        self.inner = inner
+        self._queue: "queue.Queue[Callable[[], None]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._render, name="printer", daemon=True)
+        self._thread.start()
+
+    def _render(self):
+        while True:
+            call = self._queue.get()
+            try:
+                call()
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self._queue.task_done()
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.inner, name)
+        if not (name.startswith("print_") or name == "stop_streams"):
+            return attribute
+
+        def enqueue(*args, **kwargs):
+            # Render in the caller's context, so context variables such as current_run_id carry over.
+            context = contextvars.copy_context()
+            self._queue.put(lambda: context.run(attribute, *args, **kwargs))
+        return enqueue
+
+    def flush(self):
+        """Waits until every queued call has been rendered."""
+        self._queue.join()
+        self.inner.flush()
+
+
+def create_printer(output: str = "auto") -> PrettyPrinter:
+    """
+    Creates the printer for an output kind.
+
+    Args:
+        output (str): "rich" (panels and tables, rendered on a background thread), "jsonl" (one JSON line
+            per event), "null" (nothing), or "auto": rich when standard output is a terminal, otherwise jsonl.
+
+    Returns:
+        PrettyPrinter: The printer.
+    """
+    if output == "auto":
+        output = "rich" if sys.stdout.isatty() else "jsonl"
+    if output == "rich":
+        return ThreadedPrinter(PrettyPrinter())
+    if output == "jsonl":
+        return JsonLinesPrinter()
+    if output == "null":
+        return QuietPrinter()
+    raise ValueError(f"Unknown output '{output}'; use auto, rich, jsonl or null.")
@@ -0,0 +1,98 @@
+# prompt_layout.py
+
+import warnings
+from typing import Any, AsyncGenerator, List, Sequence, Union
+
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage, SystemMessage, UserMessage
+from autogen_ext.models.openai import OpenAIChatCompletionClient
+
+from model_clients import ModelClientWrapper, current_call_stats
+
+PROMPT_LAYOUTS = ("shared_prefix", "classic")
+
+# Sent first by every agent, byte for byte, so the provider can serve the system message, the task and the
+# earlier agents' outputs that follow it from its prompt cache. The agent's own instructions come last.
+# 모든 에이전트가 바이트 단위로 동일하게 가장 먼저 보내는 시스템 메시지로, 제공자의 프롬프트 캐시가 공통 접두사를 재사용할 수 있게 합니다.
+SHARED_SYSTEM_MESSAGE = (
+    "You are one of the expert agents of a research system that analyses a research idea step by step. "
+    "The conversation holds the research idea and the analyses of the experts who spoke before you. "
+    "The last message gives your own role and response format; follow it exactly."
+)
+INSTRUCTIONS_HEADER = "Your instructions for this turn:\n\n"
+
+
+class SharedPrefixChatCompletionClient(ModelClientWrapper):
+    """
+    Reorders each request so that its stable part comes first and its volatile part last: the agent's system
+    message is replaced with SHARED_SYSTEM_MESSAGE and moved behind the transcript as a final user message.
+    Requests of different agents about the same idea then start with the same bytes, which providers with
+    automatic prompt caching bill at a discount.
+    각 요청에서 변하지 않는 부분을 앞에, 에이전트별 지시를 맨 뒤에 두어 에이전트 간에 동일한 접두사를 공유하게 하는 클라이언트입니다.
+    """
+
+    @staticmethod
+    def reorder(messages: Sequence[LLMMessage]) -> List[LLMMessage]:
+        """Returns the messages in the shared-prefix layout; requests without a leading system message are kept."""
+        if not messages or not isinstance(messages[0], SystemMessage):
+            return list(messages)
+        instructions = UserMessage(content=INSTRUCTIONS_HEADER + messages[0].content, source="instructions")
+        return [SystemMessage(content=SHARED_SYSTEM_MESSAGE), *messages[1:], instructions]
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        return await self.inner.create(self.reorder(messages), **kwargs)
+
+    def create_stream(self, messages: Sequence[LLMMessage], **kwargs: Any) -> AsyncGenerator[Union[str, CreateResult], None]:
+        return self.inner.create_stream(self.reorder(messages), **kwargs)
+
+
+def apply_prompt_layout(client: ChatCompletionClient, layout: str) -> ChatCompletionClient:
+    """
+    Wraps an agent's model client for the given prompt layout.
+
+    Args:
+        client (ChatCompletionClient): The agent's model client.
+        layout (str): "shared_prefix" (stable prefix first, agent instructions last) or "classic"
+            (the agent's system message first, as autogen sends it).
+
+    Returns:
+        ChatCompletionClient: The client to give the agent.
+    """
+    if layout not in PROMPT_LAYOUTS:
+        raise ValueError(f"Unknown prompt layout: {layout}. Choose from {', '.join(PROMPT_LAYOUTS)}.")
+    return SharedPrefixChatCompletionClient(client) if layout == "shared_prefix" else client
+
+
+def record_cached_tokens(client: OpenAIChatCompletionClient) -> OpenAIChatCompletionClient:
+    """
+    Makes an OpenAI model client store the provider's cached prompt token count of every response in the
+    per-call statistics, where the instrumentation picks it up unless the CreateResult's usage reports the
+    count itself (see model_clients.usage_cached_tokens). The hook wraps the SDK completions call of this client only,
+    leaving autogen's loggers untouched. It relies on the client's private SDK client; if a later autogen
+    version hides it, a warning is issued and the client is returned unchanged.
+
+    Streamed calls are not covered: the SDK returns a stream rather than a response, and autogen does not
+    pass the final chunk's prompt_tokens_details on, so streamed turns report 0 cached tokens.
+
+    Args:
+        client (OpenAIChatCompletionClient): The client whose SDK calls are observed.
+
+    Returns:
+        OpenAIChatCompletionClient: The same client.
+    """
+    completions = getattr(getattr(getattr(client, "_client", None), "chat", None), "completions", None)
+    if completions is None or not callable(getattr(completions, "create", None)):
+        warnings.warn("This autogen-ext version does not expose the OpenAI SDK client; "
+                      "cached prompt tokens will only be reported where the usage carries them.")
+        return client
+    create = completions.create
+
+    async def create_and_record(*args: Any, **kwargs: Any):
+        response = await create(*args, **kwargs)
+        stats = current_call_stats.get()
+        details = getattr(getattr(response, "usage", None), "prompt_tokens_details", None)
+        if stats is not None and details is not None:
+            stats["cached_tokens"] = details.cached_tokens or 0
+        return response
+
+    completions.create = create_and_record
+    return client
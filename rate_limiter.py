@@ -0,0 +1,271 @@
+# rate_limiter.py
+
+import asyncio
+import random
+import time
+from typing import Any, AsyncGenerator, Dict, Optional, Sequence, Union
+
+import openai
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+
+from model_clients import ModelClientWrapper, current_call_stats, estimate_tokens
+
+# HTTP statuses worth retrying: rate limiting and transient server errors.
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    An asyncio token bucket refilled continuously at a per-minute rate.
+    분당 속도로 연속 충전되는 asyncio 토큰 버킷입니다.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            per_minute (float): The refill rate in tokens per minute.
+            capacity (float, optional): The burst size. Defaults to one minute's worth of tokens.
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Waits until the requested amount is available and takes it. Callers are served in arrival order.
+
+        Args:
+            amount (float): The number of tokens to take. Amounts above the capacity are capped to it.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def debit(self, amount: float):
+        """Takes tokens without waiting, letting the balance go negative (used to settle actual usage)."""
+        self._refill()
+        self.tokens -= amount
+
+    def set_rate(self, per_minute: float):
+        """Changes the refill rate, keeping the current balance."""
+        self._refill()
+        self.rate = per_minute / 60.0
+
+
+class RateLimiter:
+    """
+    Client-side scheduler for a rate-limited endpoint: token buckets for requests and tokens per minute,
+    an adaptive request rate that backs off on 429s, and retries with exponential backoff and jitter.
+    분당 요청/토큰 버킷, 429 응답 시 감소하는 적응형 요청 속도, 지터가 포함된 지수 백오프 재시도를 제공하는 스케줄러입니다.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0,
+                 min_requests_per_minute: float = 1.0):
+        """
+        Args:
+            requests_per_minute (float, optional): The request budget. None means unlimited.
+            tokens_per_minute (float, optional): The prompt + completion token budget. None means unlimited.
+            max_retries (int): How many times one model call is retried before the error is raised.
+            base_delay (float): The first backoff delay in seconds; it doubles with every attempt.
+            max_delay (float): The upper bound of a single backoff delay in seconds.
+            min_requests_per_minute (float): The floor of the adaptive request rate.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.min_requests_per_minute = min_requests_per_minute
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.current_rpm = requests_per_minute
+        self._paused_until = 0.0
+
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.failures = 0
+        self.wait_seconds = 0.0
+
+    @staticmethod
+    def is_retryable(error: BaseException) -> bool:
+        """Returns True for rate limiting, timeouts, connection errors and transient server errors."""
+        if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, asyncio.TimeoutError)):
+            return True
+        return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+    def backoff_delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Computes the delay before a retry: the server's Retry-After if it sent one, otherwise
+        exponential backoff with full jitter.
+
+        Args:
+            attempt (int): The retry number, starting at 0.
+            error (BaseException, optional): The error that triggered the retry.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_delay)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def acquire(self, estimated_tokens: int):
+        """Waits for a global pause to end and for request and token budget to be available."""
+        self.queue_depth += 1
+        start = time.monotonic()
+        try:
+            while (pause := self._paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(pause)
+            if self.request_bucket is not None:
+                await self.request_bucket.acquire(1)
+            if self.token_bucket is not None:
+                await self.token_bucket.acquire(estimated_tokens)
+        finally:
+            self.queue_depth -= 1
+            self.wait_seconds += time.monotonic() - start
+
+    def settle(self, estimated_tokens: int, result: CreateResult):
+        """Charges the token bucket for the difference between the estimate and the reported usage."""
+        if self.token_bucket is not None and result.usage is not None:
+            actual = result.usage.prompt_tokens + result.usage.completion_tokens
+            self.token_bucket.debit(actual - min(estimated_tokens, self.token_bucket.capacity))
+
+    def on_success(self):
+        """Additively raises the adaptive request rate back towards the configured limit."""
+        if self.request_bucket is not None and self.current_rpm < self.requests_per_minute:
+            self.current_rpm = min(self.requests_per_minute, self.current_rpm + 1)
+            self.request_bucket.set_rate(self.current_rpm)
+
+    def on_throttled(self, delay: float):
+        """Halves the adaptive request rate and pauses every caller for the backoff delay."""
+        self.throttled += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        if self.request_bucket is not None:
+            self.current_rpm = max(self.min_requests_per_minute, self.current_rpm / 2)
+            self.request_bucket.set_rate(self.current_rpm)
+
+    def record_retry(self):
+        """Counts a retry, both globally and for the model call in progress."""
+        self.retries += 1
+        stats = current_call_stats.get()
+        if stats is not None:
+            stats["retries"] = stats.get("retries", 0) + 1
+
+    def metrics(self) -> Dict:
+        """
+        Returns the scheduler's queue and throttling metrics.
+
+        Returns:
+            Dict: queue_depth, in_flight, requests, throttled, retries, failures, wait_seconds and current_rpm.
+        """
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "failures": self.failures,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "current_rpm": self.current_rpm,
+        }
+
+
+class RateLimitedChatCompletionClient(ModelClientWrapper):
+    """
+    A model client that schedules every call through a RateLimiter and retries only the failed call.
+    모든 호출을 RateLimiter를 통해 예약하고 실패한 호출만 재시도하는 모델 클라이언트입니다.
+    """
+
+    def __init__(self, inner: ChatCompletionClient, limiter: RateLimiter):
+        """
+        Args:
+            inner (ChatCompletionClient): The model client to call. Its own retries should be disabled.
+            limiter (RateLimiter): The scheduler shared by every client calling the same endpoint.
+        """
+        super().__init__(inner)
+        self.limiter = limiter
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        estimated = estimate_tokens(messages)
+        attempt = 0
+        while True:
+            await self.limiter.acquire(estimated)
+            self.limiter.requests += 1
+            self.limiter.in_flight += 1
+            try:
+                result = await self.inner.create(messages, **kwargs)
+            except Exception as e:
+                if not self.limiter.is_retryable(e) or attempt >= self.limiter.max_retries:
+                    self.limiter.failures += 1
+                    raise
+                delay = self.limiter.backoff_delay(attempt, e)
+                if getattr(e, "status_code", None) == 429:
+                    self.limiter.on_throttled(delay)
+                else:
+                    await asyncio.sleep(delay)
+                self.limiter.record_retry()
+                attempt += 1
+                continue
+            finally:
+                self.limiter.in_flight -= 1
+            self.limiter.settle(estimated, result)
+            self.limiter.on_success()
+            return result
+
+    async def create_stream(self, messages: Sequence[LLMMessage], **kwargs: Any) -> AsyncGenerator[Union[str, CreateResult], None]:
+        estimated = estimate_tokens(messages)
+        attempt = 0
+        while True:
+            await self.limiter.acquire(estimated)
+            self.limiter.requests += 1
+            self.limiter.in_flight += 1
+            started = False
+            try:
+                async for chunk in self.inner.create_stream(messages, **kwargs):
+                    started = True
+                    if isinstance(chunk, CreateResult):
+                        self.limiter.settle(estimated, chunk)
+                    yield chunk
+            except Exception as e:
+                # Once output has been streamed the call cannot be replayed transparently.
+                if started or not self.limiter.is_retryable(e) or attempt >= self.limiter.max_retries:
+                    self.limiter.failures += 1
+                    raise
+                delay = self.limiter.backoff_delay(attempt, e)
+                if getattr(e, "status_code", None) == 429:
+                    self.limiter.on_throttled(delay)
+                else:
+                    await asyncio.sleep(delay)
+                self.limiter.record_retry()
+                attempt += 1
+                continue
+            finally:
+                self.limiter.in_flight -= 1
+            self.limiter.on_success()
+            return
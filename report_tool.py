@@ -0,0 +1,231 @@
+# report_tool.py
+
+import argparse
+import csv
+import glob
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pipeline_spec import AGENT_EMOJIS, load_plan
+from result_saver import ResearchResultSaver, atomic_write
+
+MANIFEST_NAME = "render_manifest.json"
+EXPORT_COLUMNS = ["run", "timestamp", "user_idea", "step", "agent", "content"]
+
+# The methods that shape the Markdown and HTML reports; the agent emojis are hashed along with them.
+TEMPLATE_METHODS = ("__init__", "_markdown_header", "_markdown_section", "_markdown_footer",
+                    "_html_header", "_html_card", "_html_footer")
+
+
+def template_fingerprint() -> str:
+    """Returns a hash of the report templates' source and the agent emojis, so a layout change re-renders every report."""
+    source = "".join(inspect.getsource(getattr(ResearchResultSaver, name)) for name in TEMPLATE_METHODS)
+    source += json.dumps({**AGENT_EMOJIS, **load_plan().emojis}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def _report_name(json_file: str) -> str:
+    """Returns the timestamp part of a research_result_<timestamp>.json file name."""
+    return os.path.basename(json_file)[len("research_result_"):-len(".json")]
+
+
+def render_report(json_file: str, output_dir: str, fingerprint: str,
+                  previous_hash: Optional[str] = None) -> Tuple[str, Optional[str], str]:
+    """
+    Rebuilds the Markdown and HTML reports of one saved run from its JSON report, unless neither the
+    JSON file nor the templates changed since the last rendering.
+
+    Args:
+        json_file (str): The research_result_<timestamp>.json file.
+        output_dir (str): The results directory holding the markdown/ and html/ directories.
+        fingerprint (str): The template_fingerprint() of the current templates.
+        previous_hash (str, optional): The hash recorded when this report was last rendered.
+
+    Returns:
+        Tuple[str, Optional[str], str]: The JSON file name, its new hash (None if it could not be read),
+        and "rendered", "unchanged" or the error message.
+    """
+    name = os.path.basename(json_file)
+    try:
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(fingerprint.encode('utf-8') + raw).hexdigest()
+        saver = ResearchResultSaver(output_dir, index=False)
+        timestamp = _report_name(json_file)
+        markdown_file = os.path.join(output_dir, "markdown", f"research_report_{timestamp}.md")
+        html_file = os.path.join(output_dir, "html", f"research_report_{timestamp}.html")
+        if digest == previous_hash and os.path.exists(markdown_file) and os.path.exists(html_file):
+            return name, digest, "unchanged"
+
+        data = json.loads(raw)
+        responses = data.get("agents_responses", [])
+        user_idea = data.get("user_idea", "")
+        report_timestamp = data.get("timestamp", timestamp)
+        total_messages = data.get("total_messages", len(responses))
+        # A report being viewed is replaced in one step rather than rewritten in place
+        atomic_write(markdown_file, saver._markdown_header(user_idea, report_timestamp)
+                     + "".join(saver._markdown_section(response) for response in responses)
+                     + saver._markdown_footer(total_messages))
+        atomic_write(html_file, saver._html_header(user_idea, report_timestamp)
+                     + "".join(saver._html_card(index, response) for index, response in enumerate(responses, 1))
+                     + saver._html_footer())
+        return name, digest, "rendered"
+    except (OSError, ValueError, AttributeError) as e:
+        return name, None, str(e)
+
+
+def _render_args(args: Tuple[str, str, str, Optional[str]]) -> Tuple[str, Optional[str], str]:
+    return render_report(*args)
+
+
+def render_all(output_dir: str = "research_results", workers: Optional[int] = None, force: bool = False) -> Dict:
+    """
+    Re-renders the Markdown and HTML reports of every saved run from the JSON store, in a process pool.
+    A report is skipped when the content hash of its JSON file and the templates match the hash recorded
+    in output_dir/render_manifest.json at its last rendering.
+
+    Args:
+        output_dir (str): The results directory containing json/, markdown/ and html/.
+        workers (int, optional): The number of worker processes (default: the CPU count); 1 renders in-process.
+        force (bool): Re-render every report regardless of the recorded hashes.
+
+    Returns:
+        Dict: The counts of rendered, unchanged and failed reports, the failures, the elapsed seconds
+        and the throughput in reports per second.
+    """
+    json_files = sorted(glob.glob(os.path.join(output_dir, "json", "research_result_*.json")))
+    manifest_file = os.path.join(output_dir, MANIFEST_NAME)
+    manifest: Dict[str, str] = {}
+    if os.path.exists(manifest_file) and not force:
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+    fingerprint = template_fingerprint()
+    tasks = [(json_file, output_dir, fingerprint, manifest.get(os.path.basename(json_file)))
+             for json_file in json_files]
+    start = time.perf_counter()
+    if workers == 1 or len(tasks) < 2:
+        results = [_render_args(task) for task in tasks]
+    else:
+        # Hand out several reports per task so the inter-process overhead stays small
+        chunksize = max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_render_args, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    counts = {"rendered": 0, "unchanged": 0, "failed": 0}
+    failures = []
+    for name, digest, status in results:
+        if digest is None:
+            counts["failed"] += 1
+            failures.append(f"{name}: {status}")
+            manifest.pop(name, None)
+        else:
+            counts[status] += 1
+            manifest[name] = digest
+    atomic_write(manifest_file, json.dumps(manifest, indent=2))
+
+    return {**counts, "failures": failures, "elapsed": elapsed,
+            "reports_per_second": len(results) / elapsed if elapsed > 0 else 0.0}
+
+
+def iter_responses(json_dir: str) -> Iterator[Dict]:
+    """Yields one row per agent response of every saved run, reading one JSON report at a time."""
+    for json_file in sorted(glob.glob(os.path.join(json_dir, "research_result_*.json"))):
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for response in data.get("agents_responses", []):
+            yield {
+                "run": _report_name(json_file),
+                "timestamp": data.get("timestamp", ""),
+                "user_idea": data.get("user_idea", ""),
+                "step": response.get("step"),
+                "agent": response.get("agent", ""),
+                "content": response.get("content", ""),
+            }
+
+
+def export_responses(path: str, json_dir: str = os.path.join("research_results", "json"),
+                     batch_size: int = 10_000) -> int:
+    """
+    Writes every agent response of every saved run into one CSV or Parquet file for analysis.
+
+    Args:
+        path (str): The output file; a .parquet suffix writes Parquet (requires pyarrow), anything else CSV.
+        json_dir (str): The directory containing research_result_*.json files.
+        batch_size (int): Rows per Parquet row group.
+
+    Returns:
+        int: The number of exported rows.
+    """
+    rows = 0
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet export requires pyarrow (pip install pyarrow); use a .csv file instead.")
+        schema = pa.schema([("run", pa.string()), ("timestamp", pa.string()), ("user_idea", pa.string()),
+                            ("step", pa.int64()), ("agent", pa.string()), ("content", pa.string())])
+        batch: List[Dict] = []
+        with pq.ParquetWriter(path, schema) as writer:
+            for row in iter_responses(json_dir):
+                batch.append(row)
+                rows += 1
+                if len(batch) >= batch_size:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    batch = []
+            if batch:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    else:
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+            for row in iter_responses(json_dir):
+                writer.writerow(row)
+                rows += 1
+    return rows
+
+
+def main():
+    """Command-line interface: re-render the saved reports or export all agent responses."""
+    parser = argparse.ArgumentParser(description="Rebuild or export the saved research reports.")
+    parser.add_argument("--dir", default="research_results", help="The results directory (default: research_results).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    render = subparsers.add_parser("render", help="Rebuild markdown/ and html/ from the JSON reports.")
+    render.add_argument("--workers", type=int, help="Worker processes (default: the CPU count).")
+    render.add_argument("--force", action="store_true", help="Re-render unchanged reports too.")
+    export = subparsers.add_parser("export", help="Write all agent responses to one CSV or Parquet file.")
+    export.add_argument("output", help="The output file (.csv, or .parquet with pyarrow installed).")
+    args = parser.parse_args()
+
+    if args.command == "render":
+        result = render_all(args.dir, workers=args.workers, force=args.force)
+        for failure in result["failures"]:
+            print(f"⚠️ {failure}")
+        print(f"📝 {result['rendered']} rendered, {result['unchanged']} unchanged, {result['failed']} failed "
+              f"in {result['elapsed']:.2f}s ({result['reports_per_second']:.0f} reports/s)")
+    else:
+        start = time.perf_counter()
+        try:
+            rows = export_responses(args.output, os.path.join(args.dir, "json"))
+        except ValueError as e:
+            print(f"Configuration Error: {e}")
+            raise SystemExit(1)
+        elapsed = time.perf_counter() - start
+        print(f"📦 Exported {rows} agent responses to {args.output} in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+# research_service.py
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import os
+import struct
+import time
+from typing import AsyncGenerator, Dict, List, Optional
+
+from autogen_core.models import ChatCompletionClient
+
+from ai_system import AdvancedAIPlusXSystem, create_model_client
+from fake_openai_server import FakeOpenAIServer
+from pretty_printer import QuietPrinter
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+HTTP_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                503: "Service Unavailable"}
+
+
+class ResearchJob:
+    """
+    One queued research idea, with the events of its run kept for late subscribers.
+    대기열에 들어간 하나의 연구 아이디어로, 늦게 구독한 클라이언트를 위해 실행 이벤트를 보관합니다.
+    """
+
+    def __init__(self, job_id: str, idea: str, execution_mode: str):
+        self.id = job_id
+        self.idea = idea
+        self.execution_mode = execution_mode
+        self.status = "queued"
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result: Optional[Dict] = None
+        self.events: List[Dict] = []
+        self._subscribers: set = set()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "error")
+
+    def publish(self, event: Dict):
+        """Records an event and forwards it to every open stream."""
+        self.events.append(event)
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    async def stream(self) -> AsyncGenerator[Dict, None]:
+        """Yields the events recorded so far, then live events until the job has finished."""
+        queue: asyncio.Queue = asyncio.Queue()
+        replay = list(self.events)
+        self._subscribers.add(queue)
+        try:
+            for event in replay:
+                yield event
+            if self.done:
+                return
+            while True:
+                event = await queue.get()
+                yield event
+                if event["type"] == "done":
+                    return
+        finally:
+            self._subscribers.discard(queue)
+
+    def summary(self) -> Dict:
+        """Returns the job's state as a JSON-serializable dictionary."""
+        return {
+            "id": self.id,
+            "idea": self.idea,
+            "execution_mode": self.execution_mode,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "messages": sum(event["type"] == "message" for event in self.events),
+            "result": self.result,
+        }
+
+
+class ServicePrinter(QuietPrinter):
+    """
+    A printer that publishes the agent messages of the current run to its job instead of the console.
+    현재 실행의 에이전트 메시지를 콘솔 대신 작업(job)에 게시하는 프린터입니다.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.job: Optional[ResearchJob] = None
+
+    def print_agent_response(self, step: int, agent: str, content: str):
+        if self.job is not None:
+            self.job.publish({"type": "message", "step": step, "agent": agent, "content": content})
+
+    def print_agent_stream_chunk(self, agent: str, text: str):
+        if self.job is not None:
+            self.job.publish({"type": "chunk", "agent": agent, "content": text})
+
+    def print_gate_decisions(self, decisions: List[Dict]):
+        if self.job is not None:
+            for decision in decisions:
+                self.job.publish({"type": "gate", **decision})
+
+    def print_error(self, message: str):
+        if self.job is not None:
+            self.job.publish({"type": "error", "message": message})
+
+
+class ResearchService:
+    """
+    A headless asyncio HTTP service: ideas are queued onto a bounded pool of workers, each holding a warm
+    AdvancedAIPlusXSystem, and clients follow a run's agent messages over SSE or WebSocket.
+    헤드리스 asyncio HTTP 서비스로, 아이디어를 미리 준비된 AdvancedAIPlusXSystem을 가진 제한된 워커 풀에 대기시키고 클라이언트는 SSE 또는 WebSocket으로 에이전트 메시지를 받습니다.
+
+    Endpoints:
+        POST /jobs                 {"idea": "...", "mode": "round_robin" | "dag"} -> 202 with the job
+        GET  /jobs/<id>            The job's status and, once finished, its result
+        GET  /jobs/<id>/events     Server-sent events: one per agent message, then "done"
+        GET  /jobs/<id>/ws         The same events over a WebSocket
+        GET  /status               Queue depth, in-flight runs and client metrics
+    """
+
+    def __init__(self, model_client: ChatCompletionClient, workers: int = 2, max_queue: int = 100,
+                 execution_mode: str = "round_robin", stream_tokens: bool = False,
+                 cache: Optional[ResponseCache] = None, rate_limiter: Optional[RateLimiter] = None,
+                 host: str = "127.0.0.1", port: int = 8000, max_jobs_kept: int = 1000):
+        """
+        Args:
+            model_client (ChatCompletionClient): The model client shared by all workers.
+            workers (int): The number of runs processed at the same time.
+            max_queue (int): The number of waiting ideas above which new ones are refused with 503.
+            execution_mode (str): The default execution mode of a job.
+            stream_tokens (bool): Publish "chunk" events with the streamed model output.
+            cache (ResponseCache, optional): Reported on /status (the client must already use it).
+            rate_limiter (RateLimiter, optional): Reported on /status (the client must already use it).
+            host (str): The interface to bind.
+            port (int): The port to bind; 0 picks a free one.
+            max_jobs_kept (int): How many finished jobs stay queryable.
+        """
+        self.model_client = model_client
+        self.workers = workers
+        self.execution_mode = execution_mode
+        self.stream_tokens = stream_tokens
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.host = host
+        self.port = port
+        self.max_jobs_kept = max_jobs_kept
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.jobs: Dict[str, ResearchJob] = {}
+        self.in_flight: Dict[str, ResearchJob] = {}
+        self._ids = itertools.count(1)
+        self._worker_tasks: List[asyncio.Task] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: set = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self):
+        """Builds the workers' systems, starts the workers and starts listening."""
+        for _ in range(self.workers):
+            printer = ServicePrinter()
+            system = AdvancedAIPlusXSystem(model_client=self.model_client, open_browser=False,
+                                           stream_tokens=self.stream_tokens, printer=printer)
+            self._worker_tasks.append(asyncio.create_task(self._worker(system, printer)))
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stops listening, cancels the workers and closes open connections."""
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    async def __aenter__(self) -> "ResearchService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def submit(self, idea: str, execution_mode: Optional[str] = None) -> ResearchJob:
+        """
+        Queues an idea.
+
+        Args:
+            idea (str): The research idea.
+            execution_mode (str, optional): "round_robin" or "dag". Defaults to the service's mode.
+
+        Returns:
+            ResearchJob: The queued job.
+
+        Raises:
+            ValueError: If the idea is empty or the mode is unknown.
+            asyncio.QueueFull: If the queue is full.
+        """
+        execution_mode = execution_mode or self.execution_mode
+        if not idea:
+            raise ValueError("The idea cannot be empty.")
+        if execution_mode not in ("round_robin", "dag"):
+            raise ValueError(f"Unknown execution mode: {execution_mode}")
+        job = ResearchJob(f"{time.strftime('%Y%m%d_%H%M%S')}_{next(self._ids):05d}", idea, execution_mode)
+        self.queue.put_nowait(job)
+        self.jobs[job.id] = job
+        self._forget_old_jobs()
+        return job
+
+    def _forget_old_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(0, len(self.jobs) - self.max_jobs_kept)]:
+            del self.jobs[job_id]
+
+    def status(self) -> Dict:
+        """Returns the queue depth, the runs in flight and the shared client metrics."""
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize(),
+            "in_flight": [{"id": job.id, "idea": job.idea, "started": job.started,
+                           "messages": sum(e["type"] == "message" for e in job.events)}
+                          for job in self.in_flight.values()],
+            "jobs": counts,
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "rate_limiter": self.rate_limiter.metrics() if self.rate_limiter is not None else None,
+        }
+
+    async def _worker(self, system: AdvancedAIPlusXSystem, printer: ServicePrinter):
+        """Runs queued jobs one at a time on the worker's own agents."""
+        while True:
+            job = await self.queue.get()
+            job.status, job.started = "running", time.time()
+            self.in_flight[job.id] = job
+            printer.job = job
+            try:
+                result = await system.execute_research_process(job.idea, execution_mode=job.execution_mode,
+                                                               run_id=job.id)
+                job.result = {
+                    "error": result["error"],
+                    "saved_files": result["saved_files"],
+                    "structured": result["record"].to_dict(),
+                    "usage": result["usage"],
+                    "total_duration": result["total_duration"],
+                }
+                job.status = "error" if result["error"] else "done"
+            except Exception as e:
+                job.result = {"error": str(e)}
+                job.status = "error"
+            finally:
+                printer.job = None
+                job.finished = time.time()
+                del self.in_flight[job.id]
+                self.queue.task_done()
+            job.publish({"type": "done", "status": job.status, **job.result})
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(writer)
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            try:
+                parts = request_line.decode("latin-1").split(" ")
+                if len(parts) < 2:
+                    raise ValueError("the request line must be 'METHOD PATH HTTP/1.1'")
+                method, path = parts[:2]
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length < 0:
+                    raise ValueError(f"invalid Content-Length {length}")
+            except ValueError as e:
+                # A malformed request line, an overlong line or a bad Content-Length
+                self._write(writer, 400, {"error": f"Malformed request: {e}"})
+                await writer.drain()
+                return
+            body = await reader.readexactly(length)
+            await self._route(method, path.split("?")[0].rstrip("/"), headers, body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _route(self, method: str, path: str, headers: Dict, body: bytes, writer: asyncio.StreamWriter):
+        parts = path.strip("/").split("/")
+        if path == "/status" and method == "GET":
+            self._write(writer, 200, self.status())
+        elif path == "/jobs" and method == "POST":
+            try:
+                request = json.loads(body or b"{}")
+                job = self.submit((request.get("idea") or "").strip(), request.get("mode"))
+            except (ValueError, AttributeError) as e:
+                self._write(writer, 400, {"error": str(e)})
+            except asyncio.QueueFull:
+                self._write(writer, 503, {"error": "The queue is full, try again later."})
+            else:
+                self._write(writer, 202, {**job.summary(), "queue_position": self.queue.qsize()})
+        elif parts[0] == "jobs" and len(parts) in (2, 3) and method == "GET":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                self._write(writer, 404, {"error": f"Unknown job {parts[1]}"})
+            elif len(parts) == 2:
+                self._write(writer, 200, job.summary())
+            elif parts[2] == "events":
+                await self._stream_events(job, writer)
+            elif parts[2] == "ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self._stream_websocket(job, headers, writer)
+            else:
+                self._write(writer, 404, {"error": f"Unknown path {path}"})
+        else:
+            self._write(writer, 404 if method == "GET" else 405, {"error": f"Unknown path {path}"})
+        await writer.drain()
+
+    async def _stream_events(self, job: ResearchJob, writer: asyncio.StreamWriter):
+        """Streams the job's events as server-sent events."""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Connection: close\r\n\r\n")
+        async for event in job.stream():
+            writer.write(f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+            await writer.drain()
+
+    async def _stream_websocket(self, job: ResearchJob, headers: Dict, writer: asyncio.StreamWriter):
+        """Completes the WebSocket handshake and sends the job's events as text frames."""
+        accept = base64.b64encode(
+            hashlib.sha1((headers.get("sec-websocket-key", "") + WEBSOCKET_GUID).encode("latin-1")).digest()
+        ).decode("latin-1")
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode("latin-1"))
+        async for event in job.stream():
+            writer.write(self._websocket_frame(0x1, json.dumps(event, ensure_ascii=False).encode("utf-8")))
+            await writer.drain()
+        writer.write(self._websocket_frame(0x8, struct.pack("!H", 1000)))
+
+    @staticmethod
+    def _websocket_frame(opcode: int, payload: bytes) -> bytes:
+        """Builds one unmasked, final WebSocket frame (server-to-client frames are never masked)."""
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        return header + payload
+
+    def _write(self, writer: asyncio.StreamWriter, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {HTTP_REASONS.get(status, 'Error')}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+
+
+async def serve(args: argparse.Namespace):
+    """Runs the service until it is interrupted."""
+    fake_server = None
+    cache = ResponseCache() if args.cache else None
+    rate_limiter = RateLimiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+    if args.fake_model:
+        # A local stand-in model, so the service can be exercised without an API key or network access.
+        fake_server = FakeOpenAIServer(latency=args.fake_latency)
+        await fake_server.start()
+        model_client = create_model_client("fake-key", base_url=fake_server.base_url, cache=cache,
+                                           rate_limiter=rate_limiter)
+    else:
+        api_key = os.environ.get("GOOGLE_API_KEY")
+        if not api_key:
+            raise SystemExit("Set GOOGLE_API_KEY or pass --fake-model.")
+        model_client = create_model_client(api_key, cache=cache, rate_limiter=rate_limiter)
+
+    service = ResearchService(model_client, workers=args.workers, max_queue=args.max_queue,
+                              execution_mode=args.mode, stream_tokens=args.stream, cache=cache,
+                              rate_limiter=rate_limiter, host=args.host, port=args.port)
+    async with service:
+        print(f"🛰️ Jarvis Research Service listening on {service.url} with {args.workers} workers")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await model_client.close()
+            if fake_server is not None:
+                await fake_server.stop()
+
+
+def parse_args() -> argparse.Namespace:
+    """Parses the command-line options."""
+    parser = argparse.ArgumentParser(description="Jarvis Research System as a headless HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2, help="Runs processed at the same time (default: 2).")
+    parser.add_argument("--max-queue", type=int, default=100, help="Waiting ideas before 503 (default: 100).")
+    parser.add_argument("--mode", choices=["round_robin", "dag"], default="round_robin")
+    parser.add_argument("--stream", action="store_true", help="Publish streamed model output as 'chunk' events.")
+    parser.add_argument("--cache", action="store_true", help="Reuse stored model responses.")
+    parser.add_argument("--rpm", type=float, help="Client-side limit on model requests per minute.")
+    parser.add_argument("--tpm", type=float, help="Client-side limit on tokens per minute.")
+    parser.add_argument("--fake-model", action="store_true", help="Answer with a local stand-in model.")
+    parser.add_argument("--fake-latency", type=float, default=0.2, help="Stand-in model latency in seconds.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        print("\n👋 Service stopped.")
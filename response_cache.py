@@ -0,0 +1,219 @@
+# response_cache.py
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncGenerator, Dict, Optional, Sequence, Union
+
+from autogen_core.models import ChatCompletionClient, CreateResult, LLMMessage
+
+from model_clients import ModelClientWrapper
+
+
+class ResponseCache:
+    """
+    A persistent, content-addressed store of model responses with TTL expiry and size-based LRU eviction.
+    TTL 만료와 크기 기반 LRU 제거를 지원하는 영구적인 콘텐츠 주소 기반 모델 응답 저장소입니다.
+    """
+
+    def __init__(self, path: str = os.path.join("research_results", "cache", "responses.sqlite"),
+                 ttl_seconds: float = 7 * 24 * 3600, max_bytes: int = 256 * 1024 * 1024, bypass: bool = False):
+        """
+        Opens (or creates) the cache database.
+
+        Args:
+            path (str): The SQLite file holding the cached responses.
+            ttl_seconds (float): How long an entry stays valid after it was written.
+            max_bytes (int): The total payload size above which the least recently used entries are evicted.
+            bypass (bool): When True, lookups always miss so every call reaches the model; fresh
+                responses are still written, which refreshes the stored entries.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # The clients query the cache from worker threads, so one lock serialises use of the connection.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, messages: Sequence[LLMMessage], **kwargs: Any) -> str:
+        """
+        Hashes everything that determines a response: the model name, the full message history
+        (including the system message) and the request options.
+
+        Args:
+            model (str): The model name.
+            messages (Sequence[LLMMessage]): The messages sent to the model.
+            **kwargs: The create() options such as tools, json_output and extra_create_args.
+
+        Returns:
+            str: A SHA-256 hex digest.
+        """
+        options = {}
+        for name, value in sorted(kwargs.items()):
+            if name == "cancellation_token" or value is None:
+                continue
+            if name == "tools":
+                value = [getattr(tool, "schema", tool) for tool in value]
+            elif name == "tool_choice" and not isinstance(value, str):
+                value = getattr(value, "name", str(value))
+            elif isinstance(value, type):
+                value = value.__name__
+            options[name] = value
+        payload = {
+            "model": model,
+            "messages": [message.model_dump(mode="json") for message in messages],
+            "options": options,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CreateResult]:
+        """
+        Looks up a response, counting a hit or a miss.
+
+        Args:
+            key (str): The key from make_key.
+
+        Returns:
+            Optional[CreateResult]: The cached response, or None on a miss.
+        """
+        if self.bypass:
+            self.misses += 1
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        result = CreateResult.model_validate_json(row[0])
+        result.cached = True
+        return result
+
+    def put(self, key: str, result: CreateResult):
+        """
+        Stores a response and evicts least recently used entries if the cache grew too large.
+
+        Args:
+            key (str): The key from make_key.
+            result (CreateResult): The model response.
+        """
+        value = result.model_dump_json()
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Removes expired entries, then the least recently used ones until the size limit holds."""
+        expired = self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,))
+        self.evictions += expired.rowcount
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Removes every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """
+        Returns the hit/miss counters and the current cache size.
+
+        Returns:
+            Dict: hits, misses, hit_rate, evictions, entries and bytes.
+        """
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedChatCompletionClient(ModelClientWrapper):
+    """
+    A model client that answers repeated requests from a ResponseCache instead of calling the model again.
+    The SQLite lookups and writes run on worker threads, so they never block the event loop.
+    반복되는 요청을 모델을 다시 호출하지 않고 ResponseCache에서 응답하는 모델 클라이언트입니다.
+    """
+
+    def __init__(self, inner: ChatCompletionClient, cache: ResponseCache, model: str):
+        """
+        Args:
+            inner (ChatCompletionClient): The model client to call on a cache miss.
+            cache (ResponseCache): The response store.
+            model (str): The model name, which is part of every cache key.
+        """
+        super().__init__(inner)
+        self.cache = cache
+        self.model = model
+
+    async def create(self, messages: Sequence[LLMMessage], **kwargs: Any) -> CreateResult:
+        key = ResponseCache.make_key(self.model, messages, **kwargs)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return cached
+        result = await self.inner.create(messages, **kwargs)
+        await asyncio.to_thread(self.cache.put, key, result)
+        return result
+
+    async def create_stream(self, messages: Sequence[LLMMessage], **kwargs: Any) -> AsyncGenerator[Union[str, CreateResult], None]:
+        key = ResponseCache.make_key(self.model, messages, **kwargs)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            if isinstance(cached.content, str):
+                yield cached.content
+            yield cached
+            return
+        async for chunk in self.inner.create_stream(messages, **kwargs):
+            if isinstance(chunk, CreateResult):
+                await asyncio.to_thread(self.cache.put, key, chunk)
+            yield chunk
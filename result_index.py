@@ -0,0 +1,211 @@
+# result_index.py
+
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
+from output_parser import ResearchRecord, parse_research_messages
+from research_domain import ResearchDomain
+
+
+class ResultIndex:
+    """
+    A SQLite index over the saved JSON reports: one row per run with its parsed domain, verdict and scores,
+    and a full-text (FTS5) index over the user idea and every agent's content.
+    저장된 JSON 보고서에 대한 SQLite 인덱스로, 실행별 분야·판정·점수와 사용자 아이디어 및 에이전트 응답의 전문(FTS5) 인덱스를 제공합니다.
+    """
+
+    DEFAULT_PATH = os.path.join("research_results", "index.sqlite")
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Opens (or creates) the index database.
+
+        Args:
+            path (str): The SQLite file holding the index.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # Runs finalize their reports on worker threads; one writer at a time uses the shared connection.
+        self._lock = threading.Lock()
+        # WAL lets concurrent batch workers index their runs while queries are running.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_id TEXT PRIMARY KEY, user_idea TEXT NOT NULL, domain TEXT, domain_label TEXT,"
+            " domain_confidence REAL, technical_score REAL, viability_score REAL, feasibility_verdict TEXT,"
+            " verdict TEXT, total_messages INTEGER, json_file TEXT, indexed REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS runs_domain_verdict ON runs (domain, verdict);"
+            "CREATE INDEX IF NOT EXISTS runs_verdict ON runs (verdict);"
+            "CREATE TABLE IF NOT EXISTS messages ("
+            " id INTEGER PRIMARY KEY, run_id TEXT NOT NULL, agent TEXT NOT NULL, content TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS messages_run ON messages (run_id);"
+            # External-content FTS table kept in sync with `messages` by triggers.
+            "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+            " agent, content, content='messages', content_rowid='id', tokenize='porter unicode61');"
+            "CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN"
+            " INSERT INTO messages_fts (rowid, agent, content) VALUES (new.id, new.agent, new.content); END;"
+            "CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN"
+            " INSERT INTO messages_fts (messages_fts, rowid, agent, content)"
+            " VALUES ('delete', old.id, old.agent, old.content); END;"
+        )
+        self._conn.commit()
+
+    def _add(self, report: Dict, json_file: Optional[str] = None):
+        """Replaces the rows of one run without committing."""
+        run_id = report["timestamp"]
+        messages = report.get("agents_responses", [])
+        if report.get("structured") is not None:
+            record = ResearchRecord.from_dict(report["structured"])
+        else:
+            # Reports written before structured parsing existed are parsed here.
+            record = parse_research_messages(messages)
+
+        self._conn.execute("DELETE FROM messages WHERE run_id = ?", (run_id,))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_id, report.get("user_idea", ""), record.domain.value if record.domain else None,
+             record.domain_label, record.domain_confidence, record.technical_score, record.viability_score,
+             record.feasibility_verdict, record.verdict, len(messages),
+             os.path.abspath(json_file) if json_file else None, time.time())
+        )
+        self._conn.executemany(
+            "INSERT INTO messages (run_id, agent, content) VALUES (?, ?, ?)",
+            [(run_id, "idea", report.get("user_idea", ""))]
+            + [(run_id, m.get("agent", ""), m.get("content", "")) for m in messages]
+        )
+
+    def add_run(self, report: Dict, json_file: Optional[str] = None):
+        """
+        Indexes one run, replacing any earlier entry with the same run id.
+
+        Args:
+            report (Dict): The JSON report as written by ResearchResultSaver.
+            json_file (str, optional): The path of the report file.
+        """
+        with self._lock, self._conn:
+            self._add(report, json_file)
+
+    def index_file(self, json_file: str):
+        """Indexes one saved JSON report."""
+        with open(json_file, 'r', encoding='utf-8') as f:
+            self.add_run(json.load(f), json_file)
+
+    def rebuild(self, json_dir: str = os.path.join("research_results", "json")) -> int:
+        """
+        Recreates the index from the saved JSON reports. Unreadable files are skipped.
+
+        Args:
+            json_dir (str): The directory containing research_result_*.json files.
+
+        Returns:
+            int: The number of indexed runs.
+        """
+        count = 0
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM runs")
+            self._conn.execute("DELETE FROM messages")
+            self._conn.execute("INSERT INTO messages_fts (messages_fts) VALUES ('delete-all')")
+            for json_file in sorted(glob.glob(os.path.join(json_dir, "research_result_*.json"))):
+                try:
+                    with open(json_file, 'r', encoding='utf-8') as f:
+                        self._add(json.load(f), json_file)
+                except (OSError, ValueError, KeyError):
+                    continue
+                count += 1
+        return count
+
+    def search(self, domain: Optional[Union[ResearchDomain, str]] = None, verdict: Optional[str] = None,
+               text: Optional[str] = None, agent: Optional[str] = None,
+               feasibility_verdict: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        """
+        Finds runs by their parsed fields and/or full-text content. All given filters must match.
+
+        Args:
+            domain (ResearchDomain or str, optional): The research domain, e.g. ResearchDomain.FORESTRY or "FORESTRY".
+            verdict (str, optional): The professor's verdict, "APPROVE" or "REJECT".
+            text (str, optional): An FTS5 query over the idea and agent replies, e.g. 'drone AND "thermal camera"'.
+            agent (str, optional): Restrict the text query to one agent's replies ("idea" for the user idea).
+            feasibility_verdict (str, optional): The feasibility evaluator's verdict, "Proceed" or "Revise".
+            limit (int): The maximum number of runs returned, newest first.
+
+        Returns:
+            List[Dict]: The matching runs with their indexed fields.
+        """
+        conditions, params = [], []
+        if domain is not None:
+            conditions.append("domain = ?")
+            params.append(domain.value if isinstance(domain, ResearchDomain) else domain.lower())
+        if verdict is not None:
+            conditions.append("verdict = ?")
+            params.append(verdict.upper())
+        if feasibility_verdict is not None:
+            conditions.append("feasibility_verdict = ?")
+            params.append(feasibility_verdict.capitalize())
+        if text:
+            match = "messages_fts MATCH ?" + (" AND messages.agent = ?" if agent else "")
+            conditions.append(
+                "run_id IN (SELECT messages.run_id FROM messages_fts"
+                f" JOIN messages ON messages.id = messages_fts.rowid WHERE {match})"
+            )
+            params.extend([text, agent] if agent else [text])
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._conn.execute(f"SELECT * FROM runs{where} ORDER BY run_id DESC LIMIT ?", (*params, limit))
+        return [dict(row) for row in rows]
+
+    def count(self) -> int:
+        """Returns the number of indexed runs."""
+        return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    def close(self):
+        """Closes the database connection."""
+        self._conn.close()
+
+
+def print_runs(runs: List[Dict]):
+    """Prints one line per run (id, domain, verdict and idea) followed by its report path."""
+    for run in runs:
+        print(f"{run['run_id']}  {run['domain'] or '-':22} {run['verdict'] or '-':8} {run['user_idea'][:60]}")
+        print(f"    {run['json_file']}")
+
+
+def main():
+    """Command-line interface: rebuild the index or search it."""
+    parser = argparse.ArgumentParser(description="Search the index of saved research runs.")
+    parser.add_argument("--index", default=ResultIndex.DEFAULT_PATH, help="The index file.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rebuild = subparsers.add_parser("rebuild", help="Recreate the index from the saved JSON reports.")
+    rebuild.add_argument("--json-dir", default=os.path.join("research_results", "json"))
+    search = subparsers.add_parser("search", help="Find runs by domain, verdict and/or full text.")
+    search.add_argument("text", nargs="?", help="FTS5 query over the idea and agent replies.")
+    search.add_argument("--domain", choices=[d.name for d in ResearchDomain] + [d.value for d in ResearchDomain])
+    search.add_argument("--verdict", choices=["APPROVE", "REJECT"], type=str.upper)
+    search.add_argument("--feasibility", choices=["Proceed", "Revise"], type=str.capitalize)
+    search.add_argument("--agent", help="Restrict the text query to one agent ('idea' for the user idea).")
+    search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    index = ResultIndex(args.index)
+    start = time.perf_counter()
+    if args.command == "rebuild":
+        count = index.rebuild(args.json_dir)
+        print(f"🗂️ Indexed {count} runs in {time.perf_counter() - start:.2f}s")
+    else:
+        runs = index.search(domain=args.domain, verdict=args.verdict, text=args.text, agent=args.agent,
+                            feasibility_verdict=args.feasibility, limit=args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        print_runs(runs)
+        print(f"🔎 {len(runs)} of {index.count()} runs matched in {elapsed:.1f} ms")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,35 @@
 
 import os
 import json
+import sys
 from datetime import datetime
 import webbrowser
-from typing import List, Dict
+import sqlite3
+from typing import List, Dict, Optional
+
+from pipeline_spec import ExecutionPlan, load_plan
+from result_index import ResultIndex
+
+# Files are written under this suffix and renamed into place when complete.
+# 파일은 이 접미사로 작성된 뒤 완료되면 최종 이름으로 바뀝니다.
+PARTIAL_SUFFIX = ".part"
+
+
+def atomic_write(path: str, text: str):
+    """Writes a text file under a temporary name and renames it into place, so readers never see half of it."""
+    partial = path + PARTIAL_SUFFIX
+    with open(partial, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(partial, path)
+
+
+def is_headless() -> bool:
+    """True when no browser window can be shown: over SSH, in CI, or on Linux without an X11 or Wayland display."""
+    if os.environ.get("SSH_CONNECTION") or os.environ.get("CI"):
+        return True
+    if sys.platform.startswith(("win", "darwin")):
+        return False
+    return not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
 
 class ResearchResultSaver:
     """
@@ -13,27 +39,19 @@ class ResearchResultSaver:
     연구 결과를 다양한 파일 형식(JSON, Markdown, HTML)으로 저장하고 출력 디렉토리 구조를 관리합니다.
     """
 
-    def __init__(self, output_dir: str = "research_results"):
+    def __init__(self, output_dir: str = "research_results", index: bool = True,
+                 plan: Optional[ExecutionPlan] = None):
         """
         Initializes the saver and creates the necessary output directories.
         
         Args:
             output_dir (str): The root directory for saving results.
+            index (bool): Whether to add every saved run to the search index (output_dir/index.sqlite).
+            plan (ExecutionPlan, optional): The pipeline whose agent emojis the reports use. Defaults to the built-in one.
         """
         self.output_dir = output_dir
-        self.agent_emojis = {
-            'domain_classifier': '🔍',
-            'senior_researcher': '👨‍🏫',
-            'prompt_engineer': '✏️',
-            'ai_specialist': '🤖',
-            'research_trend_analyst': '📚',
-            'feasibility_evaluator': '⚖️',
-            'improvement_strategist': '🔧',
-            'topic_recommender': '🎯',
-            'advisor_professor': '👨‍🏫',
-            'final_resource_engineer': '🛠️',
-            'user': '👤'
-        }
+        self.index = ResultIndex(os.path.join(output_dir, "index.sqlite")) if index else None
+        self.plan = plan or load_plan()
         self.create_output_directory()
 
     def create_output_directory(self):
@@ -43,123 +61,80 @@ class ResearchResultSaver:
         os.makedirs(os.path.join(self.output_dir, "markdown"), exist_ok=True)
         os.makedirs(os.path.join(self.output_dir, "html"), exist_ok=True)
 
-    def save_results(self, messages: List[Dict], user_idea: str, timestamp: str) -> Dict:
+    def open_report(self, user_idea: str, timestamp: str) -> "StreamingReportWriter":
         """
-        Saves the analysis results into JSON, Markdown, and HTML files.
+        Opens JSON, Markdown, and HTML report files that are written incrementally as messages arrive.
         
         Args:
-            messages (List[Dict]): The list of messages from the agent chat.
             user_idea (str): The initial research idea from the user.
             timestamp (str): A timestamp string for unique filenames.
             
         Returns:
-            Dict: A dictionary containing the absolute paths to the saved files.
+            StreamingReportWriter: The open writer; call write_message for each message and close at the end.
         """
-        json_data = {
-            "timestamp": timestamp,
-            "user_idea": user_idea,
-            "total_messages": len(messages),
-            "agents_responses": messages
-        }
+        return StreamingReportWriter(self, user_idea, timestamp)
 
-        # 1. Save as JSON
-        json_filename = os.path.join(self.output_dir, "json", f"research_result_{timestamp}.json")
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
-
-        # 2. Save as Markdown
-        markdown_content = self._generate_markdown_report(json_data)
-        markdown_filename = os.path.join(self.output_dir, "markdown", f"research_report_{timestamp}.md")
-        with open(markdown_filename, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
-
-        # 3. Save as HTML
-        html_content = self._generate_html_report(json_data)
-        html_filename = os.path.join(self.output_dir, "html", f"research_report_{timestamp}.html")
-        with open(html_filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-
-        return {
-            "json_file": os.path.abspath(json_filename),
-            "markdown_file": os.path.abspath(markdown_filename),
-            "html_file": os.path.abspath(html_filename)
-        }
-
-    def _generate_markdown_report(self, data: Dict) -> str:
+    def save_results(self, messages: List[Dict], user_idea: str, timestamp: str,
+                     structured: Optional[Dict] = None) -> Dict:
         """
-        Generates the content for the Markdown report.
+        Saves the analysis results into JSON, Markdown, and HTML files.
         
         Args:
-            data (Dict): The JSON data containing the research results.
+            messages (List[Dict]): The list of messages from the agent chat.
+            user_idea (str): The initial research idea from the user.
+            timestamp (str): A timestamp string for unique filenames.
+            structured (Dict, optional): The parsed ResearchRecord of the run (see output_parser.py).
             
         Returns:
-            str: The Markdown formatted report content.
+            Dict: A dictionary containing the absolute paths to the saved files.
         """
-        content = f"""# Jarvis Research - Analysis Report
+        writer = self.open_report(user_idea, timestamp)
+        for message in messages:
+            writer.write_message(message)
+        return writer.close(structured)
+
+    def _markdown_header(self, user_idea: str, timestamp: str) -> str:
+        """Returns the opening part of the Markdown report."""
+        return f"""# Jarvis Research - Analysis Report
 
 ## 📋 Basic Information
-- **Research Idea**: {data['user_idea']}
-- **Analysis Timestamp**: {data['timestamp']}
-- **Total Analysis Steps**: {data['total_messages']}
-- **Participating Agents**: 10 Expert Agents
+- **Research Idea**: {user_idea}
+- **Analysis Timestamp**: {timestamp}
+- **Participating Agents**: {len(self.plan.order)} Expert Agents
 
 ---
 
 ## 🔄 Step-by-Step Analysis Results
 
 """
-        for response in data['agents_responses']:
-            emoji = self.agent_emojis.get(response.get('agent'), '🔹')
-            agent_name = response.get('agent', 'unknown').replace('_', ' ').title()
-            content += f"""### {emoji} Step {response.get('step', '#')}: {agent_name}
+
+    def _markdown_section(self, response: Dict) -> str:
+        """Returns the Markdown section for one agent response."""
+        emoji = self.plan.emoji(response.get('agent'))
+        agent_name = response.get('agent', 'unknown').replace('_', ' ').title()
+        return f"""### {emoji} Step {response.get('step', '#')}: {agent_name}
 
 {response.get('content')}
 
 ---
 
 """
-        content += f"""## 📊 Analysis Completion Information
 
+    def _markdown_footer(self, total_messages: int) -> str:
+        """Returns the closing part of the Markdown report."""
+        return f"""## 📊 Analysis Completion Information
+
+- **Total Analysis Steps**: {total_messages}
 - **Generation Time**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 - **System Version**: Jarvis Research v1.0
 - **File Format**: Markdown Report
 
 > This report was automatically generated by the Jarvis Research System.
 """
-        return content
-
-    def _generate_html_report(self, data: Dict) -> str:
-        """
-        Generates a styled HTML report from the research data.
-        
-        Args:
-            data (Dict): The JSON data containing the research results.
-            
-        Returns:
-            str: The HTML content for the report.
-        """
-        # (The HTML generation logic from the notebook would go here)
-        # For brevity, a simplified version is shown.
-        
-        # Build the agent response cards
-        agent_cards_html = ""
-        for i, response in enumerate(data['agents_responses']):
-            agent = response.get('agent', 'unknown')
-            content = response.get('content', 'No content.')
-            emoji = self.agent_emojis.get(agent, '🔹')
-            agent_name = agent.replace('_', ' ').title()
-            agent_cards_html += f"""
-            <div class="agent-response">
-                <div class="agent-title">
-                    <span class="agent-emoji">{emoji}</span>
-                    Step {i+1}: {agent_name}
-                </div>
-                <div class="agent-content">{content.replace('<', '&lt;').replace('>', '&gt;')}</div>
-            </div>
-            """
 
-        # Final HTML structure
-        html_template = f"""
+    def _html_header(self, user_idea: str, timestamp: str) -> str:
+        """Returns the opening part of the HTML report, up to where the agent cards go."""
+        return f"""
         <!DOCTYPE html>
         <html lang="en">
         <head>
@@ -186,29 +161,50 @@ class ResearchResultSaver:
                 <div class="content">
                     <div class="info-box">
                         <h2>📋 Analysis Overview</h2>
-                        <p><strong>Research Idea:</strong> {data['user_idea']}</p>
-                        <p><strong>Analysis Timestamp:</strong> {data['timestamp']}</p>
+                        <p><strong>Research Idea:</strong> {user_idea}</p>
+                        <p><strong>Analysis Timestamp:</strong> {timestamp}</p>
                     </div>
                     <h2>🔄 Step-by-Step Analysis</h2>
-                    {agent_cards_html}
+"""
+
+    def _html_card(self, index: int, response: Dict) -> str:
+        """Returns the HTML card for one agent response (index is 1-based)."""
+        agent = response.get('agent', 'unknown')
+        content = response.get('content', 'No content.')
+        emoji = self.plan.emoji(agent)
+        agent_name = agent.replace('_', ' ').title()
+        return f"""
+            <div class="agent-response">
+                <div class="agent-title">
+                    <span class="agent-emoji">{emoji}</span>
+                    Step {index}: {agent_name}
+                </div>
+                <div class="agent-content">{content.replace('<', '&lt;').replace('>', '&gt;')}</div>
+            </div>
+            """
+
+    def _html_footer(self) -> str:
+        """Returns the closing part of the HTML report."""
+        return f"""
                 </div>
                 <div class="footer"><p>Report generated by Jarvis Research System at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p></div>
             </div>
         </body>
         </html>
         """
-        return html_template
 
     def open_html_report(self, html_file_path: str) -> bool:
         """
-        Opens the generated HTML report in a new web browser tab.
+        Opens the generated HTML report in a new web browser tab, unless the session is headless.
         
         Args:
             html_file_path (str): The path to the HTML file.
             
         Returns:
-            bool: True if successful, False otherwise.
+            bool: True if successful, False otherwise (also when skipped on a headless session).
         """
+        if is_headless():
+            return False
         try:
             webbrowser.open(f'file://{os.path.abspath(html_file_path)}')
             return True
@@ -216,3 +212,96 @@ class ResearchResultSaver:
             print(f"Failed to open browser: {e}")
             return False
 
+
+
+class StreamingReportWriter:
+    """
+    Writes the JSON, Markdown, and HTML reports incrementally: each agent message is appended to the
+    open files as it arrives, and the documents are closed at the end of the run. Memory use stays
+    proportional to one message. The files are written under a ".part" suffix, where a run in progress
+    can be viewed, and renamed to their final names when closed, so readers never see a half-written report.
+    각 에이전트 메시지가 도착할 때마다 열린 파일에 추가하고 실행이 끝나면 문서를 닫는 증분 보고서 작성기입니다.
+    """
+
+    def __init__(self, saver: ResearchResultSaver, user_idea: str, timestamp: str):
+        """
+        Opens the three report files and writes their headers.
+        
+        Args:
+            saver (ResearchResultSaver): The saver providing the output directory and report templates.
+            user_idea (str): The initial research idea from the user.
+            timestamp (str): A timestamp string for unique filenames.
+        """
+        self.saver = saver
+        self.total_messages = 0
+        self.closed = False
+        self.json_filename = os.path.join(saver.output_dir, "json", f"research_result_{timestamp}.json")
+        self.markdown_filename = os.path.join(saver.output_dir, "markdown", f"research_report_{timestamp}.md")
+        self.html_filename = os.path.join(saver.output_dir, "html", f"research_report_{timestamp}.html")
+
+        self._json = open(self.json_filename + PARTIAL_SUFFIX, 'w', encoding='utf-8')
+        self._markdown = open(self.markdown_filename + PARTIAL_SUFFIX, 'w', encoding='utf-8')
+        self._html = open(self.html_filename + PARTIAL_SUFFIX, 'w', encoding='utf-8')
+
+        # The JSON document is written as a stream; "total_messages" follows the response list.
+        header = json.dumps({"timestamp": timestamp, "user_idea": user_idea}, ensure_ascii=False, indent=2)
+        self._json.write(header[:-2] + ',\n  "agents_responses": [')
+        self._markdown.write(saver._markdown_header(user_idea, timestamp))
+        self._html.write(saver._html_header(user_idea, timestamp))
+        self._flush()
+
+    def _flush(self):
+        for f in (self._json, self._markdown, self._html):
+            f.flush()
+
+    def write_message(self, message: Dict):
+        """
+        Appends one agent message to all three reports.
+        
+        Args:
+            message (Dict): The message with its 'step', 'agent' and 'content' (or a checkpoint.MessageRecord).
+        """
+        message = dict(message) # Reads the body of a spilled message once
+        separator = "," if self.total_messages else ""
+        record = json.dumps(message, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+        self._json.write(f"{separator}\n    {record}")
+        self.total_messages += 1
+        self._markdown.write(self.saver._markdown_section(message))
+        self._html.write(self.saver._html_card(self.total_messages, message))
+        self._flush()
+
+    def close(self, structured: Optional[Dict] = None) -> Dict:
+        """
+        Writes the closing parts of the reports and closes the files.
+        
+        Args:
+            structured (Dict, optional): The parsed ResearchRecord of the run, stored in the JSON report
+                under "structured" so saved runs can be filtered without re-parsing the responses.
+        
+        Returns:
+            Dict: A dictionary containing the absolute paths to the saved files.
+        """
+        if not self.closed:
+            self._json.write('\n  ],')
+            if structured is not None:
+                record = json.dumps(structured, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+                self._json.write(f'\n  "structured": {record},')
+            self._json.write(f'\n  "total_messages": {self.total_messages}\n}}')
+            self._markdown.write(self.saver._markdown_footer(self.total_messages))
+            self._html.write(self.saver._html_footer())
+            for f in (self._json, self._markdown, self._html):
+                f.close()
+            for filename in (self.json_filename, self.markdown_filename, self.html_filename):
+                os.replace(filename + PARTIAL_SUFFIX, filename)
+            self.closed = True
+            if self.saver.index is not None:
+                try:
+                    self.saver.index.index_file(self.json_filename)
+                except sqlite3.Error:
+                    pass # The report is saved; the index can be rebuilt from the JSON files later
+
+        return {
+            "json_file": os.path.abspath(self.json_filename),
+            "markdown_file": os.path.abspath(self.markdown_filename),
+            "html_file": os.path.abspath(self.html_filename)
+        }
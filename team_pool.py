@@ -0,0 +1,162 @@
+# team_pool.py
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from autogen_agentchat.agents import AssistantAgent
+from autogen_agentchat.conditions import MaxMessageTermination
+from autogen_agentchat.teams import SelectorGroupChat
+from autogen_core import CancellationToken
+from autogen_core.models import ChatCompletionClient
+
+from context_policy import ContextSavings
+from gating import GatingPolicy, GatingTermination
+from instrumentation import RunInstrumentation
+from pipeline import DependencyPipeline
+
+
+class ResearchTeam:
+    """
+    One set of agents together with everything a run changes: the group chat, the dependency pipeline,
+    the gating state, the instrumentation and the context savings. A team serves one run at a time and is
+    reset, not rebuilt, before the next one.
+    에이전트 한 세트와 실행 중에 변경되는 모든 상태(그룹 채팅, 의존성 파이프라인, 게이팅 상태, 계측, 컨텍스트 절감)를 묶은 팀입니다.
+    """
+
+    def __init__(self, agents: List[AssistantAgent], model_client: ChatCompletionClient, gating: GatingPolicy,
+                 instrumentation: RunInstrumentation, context_savings: ContextSavings,
+                 dependencies: Optional[Dict[str, List[str]]] = None, stages: Optional[List[List[str]]] = None):
+        """
+        Args:
+            agents (List[AssistantAgent]): The agents in their round-robin speaking order.
+            model_client (ChatCompletionClient): The group chat's client (never called: the gating policy
+                always names the next speaker).
+            gating (GatingPolicy): The team's own gating policy.
+            instrumentation (RunInstrumentation): The recorder the agents' model clients report to.
+            context_savings (ContextSavings): The counter the agents' model contexts report to.
+            dependencies (Dict[str, List[str]], optional): The dependency graph of the "dag" mode.
+                Defaults to pipeline.AGENT_DEPENDENCIES.
+            stages (List[List[str]], optional): The stages precomputed for these dependencies.
+        """
+        self.agents = agents
+        self.gating = gating
+        self.instrumentation = instrumentation
+        self.context_savings = context_savings
+        self.pipeline = DependencyPipeline({agent.name: agent for agent in agents}, dependencies, stages)
+        # A run has at most the user's task plus gating.max_messages agent messages, restored ones included,
+        # so one limit fits every run and the group chat can be reused. The limit is only a safety net.
+        self.group_chat = SelectorGroupChat(
+            participants=agents,
+            model_client=model_client,
+            selector_func=lambda thread: self.gating.next_speaker(),
+            allow_repeated_speaker=True,
+            termination_condition=GatingTermination(gating) | MaxMessageTermination(1 + gating.max_messages)
+        )
+        self.runs = 0
+
+    async def clear_history(self, execution_mode: str):
+        """
+        Drops the messages the agents and the group chat hold, so an idle team does not keep its last run's
+        transcript in memory.
+
+        Args:
+            execution_mode (str): "round_robin" resets the group chat (and with it every agent and the
+                termination conditions), "dag" only the agents.
+        """
+        if execution_mode == "round_robin":
+            await self.group_chat.reset()
+        else:
+            cancellation_token = CancellationToken()
+            for agent in self.agents:
+                await agent.on_reset(cancellation_token)
+
+    async def reset(self, execution_mode: str):
+        """
+        Clears the state left by the previous run.
+
+        Args:
+            execution_mode (str): The mode of the next run: "round_robin" resets the group chat (and with it
+                every agent and the termination conditions), "dag" only the agents.
+        """
+        await self.clear_history(execution_mode)
+        self.gating.reset(can_loop=execution_mode == "round_robin")
+        self.instrumentation.start_run()
+        self.context_savings.reset()
+        self.runs += 1
+
+
+class TeamPool:
+    """
+    Hands out ready teams so one system can serve several runs at the same time. Teams are built on demand
+    up to the pool size and returned for reuse; a team whose run failed is dropped and rebuilt later.
+    하나의 시스템이 여러 실행을 동시에 처리할 수 있도록 준비된 팀을 제공하는 풀입니다. 실패한 실행의 팀은 폐기되고 나중에 다시 만들어집니다.
+    """
+
+    def __init__(self, factory: Callable[[], ResearchTeam], size: int = 1):
+        """
+        Args:
+            factory (Callable[[], ResearchTeam]): Builds a new team.
+            size (int): The most teams in use at the same time; further runs wait for a free team.
+        """
+        if size < 1:
+            raise ValueError("The pool needs at least one team.")
+        self.factory = factory
+        self.size = size
+        self._idle: List[ResearchTeam] = []
+        self._slots = asyncio.Semaphore(size)
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def _create(self) -> ResearchTeam:
+        team = self.factory()
+        self.created += 1 # Only teams that were actually built count towards the pool size
+        return team
+
+    def warm(self, count: int = 1):
+        """Builds teams ahead of the first runs, up to the pool size."""
+        while len(self._idle) < min(count, self.size) and self.created - self.discarded < self.size:
+            self._idle.append(self._create())
+
+    async def acquire(self) -> ResearchTeam:
+        """Waits for a free slot and returns an idle team, building one if none is left."""
+        await self._slots.acquire()
+        if self._idle:
+            self.reused += 1
+            return self._idle.pop()
+        try:
+            return self._create()
+        except BaseException:
+            self._slots.release() # A team that could not be built must not take its slot with it
+            raise
+
+    def release(self, team: ResearchTeam, discard: bool = False):
+        """
+        Returns a team to the pool.
+
+        Args:
+            team (ResearchTeam): The team taken with acquire.
+            discard (bool): Drop the team instead of reusing it (e.g. when its run was interrupted).
+        """
+        if discard:
+            self.discarded += 1
+        else:
+            self._idle.append(team)
+        self._slots.release()
+
+    @asynccontextmanager
+    async def team(self) -> AsyncIterator[ResearchTeam]:
+        """Holds a team for the duration of a `async with` block; it is dropped if the block raises."""
+        team = await self.acquire()
+        try:
+            yield team
+        except BaseException:
+            self.release(team, discard=True)
+            raise
+        self.release(team)
+
+    def stats(self) -> Dict:
+        """Returns the pool size, the idle teams and how many teams were built, reused and dropped."""
+        return {"size": self.size, "idle": len(self._idle), "created": self.created, "reused": self.reused,
+                "discarded": self.discarded}
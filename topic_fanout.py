@@ -0,0 +1,148 @@
+# topic_fanout.py
+
+import asyncio
+import re
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from autogen_agentchat.agents import BaseChatAgent
+from autogen_agentchat.base import Response
+from autogen_agentchat.messages import BaseChatMessage, TextMessage
+from autogen_core import CancellationToken
+from autogen_core.model_context import ChatCompletionContext
+from autogen_core.models import AssistantMessage, ChatCompletionClient, LLMMessage, SystemMessage, UserMessage
+
+from output_parser import parse_topic_candidates, parse_topic_score
+
+IDEA_PATTERN = re.compile(r'research idea: "(.+?)"', re.DOTALL)
+
+CANDIDATE_SYSTEM_MESSAGE = (
+    "You are an expert who proposes one specific, original research topic for the idea under discussion. "
+    "Respond in the format:\n- Topic: [topic title]\n- Rationale: [one sentence]"
+)
+SCORER_SYSTEM_MESSAGE = (
+    "You rigorously score one research topic. Respond in the format:\n"
+    "- Innovation: [8/10] - [reason]\n- Feasibility: [7/10] - [reason]"
+)
+
+# Each candidate call is steered towards a different angle so the candidates do not all converge on one topic.
+# 후보들이 하나의 주제로 수렴하지 않도록 각 후보 호출을 서로 다른 관점으로 유도합니다.
+CANDIDATE_ANGLES = [
+    "a novel method", "data collection and benchmarks", "real-world deployment", "evaluation and validation",
+    "efficiency and cost", "human factors and usability", "robustness and safety", "cross-domain transfer",
+]
+
+
+class TopicFanOutAgent(BaseChatAgent):
+    """
+    A drop-in replacement for the topic recommender that generates candidate topics in parallel model
+    calls, scores every candidate in its own rubric call and replies with only the top-k, so the advisor
+    professor and the final resource engineer review the winners with independently scored ratings.
+    후보 주제를 병렬 호출로 생성하고 각 후보를 별도의 평가 호출로 채점한 뒤 상위 k개만 응답하는 주제 추천 에이전트입니다.
+    """
+
+    def __init__(self, name: str, generator_client: ChatCompletionClient, scorer_client: ChatCompletionClient,
+                 model_context: ChatCompletionContext, candidates: int = 8, top_k: int = 5, concurrency: int = 4):
+        """
+        Args:
+            name (str): The agent name (normally "topic_recommender").
+            generator_client (ChatCompletionClient): The client for the candidate calls.
+            scorer_client (ChatCompletionClient): The client for the scoring calls.
+            model_context (ChatCompletionContext): The transcript the candidate calls see.
+            candidates (int): The number of candidate calls.
+            top_k (int): How many of the best-scored topics the reply keeps.
+            concurrency (int): The most candidate or scoring calls in flight at the same time.
+        """
+        super().__init__(name, description="Generates candidate research topics in parallel, scores each one "
+                                           "and recommends the best.")
+        if candidates < 1 or top_k < 1 or concurrency < 1:
+            raise ValueError("Candidates, top-k and concurrency must be at least 1.")
+        self.generator_client = generator_client
+        self.scorer_client = scorer_client
+        self.model_context = model_context
+        self.candidates = candidates
+        self.top_k = top_k
+        self.concurrency = concurrency
+        self.last_stats: Optional[Dict] = None
+
+    @property
+    def produced_message_types(self) -> Sequence[type[BaseChatMessage]]:
+        return (TextMessage,)
+
+    async def _bounded(self, slots: asyncio.Semaphore, client: ChatCompletionClient, messages: List[LLMMessage],
+                       cancellation_token: CancellationToken) -> str:
+        async with slots:
+            result = await client.create(messages, cancellation_token=cancellation_token)
+        return result.content if isinstance(result.content, str) else ""
+
+    async def on_messages(self, messages: Sequence[BaseChatMessage], cancellation_token: CancellationToken) -> Response:
+        for message in messages:
+            await self.model_context.add_message(message.to_model_message())
+        history = await self.model_context.get_messages()
+        idea = next((match.group(1) for match in (IDEA_PATTERN.search(str(m.content)) for m in history) if match), "")
+        slots = asyncio.Semaphore(self.concurrency)
+
+        # Generate the candidates in parallel; duplicates and failed calls are dropped.
+        start = time.perf_counter()
+        replies = await asyncio.gather(*(
+            self._bounded(slots, self.generator_client, [
+                SystemMessage(content=CANDIDATE_SYSTEM_MESSAGE), *history,
+                UserMessage(content=f"Propose candidate topic {i + 1} of {self.candidates}, focusing on "
+                                    f"{CANDIDATE_ANGLES[i % len(CANDIDATE_ANGLES)]}.", source="user")
+            ], cancellation_token)
+            for i in range(self.candidates)
+        ), return_exceptions=True)
+        generation_seconds = time.perf_counter() - start
+        titles: Dict[str, str] = {}
+        for reply in replies:
+            if isinstance(reply, BaseException):
+                continue
+            for title in parse_topic_candidates(reply):
+                titles.setdefault(title.lower(), title)
+        if not titles:
+            errors = [reply for reply in replies if isinstance(reply, BaseException)]
+            if errors:
+                raise errors[0]
+            raise ValueError("No topic candidate could be parsed.")
+
+        # Score every candidate in its own small call instead of one prompt holding all of them.
+        start = time.perf_counter()
+        scores = await asyncio.gather(*(
+            self._bounded(slots, self.scorer_client, [
+                SystemMessage(content=SCORER_SYSTEM_MESSAGE),
+                UserMessage(content=f'Research idea: "{idea}"\n\nCandidate topic: {title}', source="user")
+            ], cancellation_token)
+            for title in titles.values()
+        ), return_exceptions=True)
+        scoring_seconds = time.perf_counter() - start
+        ranked: List[Tuple[str, float, float]] = []
+        for title, reply in zip(titles.values(), scores):
+            if isinstance(reply, BaseException):
+                continue
+            innovation, feasibility = parse_topic_score(reply)
+            if innovation is not None and feasibility is not None:
+                ranked.append((title, innovation, feasibility))
+        if not ranked:
+            raise ValueError("No topic candidate could be scored.")
+        ranked.sort(key=lambda topic: topic[1] + topic[2], reverse=True)
+        winners = ranked[:self.top_k]
+
+        self.last_stats = {
+            "candidate_calls": self.candidates,
+            "failed_candidate_calls": sum(isinstance(reply, BaseException) for reply in replies),
+            "candidates": len(titles),
+            "scored": len(ranked),
+            "kept": len(winners),
+            "generation_seconds": round(generation_seconds, 3),
+            "scoring_seconds": round(scoring_seconds, 3),
+        }
+        content = "🎯 Topic Recommendations\n" + "".join(
+            f"{i}. {title} - Innovation: {innovation:g}/10, Feasibility: {feasibility:g}/10\n"
+            for i, (title, innovation, feasibility) in enumerate(winners, 1)
+        ) + "Topic recommendation complete."
+        await self.model_context.add_message(AssistantMessage(content=content, source=self.name))
+        return Response(chat_message=TextMessage(content=content, source=self.name))
+
+    async def on_reset(self, cancellation_token: CancellationToken) -> None:
+        await self.model_context.clear()
+        self.last_stats = None